@@ -0,0 +1,144 @@
+"""
+    Author: Ege Bilecen
+    Date  : 17.10.2026
+
+    Runs eb.mavlink.fleet against several eb.mavlink.simulator instances with
+    different system ids on one UDP port, so it works offline. Checks that:
+    * Every vehicle is discovered.
+    * Telemetry goes to the right vehicle (every simulator has it's own home).
+    * fan_out() and action() ACKs reach the right vehicle. One vehicle is
+      taken off and disarm is sent to all, only that one must be denied.
+    * close() ends the message handler thread.
+
+    Results and fan_out() timings are printed. Exit code is 1 if a check fails.
+
+    python benchmarks/fleet_check.py --vehicles 3
+"""
+import argparse
+import json
+import time
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from eb.logger import Logger
+
+from eb.mavlink.fleet     import Fleet
+from eb.mavlink.simulator import Simulator
+
+HOME_LAT = 40.
+HOME_LON = 30.
+
+def get_home_lat(system_id):
+    return HOME_LAT + system_id * 0.001
+
+def wait_until(func, timeout):
+    end_time = time.monotonic() + timeout / 1000
+
+    while time.monotonic() < end_time:
+        if func(): return True
+
+        time.sleep(0.05)
+
+    return func()
+
+def check_discovery(fleet, sim_list):
+    system_id_list = fleet.wait_vehicles(len(sim_list), 5000)
+
+    for system_id in system_id_list:
+        fleet.get_vehicle(system_id).wait_ready(5000)
+
+    return system_id_list == sorted(sim_list)
+
+def check_telemetry(fleet, sim_list):
+    for system_id in sim_list:
+        lat = fleet.get_vehicle(system_id).telemetry().get_global_position()["lat"]
+
+        if abs(lat - get_home_lat(system_id)) > 1e-6: return False
+
+    return True
+
+def check_fan_out(fleet, sim_list):
+    start_time = time.perf_counter()
+    result     = fleet.fan_out(lambda vehicle: vehicle.action().set_servo_pwm(9, 1000 + vehicle.get_system_id()))
+    elapsed    = (time.perf_counter() - start_time) * 1000
+
+    is_passed = all(result[system_id] is True and sim.get_servo_pwm(9) == 1000 + system_id
+                    for system_id, sim in sim_list.items())
+
+    return is_passed, elapsed
+
+def check_action(fleet, sim_list):
+    first_id = min(sim_list)
+
+    start_time  = time.perf_counter()
+    mode_result = fleet.action("set_flight_mode", "GUIDED")
+    arm_result  = fleet.action("arm")
+    elapsed     = (time.perf_counter() - start_time) * 1000
+
+    if not all(mode_result[system_id] is True and arm_result[system_id] is True
+               and sim.get_flight_mode() == "GUIDED" and sim.get_is_armed()
+               for system_id, sim in sim_list.items()):
+        return False, elapsed
+
+    if fleet.action("takeoff", 5, system_ids=[first_id])[first_id] is not True:
+        return False, elapsed
+
+    if not wait_until(lambda: -sim_list[first_id].get_position()[2] > 1, 5000):
+        return False, elapsed
+
+    # Only the flying vehicle denies disarming.
+    disarm_result = fleet.action("disarm", retries=1)
+
+    is_passed = all(disarm_result[system_id] is (system_id != first_id)
+                    and sim.get_is_armed() == (system_id == first_id)
+                    for system_id, sim in sim_list.items())
+
+    return is_passed, elapsed
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline check of eb.mavlink.fleet against the simulator.")
+    parser.add_argument("--port",     type=int, default=14680)
+    parser.add_argument("--vehicles", type=int, default=3, help="simulator count")
+    args = parser.parse_args()
+
+    Logger.LOGGING_ENABLED = False
+
+    sim_list = {}
+
+    for system_id in range(1, args.vehicles + 1):
+        sim = Simulator("udpout:127.0.0.1:{}".format(args.port),
+                        system_id = system_id,
+                        home_lat  = get_home_lat(system_id),
+                        home_lon  = HOME_LON)
+        sim.start()
+        sim_list[system_id] = sim
+
+    fleet   = Fleet("udpin:127.0.0.1:{}".format(args.port))
+    results = {}
+
+    try:
+        results["discovery"] = check_discovery(fleet, sim_list)
+        results["telemetry"] = check_telemetry(fleet, sim_list)
+
+        results["fan_out"], results["fan_out_ms"] = check_fan_out(fleet, sim_list)
+        results["action"],  results["action_ms"]  = check_action(fleet, sim_list)
+    except Exception as ex:
+        results["exception"] = repr(ex)
+    finally:
+        fleet.close()
+        results["close"] = not fleet._thread.is_alive()
+
+        for sim in sim_list.values():
+            sim.stop()
+
+    print(json.dumps(results, indent=4))
+
+    is_passed = "exception" not in results \
+    and         all(results[check] for check in ("discovery", "telemetry", "fan_out", "action", "close"))
+
+    sys.exit(0 if is_passed else 1)
+
+if __name__ == "__main__":
+    main()
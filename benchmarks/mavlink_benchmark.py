@@ -0,0 +1,188 @@
+"""
+    Author: Ege Bilecen
+    Date  : 17.10.2026
+
+    Runs eb.mavlink against eb.mavlink.simulator and measures:
+    * Command round-trip latency (COMMAND_LONG -> COMMAND_ACK), one by one
+      and pipelined.
+    * Telemetry throughput, records parsed per second at high stream rates.
+    * CPU usage of the mission tracker while flying a small mission.
+
+    Results are printed and, if --output is given, appended to that file as
+    one JSON line, so runs of different releases can be compared.
+
+    python benchmarks/mavlink_benchmark.py --output mavlink_benchmark.jsonl
+"""
+import argparse
+import platform
+import json
+import time
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from eb.logger import Logger
+
+from eb.mavlink.vehicle   import Vehicle
+from eb.mavlink.simulator import Simulator
+from eb.mavlink._mission  import Mission
+
+def percentile(value_list, percent):
+    value_list = sorted(value_list)
+    index      = min(len(value_list) - 1, int(round(percent / 100 * (len(value_list) - 1))))
+
+    return value_list[index]
+
+def summarize(value_list):
+    return {
+        "mean" : sum(value_list) / len(value_list),
+        "p50"  : percentile(value_list, 50),
+        "p95"  : percentile(value_list, 95),
+        "max"  : max(value_list)
+    }
+
+def connect(port, rate=4, **kwargs):
+    sim = Simulator("udpout:127.0.0.1:{}".format(port), stream_rate=rate, **kwargs)
+    sim.start()
+
+    drone = Vehicle("udpin:127.0.0.1:{}".format(port), timeout=5000, rate=rate)
+    drone.wait_ready(5000)
+
+    return sim, drone
+
+def disconnect(sim, drone):
+    # Receiver thread of the vehicle ends when it's connection is closed.
+    drone.mavlink().close()
+    sim.stop()
+
+def benchmark_command_latency(port, count):
+    sim, drone = connect(port)
+
+    latency_list = []
+
+    for i in range(count):
+        start_time = time.perf_counter()
+        drone.action().set_servo_pwm(9, 1000 + i % 1000)
+        latency_list.append((time.perf_counter() - start_time) * 1000)
+
+    start_time   = time.perf_counter()
+    pending_list = [drone.action().set_servo_pwm(9, 1000 + i % 1000, blocking=False) for i in range(count)]
+    drone.command().wait_all(pending_list)
+    pipelined_ms = (time.perf_counter() - start_time) * 1000
+
+    disconnect(sim, drone)
+
+    return {
+        "count"           : count,
+        "serial_ms"       : summarize(latency_list),
+        "pipelined_total" : pipelined_ms,
+        "pipelined_per_command_ms" : pipelined_ms / count
+    }
+
+def benchmark_telemetry_throughput(port, duration, rate):
+    sim, drone = connect(port, rate)
+
+    snapshot   = drone.telemetry().get_snapshot()
+    start_time = time.perf_counter()
+    start_cpu  = time.process_time()
+
+    time.sleep(duration)
+
+    elapsed     = time.perf_counter() - start_time
+    cpu_time    = time.process_time() - start_cpu
+    record_count = drone.telemetry().get_snapshot().seq - snapshot.seq
+
+    disconnect(sim, drone)
+
+    return {
+        "stream_rate"      : rate,
+        "records_per_sec"  : record_count / elapsed,
+        "cpu_percent"      : cpu_time / elapsed * 100
+    }
+
+def benchmark_mission_cpu(port, distance, timeout, wp_radius):
+    sim, drone = connect(port, speed=10, climb_speed=5, land_speed=3)
+
+    # Idle CPU usage of the same process, subtracted from the mission.
+    start_time = time.perf_counter()
+    start_cpu  = time.process_time()
+    time.sleep(2)
+    idle_cpu_percent = (time.process_time() - start_cpu) / (time.perf_counter() - start_time) * 100
+
+    home      = drone.telemetry().get_global_position()
+    dest_lat  = home["lat"] + distance / 111320.
+    mission   = drone.mission()
+
+    # MISSION_ITEM lat/lon are float32, the vehicle can stop ~0.2 m away from
+    # the waypoint, so it is never reached with a radius of 0.
+    mission.set_waypoint_radius(wp_radius)
+
+    mission.add_mission_item_proto(Mission.get_mission_item_proto(Mission.Type.TAKEOFF, alt=5))
+    mission.add_mission_item_proto(Mission.get_mission_item_proto(Mission.Type.WAYPOINT,
+                                                                  lat=dest_lat, lon=home["lon"], alt=5))
+    mission.add_mission_item_proto(Mission.get_mission_item_proto(Mission.Type.LAND))
+
+    start_time = time.perf_counter()
+    start_cpu  = time.process_time()
+
+    if not mission.start():
+        disconnect(sim, drone)
+        raise RuntimeError("Mission couldn't be started.")
+
+    is_timed_out = False
+
+    while mission.get_status() == 1:
+        if time.perf_counter() - start_time > timeout:
+            is_timed_out = True
+            mission.stop()
+            break
+
+        time.sleep(0.05)
+
+    elapsed  = time.perf_counter() - start_time
+    cpu_time = time.process_time() - start_cpu
+    landed   = not is_timed_out and (not sim.get_is_armed() or sim.get_flight_mode() == "LAND")
+
+    disconnect(sim, drone)
+
+    return {
+        "distance"           : distance,
+        "duration_sec"       : elapsed,
+        "completed"          : landed,
+        "timed_out"          : is_timed_out,
+        "cpu_percent"        : cpu_time / elapsed * 100,
+        "idle_cpu_percent"   : idle_cpu_percent
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="eb.mavlink benchmarks against the simulator.")
+    parser.add_argument("--port",            type=int,   default=14650)
+    parser.add_argument("--commands",        type=int,   default=200,  help="commands per latency run")
+    parser.add_argument("--duration",        type=float, default=5,    help="seconds per throughput run")
+    parser.add_argument("--rate",            type=int,   default=50,   help="stream rate (hz) of throughput run")
+    parser.add_argument("--distance",        type=float, default=30,   help="waypoint distance (m) of mission run")
+    parser.add_argument("--wp-radius",       type=float, default=1,    help="waypoint accept radius (m) of mission run")
+    parser.add_argument("--mission-timeout", type=float, default=120,  help="seconds before the mission run is stopped")
+    parser.add_argument("--output",          type=str,   default=None, help="JSON lines file to append results to")
+    args = parser.parse_args()
+
+    Logger.LOGGING_ENABLED = False
+
+    results = {
+        "timestamp"  : time.strftime("%Y-%m-%d %H:%M:%S"),
+        "python"     : platform.python_version(),
+        "machine"    : platform.machine(),
+        "command_latency"      : benchmark_command_latency(args.port, args.commands),
+        "telemetry_throughput" : benchmark_telemetry_throughput(args.port + 1, args.duration, args.rate),
+        "mission_cpu"          : benchmark_mission_cpu(args.port + 2, args.distance, args.mission_timeout, args.wp_radius)
+    }
+
+    print(json.dumps(results, indent=4))
+
+    if args.output is not None:
+        with open(args.output, "a") as f:
+            f.write(json.dumps(results) + "\n")
+
+if __name__ == "__main__":
+    main()
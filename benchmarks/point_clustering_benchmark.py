@@ -0,0 +1,118 @@
+"""
+    Author: Ege Bilecen
+    Date  : 17.10.2026
+
+    Compares the numpy path of Util.Point.filter_neighbor_points() with it's
+    loop path on random contour centers. Points are generated around a few
+    blob centers like detection.py produces them, with a fixed seed so runs
+    are comparable. Centers of both paths are checked to be the same first,
+    speedup is only reported if they are. Exit code is 1 if they are not.
+
+    Results are printed and, if --output is given, appended to that file as
+    one JSON line.
+
+    python benchmarks/point_clustering_benchmark.py --output point_clustering_benchmark.jsonl
+"""
+import argparse
+import platform
+import random
+import json
+import time
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from eb.image_processing.util import Util
+
+def generate_points(count, resolution=(640, 480), spread=40, seed=0):
+    rng          = random.Random(seed)
+    blob_count   = max(1, count // 10)
+    blob_centers = [(rng.uniform(0, resolution[0]), rng.uniform(0, resolution[1])) for _ in range(blob_count)]
+
+    point_list = []
+
+    for i in range(count):
+        cx, cy = blob_centers[i % blob_count]
+        point_list.append((int(min(max(rng.gauss(cx, spread), 0), resolution[0] - 1)),
+                           int(min(max(rng.gauss(cy, spread), 0), resolution[1] - 1))))
+
+    return point_list
+
+# Returns the best time (ms) of repeat runs.
+def measure(func, point_list, distance, repeat):
+    time_list = []
+
+    for _ in range(repeat):
+        start_time = time.perf_counter()
+        func(point_list, distance)
+        time_list.append((time.perf_counter() - start_time) * 1000)
+
+    return min(time_list)
+
+# Runs filter_neighbor_points() with the given VECTORIZE_MIN_POINT_COUNT.
+def get_filter_func(vectorize_min_point_count):
+    def filter_func(point_list, distance):
+        default_count = Util.Point.VECTORIZE_MIN_POINT_COUNT
+        Util.Point.VECTORIZE_MIN_POINT_COUNT = vectorize_min_point_count
+
+        try:
+            return Util.Point.filter_neighbor_points(point_list, distance)
+        finally:
+            Util.Point.VECTORIZE_MIN_POINT_COUNT = default_count
+
+    return filter_func
+
+def benchmark(count, distance, repeat):
+    point_list = generate_points(count)
+
+    loop_func   = get_filter_func(float("inf"))
+    vector_func = get_filter_func(0)
+
+    loop_centers   = loop_func(point_list, distance)
+    vector_centers = vector_func(point_list, distance)
+    is_same        = loop_centers == vector_centers
+
+    result = {
+        "points"       : count,
+        "centers"      : len(loop_centers),
+        "same_centers" : is_same
+    }
+
+    if not is_same: return result
+
+    loop_ms   = measure(loop_func,   point_list, distance, repeat)
+    vector_ms = measure(vector_func, point_list, distance, repeat)
+
+    result["loop_ms"]   = loop_ms
+    result["vector_ms"] = vector_ms
+    result["speedup"]   = loop_ms / vector_ms
+
+    return result
+
+def main():
+    parser = argparse.ArgumentParser(description="Point clustering benchmark.")
+    parser.add_argument("--counts",   type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--distance", type=float,          default=30,   help="neighbor distance (px)")
+    parser.add_argument("--repeat",   type=int,            default=5,    help="runs per measurement, best is kept")
+    parser.add_argument("--output",   type=str,            default=None, help="JSON lines file to append results to")
+    args = parser.parse_args()
+
+    results = {
+        "timestamp" : time.strftime("%Y-%m-%d %H:%M:%S"),
+        "python"    : platform.python_version(),
+        "machine"   : platform.machine(),
+        "distance"  : args.distance,
+        "runs"      : [benchmark(count, args.distance, args.repeat) for count in args.counts]
+    }
+
+    print(json.dumps(results, indent=4))
+
+    if args.output is not None:
+        with open(args.output, "a") as f:
+            f.write(json.dumps(results) + "\n")
+
+    sys.exit(0 if all(run["same_centers"] for run in results["runs"]) else 1)
+
+if __name__ == "__main__":
+    main()
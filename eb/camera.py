@@ -1,25 +1,40 @@
 """
     Author: Ege Bilecen
     Date  : 22.07.2020
+
+    Notes:
+    * mirror defaults to True in get_last_frame(), wait_next_frame() and
+      frames(), which flips the frame horizontally.
+    * With an encoded backend (e.g. V4L2MjpegBackend), the captured JPEG is
+      handed out without decoding only if frame_encode is True, mirror is
+      False and no quality or resize is given. Mirroring needs the frame to
+      be decoded, flipped and encoded again.
 """
-from time   import sleep
+from time   import sleep, monotonic
 from typing import Union, Tuple
 from numpy  import ndarray
 import cv2
 import threading
-import os
 
-from eb.logger import Logger
+from eb.logger          import Logger
+from eb.frame_buffer    import FrameBuffer
+from eb.video_recorder  import VideoRecorder
+from eb.capture_backend import CaptureBackend, OpenCVBackend
 from eb.image_processing.image import Image
 
 class Camera:
     def __init__(self,
-                 device      : int             = 0,
-                 resolution  : Tuple[int, int] = (640, 480),
-                 fps         : int             = 30,
-                 file_name   : str             = "",
-                 output_dir  : str             = "./video_output/",
-                 frame_encode: str             = ".jpg") -> None:
+                 device            : int             = 0,
+                 resolution        : Tuple[int, int] = (640, 480),
+                 fps               : int             = 30,
+                 file_name         : str             = "",
+                 output_dir        : str             = "./video_output/",
+                 frame_encode      : str             = ".jpg",
+                 buffer_slots      : int             = 0,
+                 record_queue_size : int             = 64,
+                 record_drop_policy: int             = VideoRecorder.DropPolicy.DROP_OLDEST,
+                 segment_duration  : float           = 0,
+                 backend           : CaptureBackend  = None) -> None:
         self._last_frame   = b""
         self._status       = 0
         self._device       = device
@@ -28,26 +43,113 @@ class Camera:
         self._file_name    = file_name
         self._output_dir   = output_dir
         self._frame_encode = frame_encode
+        self._buffer_slots = buffer_slots
+
+        self._record_queue_size  = record_queue_size
+        self._record_drop_policy = record_drop_policy
+        self._segment_duration   = segment_duration # seconds, 0 means single file
+
+        self._last_frame_seq       = 0
+        self._last_frame_timestamp = 0 # ms, time.monotonic() based
+
+        # Notified for every captured frame and when the camera stops.
+        self._frame_condition = threading.Condition()
+        self._consumers       = [] # Camera.Consumer, see create_consumer()
+        self._consumer        = None
+
+        self._backend      = backend # OpenCVBackend(device, resolution, fps) if None
+        self._recorder     = None # VideoRecorder, if file_name is given
+        self._frame_buffer = None # FrameBuffer, created with the first frame. See get_frame_buffer().
 
-        self._camera     = None
-        self._writer     = None
+        # Transformed versions of the last frame, see _get_cached().
+        self._cache_lock       = threading.Lock()
+        self._cache_seq        = 0
+        self._cache            = {}
+        self._cache_hit_count  = 0
+        self._cache_miss_count = 0
 
         self.LOG_INFO    = "camera.py - "
 
+        self._consumer = self.create_consumer("default")
+
+    class Consumer:
+        """
+            Hands every captured frame out once. Frames that are captured while
+            the consumer is busy are counted as dropped, only the latest one is
+            handed out.
+        """
+        def __init__(self, camera, name):
+            self.name = name
+
+            self._camera         = camera
+            self._last_seq       = camera.get_last_frame_seq()
+            self._last_timestamp = 0
+            self._consumed_count = 0
+            self._dropped_count  = 0
+
+        """
+            Blocks until a frame newer than the last one this consumer got is
+            captured. Returns it like Camera.get_last_frame() does.
+            timeout - ms, None means wait until the camera stops.
+        """
+        def wait_next_frame(self,
+                            timeout     : int             = None,
+                            frame_encode: bool            = False,
+                            mirror      : bool            = True,
+                            quality     : int             = None,
+                            resize      : Tuple[int, int] = None) -> Union[bytes, ndarray]:
+            camera = self._camera
+
+            with camera._frame_condition:
+                is_captured = camera._frame_condition.wait_for(lambda: camera._last_frame_seq > self._last_seq
+                                                                       or not camera._status,
+                                                               None if timeout is None else timeout / 1000)
+
+                if camera._last_frame_seq <= self._last_seq:
+                    if not is_captured or camera._status:
+                        raise TimeoutError("wait_next_frame() has timed out.")
+
+                    raise Exception("Camera is not started.")
+
+                frame     = camera._last_frame
+                seq       = camera._last_frame_seq
+                timestamp = camera._last_frame_timestamp
+
+            if self._last_seq > 0:
+                self._dropped_count += seq - self._last_seq - 1
+
+            self._last_seq        = seq
+            self._last_timestamp  = timestamp
+            self._consumed_count += 1
+
+            return camera._transform_frame(seq, frame, frame_encode, mirror, quality, resize)
+
+        # Sequence number and timestamp (ms) of the last frame this consumer got.
+        def get_last_seq(self) -> int:
+            return self._last_seq
+
+        def get_last_timestamp(self) -> float:
+            return self._last_timestamp
+
+        def get_consumed_count(self) -> int:
+            return self._consumed_count
+
+        def get_dropped_count(self) -> int:
+            return self._dropped_count
+
     # Private Method(s)
     @staticmethod
     def _thread_handler(cls) -> None:
         LOG_INFO = cls.LOG_INFO+"_thread_handler() - "
 
         while cls._status:
-            if cls._camera.isOpened():
+            if cls._backend.is_opened():
                 try:
-                    _, frame = cls._camera.read()
+                    timestamp = cls._grab()
 
-                    if cls._writer is not None:
-                        cls._writer.write(frame)
+                    if timestamp is None: continue
 
-                    cls._last_frame = frame
+                    cls._retrieve(timestamp)
                 except Exception as ex:
                     Logger.PrintException(LOG_INFO, ex)
                     sleep(0.1)
@@ -56,27 +158,143 @@ class Camera:
                 cls._status = 0
                 break
 
-        cls._camera.release()
+        cls._close()
 
-        if cls._writer is not None:
-            cls._writer.release()
+    # Capturing is split into _open(), _grab(), _retrieve() and _close(), so
+    # eb.multi_camera can drive several cameras from a single thread.
+    def _open(self):
+        if self._backend is None:
+            self._backend = OpenCVBackend(self._device, self._resolution, self._fps)
 
-    # Public Method(s)
-    def start(self) -> None:
-        Logger.PrintLog(self.LOG_INFO+"start()", "Starting the camera. (Device ID: {})".format(self._device))
-        
-        self._camera = cv2.VideoCapture(self._device)
+        if not self._backend.open():
+            Logger.PrintLog(self.LOG_INFO+"_open()", "Couldn't open the capture backend.")
 
         if self._file_name != "":
-            if not os.path.isdir(self._output_dir):
-                os.mkdir(self._output_dir)
+            self._recorder = VideoRecorder(self._output_dir, self._file_name, self._fps,
+                                           queue_size       = self._record_queue_size,
+                                           drop_policy      = self._record_drop_policy,
+                                           segment_duration = self._segment_duration)
+            self._recorder.start()
 
-            codec = cv2.VideoWriter_fourcc("X", "V", "I", "D")
-            self._writer = cv2.VideoWriter(self._output_dir + self._file_name+".avi", codec, self._fps / 4, self._resolution)
+        self._status = 1
 
-        self._camera.open(self._device)
+    # Returns the grab timestamp (ms), None if no frame is grabbed.
+    def _grab(self):
+        if not self._backend.grab(): return None
 
-        self._status = 1
+        return monotonic() * 1000
+
+    # Returns (seq, frame) of the grabbed frame, None if it couldn't be retrieved.
+    def _retrieve(self, timestamp):
+        ret, frame = self._backend.retrieve()
+
+        if not ret or frame is None: return None
+
+        if self._recorder is not None:
+            self._recorder.write(frame, timestamp)
+
+        return self._publish_frame(frame, timestamp)
+
+    def _close(self):
+        self._status = 0
+        self._backend.release()
+
+        if self._recorder is not None:
+            self._recorder.stop()
+
+        if self._frame_buffer is not None:
+            self._frame_buffer.close()
+            self._frame_buffer.unlink()
+            self._frame_buffer = None
+
+        # Wake the consumers up, so they can see the camera has stopped.
+        with self._frame_condition:
+            self._frame_condition.notify_all()
+
+    def _publish_frame(self, frame, timestamp):
+        if self._buffer_slots > 0:
+            # Ring holds raw frames.
+            if frame.ndim == 1:
+                frame = Image.Decode.FromEncodedImage(frame)
+
+            if self._frame_buffer is None:
+                self._frame_buffer = FrameBuffer(self._buffer_slots, frame.shape)
+
+                Logger.PrintLog(self.LOG_INFO+"_publish_frame()", "Frame buffer {} is created. Slots: {}, Frame shape: {}."
+                                .format(self._frame_buffer.get_name(), self._buffer_slots, frame.shape))
+
+            if frame.size == self._frame_buffer.get_frame_size():
+                self._frame_buffer.write(frame, timestamp)
+
+        with self._frame_condition:
+            self._last_frame           = frame
+            self._last_frame_timestamp = timestamp
+            self._last_frame_seq      += 1
+
+            self._frame_condition.notify_all()
+
+            return self._last_frame_seq, frame
+
+    def _get_cached(self, seq, key, create):
+        # Only the transforms of the latest frame are kept. Consumers that
+        # are behind get their frame transformed without caching it.
+        with self._cache_lock:
+            if seq == self._cache_seq and key in self._cache:
+                self._cache_hit_count += 1
+                return self._cache[key]
+
+            self._cache_miss_count += 1
+
+        # Transformed outside of the lock, so consumers that need a different
+        # transform don't wait for each other.
+        value = create()
+
+        with self._cache_lock:
+            if seq > self._cache_seq:
+                self._cache_seq = seq
+                self._cache     = {}
+
+            if seq == self._cache_seq:
+                self._cache[key] = value
+
+        return value
+
+    """
+        Every step is cached by the frame's sequence number, so consumers that
+        ask for the same frame and transform share the result. E.g. a mirrored
+        frame is flipped once and it's encoded version reuses the flipped one.
+    """
+    def _transform_frame(self, seq, frame, frame_encode, mirror, quality=None, resize=None):
+        if resize is not None:
+            resize = tuple(resize)
+
+        # Encoded frame, see eb.capture_backend. Handed out as it is if no
+        # transform is needed.
+        if frame.ndim == 1:
+            if  frame_encode and not mirror and quality is None and resize is None \
+            and self._frame_encode.lower() in (".jpg", ".jpeg"):
+                return self._get_cached(seq, ("bytes",), frame.tobytes)
+
+            frame = self._get_cached(seq, ("decode",), lambda: Image.Decode.FromEncodedImage(frame))
+
+        if resize is not None and (frame.shape[1], frame.shape[0]) != resize:
+            frame = self._get_cached(seq, ("resize", resize), lambda: cv2.resize(frame, resize))
+
+        if mirror:
+            frame = self._get_cached(seq, ("mirror", resize), lambda: cv2.flip(frame, 1))
+
+        if frame_encode:
+            # Returns bytes
+            return self._get_cached(seq, ("encode", resize, mirror, self._frame_encode, quality),
+                                    lambda: Image.Encode.FromRawImage(frame, self._frame_encode, quality))
+
+        return frame
+
+    # Public Method(s)
+    def start(self) -> None:
+        Logger.PrintLog(self.LOG_INFO+"start()", "Starting the camera. (Device ID: {})".format(self._device))
+
+        self._open()
 
         t = threading.Thread(target=self._thread_handler, args=(self,))
         t.daemon = True
@@ -88,35 +306,121 @@ class Camera:
         Logger.PrintLog(self.LOG_INFO+"stop()", "Stopping the camera.")
         self._status = 0
 
+        with self._frame_condition:
+            self._frame_condition.notify_all()
+
     def display(self) -> None:
         if not self._status:
             raise Exception("Camera is not started.")
 
-        while 1:
-            last_frame = self.get_last_frame(frame_encode = False)
-
-            if last_frame == b"": continue
-
+        for last_frame in self.frames():
             cv2.imshow("Camera (Device ID: {}, Resolution: {}x{})".format(self._device, self._resolution[0], self._resolution[1]), last_frame)
             if cv2.waitKey(1) == 27: break
 
         cv2.destroyAllWindows()
 
-    def get_last_frame(self,
-                       frame_encode: bool = False,
-                       mirror      : bool = True) -> Union[bytes, ndarray]:
-        last_frame = self._last_frame
+    # Returns None if buffer_slots is 0 or no frame is captured yet. Other
+    # processes can attach with FrameBuffer.attach(get_frame_buffer().get_name()).
+    def get_frame_buffer(self) -> Union[FrameBuffer, None]:
+        return self._frame_buffer
 
-        if len(last_frame) != 0:
-            if mirror:
-                last_frame = cv2.flip(last_frame, 1)
+    def get_last_frame_seq(self) -> int:
+        return self._last_frame_seq
+
+    # Consumers are listed in get_statistics().
+    def create_consumer(self, name : str) -> "Camera.Consumer":
+        consumer = Camera.Consumer(self, name)
+        self._consumers.append(consumer)
+
+        return consumer
+
+    def remove_consumer(self, consumer : "Camera.Consumer") -> None:
+        if consumer in self._consumers:
+            self._consumers.remove(consumer)
+
+    # Uses the default consumer. See Camera.Consumer.wait_next_frame().
+    def wait_next_frame(self,
+                        timeout     : int             = None,
+                        frame_encode: bool            = False,
+                        mirror      : bool            = True,
+                        quality     : int             = None,
+                        resize      : Tuple[int, int] = None) -> Union[bytes, ndarray]:
+        return self._consumer.wait_next_frame(timeout, frame_encode, mirror, quality, resize)
+
+    """
+        Yields every new frame once, until the camera stops. Each call creates
+        it's own consumer, so several loops can iterate at the same time.
 
-            if frame_encode:
-                # Returns bytes
-                return Image.Encode.FromRawImage(last_frame, self._frame_encode)
+        Example:
+            for frame in camera.frames():
+                process(frame)
+    """
+    def frames(self,
+               frame_encode: bool            = False,
+               mirror      : bool            = True,
+               name        : str             = "frames",
+               quality     : int             = None,
+               resize      : Tuple[int, int] = None):
+        consumer = self.create_consumer(name)
 
-            # Returns numpy.ndarray or bytes if frame is empty
-            return last_frame
+        try:
+            while self._status:
+                try:
+                    yield consumer.wait_next_frame(None, frame_encode, mirror, quality, resize)
+                except Exception:
+                    if not self._status: break
+                    raise
+        finally:
+            self.remove_consumer(consumer)
+
+    # None if file_name is not given. See VideoRecorder.get_statistics().
+    def get_recorder(self) -> Union[VideoRecorder, None]:
+        return self._recorder
+
+    def get_captured_count(self) -> int:
+        return self._last_frame_seq
+
+    # { "hits" : count, "misses" : count }, see get_last_frame().
+    def get_cache_statistics(self) -> dict:
+        return {
+            "hits"   : self._cache_hit_count,
+            "misses" : self._cache_miss_count
+        }
+
+    # { "captured" : count, "cache" : { ... }, "consumers" : { name : { "consumed" : count, "dropped" : count } } }
+    def get_statistics(self) -> dict:
+        return {
+            "captured"  : self.get_captured_count(),
+            "cache"     : self.get_cache_statistics(),
+            "consumers" : {
+                consumer.name : {
+                    "consumed" : consumer.get_consumed_count(),
+                    "dropped"  : consumer.get_dropped_count()
+                } for consumer in list(self._consumers)
+            }
+        }
+
+    """
+        Transforms are cached per frame: consumers that ask for the same frame
+        with the same transform get the same object. Returned frames must be
+        treated as read-only, copy them before drawing on them.
+        mirror  - flips the frame horizontally. Must be False to get the JPEG
+                  of an encoded backend as it is, see the notes above.
+        quality - 0-100, encode quality (JPEG, WebP). None means default.
+        resize  - (width, height) or None.
+    """
+    def get_last_frame(self,
+                       frame_encode: bool            = False,
+                       mirror      : bool            = True,
+                       quality     : int             = None,
+                       resize      : Tuple[int, int] = None) -> Union[bytes, ndarray]:
+        with self._frame_condition:
+            last_frame = self._last_frame
+            seq        = self._last_frame_seq
+
+        if len(last_frame) != 0:
+            # Returns numpy.ndarray or bytes if frame is encoded
+            return self._transform_frame(seq, last_frame, frame_encode, mirror, quality, resize)
 
         if frame_encode:
             raise ValueError("Last frame is empty! Cannot encode it.")
@@ -0,0 +1,281 @@
+"""
+    Author: Ege Bilecen
+    Date  : 17.10.2026
+
+    Notes:
+    * Frame sources for Camera. Every backend has the same interface as
+      cv2.VideoCapture's grab()/retrieve()/read(), so grabbing can be split from
+      decoding.
+    * Backends that return encoded frames (is_encoded() returns True) give the
+      JPEG data as a 1 dimensional numpy.ndarray. Camera only decodes them when
+      a raw frame is actually needed.
+"""
+from time   import sleep, monotonic
+from typing import Tuple, Union
+import numpy as np
+import cv2
+
+from eb.logger import Logger
+
+class CaptureBackend:
+    def __init__(self) -> None:
+        self.LOG_INFO = "capture_backend.py - "
+
+    # Public Method(s)
+    def open(self) -> bool:
+        raise NotImplementedError
+
+    def is_opened(self) -> bool:
+        raise NotImplementedError
+
+    def grab(self) -> bool:
+        raise NotImplementedError
+
+    def retrieve(self) -> Tuple[bool, Union[np.ndarray, None]]:
+        raise NotImplementedError
+
+    def read(self) -> Tuple[bool, Union[np.ndarray, None]]:
+        if not self.grab(): return False, None
+
+        return self.retrieve()
+
+    def release(self) -> None:
+        raise NotImplementedError
+
+    def is_encoded(self) -> bool:
+        return False
+
+class OpenCVBackend(CaptureBackend):
+    def __init__(self,
+                 device         : Union[int, str] = 0,
+                 resolution     : Tuple[int, int] = (640, 480),
+                 fps            : int             = 30,
+                 api_preference : int             = cv2.CAP_ANY,
+                 fourcc         : str             = None) -> None:
+        super().__init__()
+
+        self._device         = device
+        self._resolution     = resolution
+        self._fps            = fps
+        self._api_preference = api_preference
+        self._fourcc         = fourcc
+        self._capture        = None
+
+    # Private Method(s)
+    def _apply_properties(self):
+        if self._fourcc is not None:
+            self._capture.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*self._fourcc))
+
+        if self._resolution is not None:
+            self._capture.set(cv2.CAP_PROP_FRAME_WIDTH,  self._resolution[0])
+            self._capture.set(cv2.CAP_PROP_FRAME_HEIGHT, self._resolution[1])
+
+        if self._fps is not None:
+            self._capture.set(cv2.CAP_PROP_FPS, self._fps)
+
+        # Devices silently fall back to what they support.
+        Logger.PrintLog(self.LOG_INFO+"_apply_properties()", "Device {} - Resolution: {}x{}, FPS: {}."
+                        .format(self._device,
+                                int(self._capture.get(cv2.CAP_PROP_FRAME_WIDTH)),
+                                int(self._capture.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+                                self._capture.get(cv2.CAP_PROP_FPS)))
+
+    # Public Method(s)
+    def open(self) -> bool:
+        self._capture = cv2.VideoCapture(self._device, self._api_preference)
+
+        if not self._capture.isOpened(): return False
+
+        self._apply_properties()
+
+        return True
+
+    def is_opened(self) -> bool:
+        return self._capture is not None and self._capture.isOpened()
+
+    def grab(self) -> bool:
+        return self._capture.grab()
+
+    def retrieve(self) -> Tuple[bool, Union[np.ndarray, None]]:
+        return self._capture.retrieve()
+
+    def read(self) -> Tuple[bool, Union[np.ndarray, None]]:
+        return self._capture.read()
+
+    def release(self) -> None:
+        if self._capture is not None:
+            self._capture.release()
+
+    def get_capture(self) -> cv2.VideoCapture:
+        return self._capture
+
+class V4L2MjpegBackend(OpenCVBackend):
+    """
+        Requests MJPEG from a V4L2 device and hands the JPEG data out as it is,
+        without decoding it. Encoding the frame again is avoided as well if
+        Camera is asked for a JPEG frame without any transform, which means
+        mirror=False since Camera mirrors frames by default.
+    """
+    def __init__(self,
+                 device     : Union[int, str] = 0,
+                 resolution : Tuple[int, int] = (640, 480),
+                 fps        : int             = 30) -> None:
+        super().__init__(device, resolution, fps, cv2.CAP_V4L2, "MJPG")
+
+    # Private Method(s)
+    def _apply_properties(self):
+        super()._apply_properties()
+
+        # Disables decoding, retrieve() returns the compressed frame.
+        self._capture.set(cv2.CAP_PROP_CONVERT_RGB, 0)
+
+    # Public Method(s)
+    def retrieve(self) -> Tuple[bool, Union[np.ndarray, None]]:
+        ret, frame = self._capture.retrieve()
+
+        if not ret or frame is None: return False, None
+
+        return True, frame.reshape(-1)
+
+    def read(self) -> Tuple[bool, Union[np.ndarray, None]]:
+        return CaptureBackend.read(self)
+
+    def is_encoded(self) -> bool:
+        return True
+
+class GStreamerBackend(OpenCVBackend):
+    """
+        Captures from a GStreamer pipeline that ends with an appsink, so
+        decoding and scaling can be done by hardware elements.
+
+        Example (Jetson):
+            GStreamerBackend(GStreamerBackend.get_v4l2_pipeline("/dev/video0", decoder="nvjpegdec"))
+    """
+    def __init__(self, pipeline : str) -> None:
+        super().__init__(pipeline, None, None, cv2.CAP_GSTREAMER)
+
+    # Public Method(s)
+    @staticmethod
+    def get_v4l2_pipeline(device     : str             = "/dev/video0",
+                          resolution : Tuple[int, int] = (640, 480),
+                          fps        : int             = 30,
+                          decoder    : str             = "jpegdec") -> str:
+        return ("v4l2src device={} ! image/jpeg,width={},height={},framerate={}/1 ! {} ! "
+                "videoconvert ! video/x-raw,format=BGR ! appsink drop=true max-buffers=1 sync=false") \
+               .format(device, resolution[0], resolution[1], fps, decoder)
+
+class SyntheticBackend(CaptureBackend):
+    """
+        Generates frames with a moving square on a gradient, for testing and
+        benchmarking without a camera. If realtime is True, frames are paced
+        at fps like a real device.
+    """
+    def __init__(self,
+                 resolution : Tuple[int, int] = (640, 480),
+                 fps        : int             = 30,
+                 realtime   : bool            = True) -> None:
+        super().__init__()
+
+        self._resolution  = resolution
+        self._fps         = fps
+        self._realtime    = realtime
+        self._is_opened   = False
+        self._frame_index = 0
+        self._next_time   = 0
+
+        width, height = resolution
+        gradient      = np.linspace(0, 255, width, dtype=np.uint8)
+
+        self._background = np.dstack([np.tile(gradient, (height, 1))] * 3)
+
+    # Public Method(s)
+    def open(self) -> bool:
+        self._is_opened   = True
+        self._frame_index = 0
+        self._next_time   = monotonic()
+
+        return True
+
+    def is_opened(self) -> bool:
+        return self._is_opened
+
+    def grab(self) -> bool:
+        if not self._is_opened: return False
+
+        if self._realtime:
+            delay = self._next_time - monotonic()
+
+            if delay > 0: sleep(delay)
+
+            self._next_time = max(self._next_time + 1 / self._fps, monotonic())
+
+        self._frame_index += 1
+
+        return True
+
+    def retrieve(self) -> Tuple[bool, Union[np.ndarray, None]]:
+        if not self._is_opened: return False, None
+
+        width, height = self._resolution
+        size          = max(1, height // 8)
+        x             = (self._frame_index * 4) % max(1, width - size)
+        y             = (height - size) // 2
+
+        frame = self._background.copy()
+        frame[y:y + size, x:x + size] = (0, 0, 255)
+
+        return True, frame
+
+    def release(self) -> None:
+        self._is_opened = False
+
+class FileBackend(OpenCVBackend):
+    """
+        Replays a video file. If realtime is True, frames are paced at the
+        file's fps (or the given fps). If loop is True, the file is replayed
+        from the start when it ends.
+    """
+    def __init__(self,
+                 file_path : str,
+                 loop      : bool = True,
+                 realtime  : bool = True,
+                 fps       : int  = None) -> None:
+        super().__init__(file_path, None, None)
+
+        self._loop      = loop
+        self._realtime  = realtime
+        self._file_fps  = fps
+        self._next_time = 0
+
+    # Private Method(s)
+    def _apply_properties(self):
+        if self._file_fps is None:
+            self._file_fps = self._capture.get(cv2.CAP_PROP_FPS) or 30
+
+    # Public Method(s)
+    def open(self) -> bool:
+        self._next_time = monotonic()
+
+        return super().open()
+
+    def grab(self) -> bool:
+        if self._realtime:
+            delay = self._next_time - monotonic()
+
+            if delay > 0: sleep(delay)
+
+            self._next_time = max(self._next_time + 1 / self._file_fps, monotonic())
+
+        if self._capture.grab(): return True
+
+        if not self._loop:
+            # Camera stops once the backend is not opened anymore.
+            self._capture.release()
+            return False
+
+        self._capture.set(cv2.CAP_PROP_POS_FRAMES, 0)
+
+        return self._capture.grab()
+
+    def read(self) -> Tuple[bool, Union[np.ndarray, None]]:
+        return CaptureBackend.read(self)
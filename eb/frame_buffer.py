@@ -0,0 +1,246 @@
+"""
+    Author: Ege Bilecen
+    Date  : 17.10.2026
+
+    Notes:
+    * Fixed size ring of frames in shared memory. One process writes (Camera),
+      any number of processes can attach by name and read the frames without
+      copying them through pipes or pickling.
+    * Every frame gets a sequence number, starting from 1, and the timestamp it
+      was captured at (ms, time.monotonic() based).
+    * Slots are protected by a sequence lock. A slot's sequence number is set
+      to 0 while it is being written, so readers can detect that the frame they
+      copied (or are looking at) has been overwritten. See read() and get_view().
+"""
+from multiprocessing import shared_memory, resource_tracker
+from time            import sleep, monotonic
+from typing          import Tuple, Union
+import numpy as np
+import threading
+
+class FrameBuffer:
+    _MAGIC       = 0x45424642 # "EBFB"
+    _HEADER_SIZE = 8          # int64 fields, see below
+
+    _attach_lock = threading.Lock()
+
+    # Header fields
+    _H_MAGIC      = 0
+    _H_SLOT_COUNT = 1
+    _H_HEIGHT     = 2
+    _H_WIDTH      = 3
+    _H_CHANNELS   = 4
+    _H_LATEST_SEQ = 5
+
+    def __init__(self,
+                 slot_count  : int             = 8,
+                 frame_shape : Tuple[int, ...] = (480, 640, 3),
+                 name        : str             = None,
+                 create      : bool            = True) -> None:
+        if create:
+            if slot_count < 2: raise ValueError("slot_count < 2")
+
+            frame_shape = tuple(frame_shape) if len(frame_shape) == 3 else tuple(frame_shape) + (1,)
+            frame_size  = int(np.prod(frame_shape))
+
+            self._shm = shared_memory.SharedMemory(name   = name,
+                                                   create = True,
+                                                   size   = FrameBuffer._get_meta_size(slot_count)
+                                                            + slot_count * frame_size)
+        else:
+            self._shm = FrameBuffer._attach_shared_memory(name)
+
+        self._header = np.ndarray((FrameBuffer._HEADER_SIZE,), dtype=np.int64, buffer=self._shm.buf)
+
+        if create:
+            self._header[:] = 0
+            self._header[FrameBuffer._H_MAGIC]      = FrameBuffer._MAGIC
+            self._header[FrameBuffer._H_SLOT_COUNT] = slot_count
+            self._header[FrameBuffer._H_HEIGHT]     = frame_shape[0]
+            self._header[FrameBuffer._H_WIDTH]      = frame_shape[1]
+            self._header[FrameBuffer._H_CHANNELS]   = frame_shape[2]
+        elif self._header[FrameBuffer._H_MAGIC] != FrameBuffer._MAGIC:
+            self._shm.close()
+            raise ValueError("Shared memory {} is not a frame buffer.".format(name))
+
+        self._slot_count  = int(self._header[FrameBuffer._H_SLOT_COUNT])
+        self._frame_shape = (int(self._header[FrameBuffer._H_HEIGHT]),
+                             int(self._header[FrameBuffer._H_WIDTH]),
+                             int(self._header[FrameBuffer._H_CHANNELS]))
+
+        offset = FrameBuffer._HEADER_SIZE * 8
+
+        # Slot sequence numbers and timestamps.
+        self._seqs = np.ndarray((self._slot_count,), dtype=np.int64,
+                                buffer=self._shm.buf, offset=offset)
+        offset += self._slot_count * 8
+
+        self._timestamps = np.ndarray((self._slot_count,), dtype=np.float64,
+                                      buffer=self._shm.buf, offset=offset)
+
+        self._frames = np.ndarray((self._slot_count,) + self._frame_shape, dtype=np.uint8,
+                                  buffer=self._shm.buf, offset=FrameBuffer._get_meta_size(self._slot_count))
+
+        if create:
+            self._seqs[:]       = 0
+            self._timestamps[:] = 0
+
+        self._is_owner  = create
+        self._condition = threading.Condition()
+
+    # Private Method(s)
+    @staticmethod
+    def _attach_shared_memory(name):
+        # Only the creator should unlink. Attached memory is untracked, otherwise
+        # the resource tracker of a reader process unlinks it when that exits.
+        try:
+            return shared_memory.SharedMemory(name=name, track=False)
+        except TypeError: # Python < 3.13, registering can't be disabled.
+            pass
+
+        with FrameBuffer._attach_lock:
+            register = resource_tracker.register
+
+            try:
+                resource_tracker.register = lambda name, rtype: None
+                return shared_memory.SharedMemory(name=name)
+            finally:
+                resource_tracker.register = register
+
+    @staticmethod
+    def _get_meta_size(slot_count):
+        return (FrameBuffer._HEADER_SIZE + slot_count * 2) * 8
+
+    def _get_seq_to_read(self, after_seq):
+        latest_seq = int(self._header[FrameBuffer._H_LATEST_SEQ])
+
+        if latest_seq <= after_seq: return None
+
+        # Reader has been lapped. Oldest slot might be being written right
+        # now, so skip to the one after it.
+        return max(after_seq + 1, latest_seq - self._slot_count + 2)
+
+    # Public Method(s)
+    # Attaches to a frame buffer that is created by another process.
+    @staticmethod
+    def attach(name : str) -> "FrameBuffer":
+        return FrameBuffer(name=name, create=False)
+
+    def get_name(self) -> str:
+        return self._shm.name
+
+    def get_slot_count(self) -> int:
+        return self._slot_count
+
+    def get_frame_shape(self) -> Tuple[int, int, int]:
+        return self._frame_shape
+
+    # Number of bytes in a frame.
+    def get_frame_size(self) -> int:
+        return self._frame_shape[0] * self._frame_shape[1] * self._frame_shape[2]
+
+    def get_latest_seq(self) -> int:
+        return int(self._header[FrameBuffer._H_LATEST_SEQ])
+
+    # Only the creator should write. Returns the sequence number of the frame.
+    def write(self,
+              frame     : np.ndarray,
+              timestamp : float = None) -> int:
+        if timestamp is None:
+            timestamp = monotonic() * 1000
+
+        seq  = int(self._header[FrameBuffer._H_LATEST_SEQ]) + 1
+        slot = seq % self._slot_count
+
+        self._seqs[slot] = 0
+        np.copyto(self._frames[slot], frame.reshape(self._frame_shape))
+        self._timestamps[slot] = timestamp
+        self._seqs[slot]       = seq
+
+        self._header[FrameBuffer._H_LATEST_SEQ] = seq
+
+        with self._condition:
+            self._condition.notify_all()
+
+        return seq
+
+    # Returns True if the frame with seq hasn't been overwritten yet.
+    def is_valid(self, seq : int) -> bool:
+        return seq > 0 and int(self._seqs[seq % self._slot_count]) == seq
+
+    """
+        Returns (timestamp, frame) without copying the frame, None if seq is not
+        in the buffer. The view is overwritten by the writer once it laps the
+        buffer, check is_valid(seq) after using it if that matters.
+    """
+    def get_view(self, seq : int) -> Union[Tuple[float, np.ndarray], None]:
+        if not self.is_valid(seq): return None
+
+        slot      = seq % self._slot_count
+        timestamp = float(self._timestamps[slot])
+
+        if not self.is_valid(seq): return None
+
+        return timestamp, self._frames[slot]
+
+    # Returns (timestamp, copy of the frame) or None. out can be given to avoid allocation.
+    def read(self,
+             seq : int,
+             out : np.ndarray = None) -> Union[Tuple[float, np.ndarray], None]:
+        view = self.get_view(seq)
+
+        if view is None: return None
+
+        if out is None: out = np.empty(self._frame_shape, dtype=np.uint8)
+
+        np.copyto(out, view[1])
+
+        # Frame might have been overwritten while copying.
+        if not self.is_valid(seq): return None
+
+        return view[0], out
+
+    """
+        Blocks until a frame newer than after_seq is written. Returns
+        (seq, timestamp, frame view), None on timeout. If the reader has fallen
+        behind, the oldest frame still in the buffer is returned.
+        timeout - None means wait forever.
+    """
+    def wait_next(self,
+                  after_seq : int,
+                  timeout   : float = None) -> Union[Tuple[int, float, np.ndarray], None]:
+        deadline = None if timeout is None else monotonic() + timeout / 1000
+
+        while 1:
+            seq = self._get_seq_to_read(after_seq)
+
+            if seq is not None:
+                view = self.get_view(seq)
+
+                if view is not None:
+                    return seq, view[0], view[1]
+
+                # Overwritten in between, try the next one.
+                after_seq = seq
+                continue
+
+            remaining = None if deadline is None else deadline - monotonic()
+
+            if remaining is not None and remaining <= 0: return None
+
+            if self._is_owner:
+                with self._condition:
+                    if self._get_seq_to_read(after_seq) is None:
+                        self._condition.wait(remaining)
+            else:
+                # Conditions can't be shared with other processes.
+                sleep(0.001 if remaining is None else min(0.001, remaining))
+
+    def close(self) -> None:
+        # Views must be released before the shared memory can be closed.
+        self._header = self._seqs = self._timestamps = self._frames = None
+        self._shm.close()
+
+    # Only the creator should unlink, after every process has closed it.
+    def unlink(self) -> None:
+        self._shm.unlink()
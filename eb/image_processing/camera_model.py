@@ -0,0 +1,226 @@
+"""
+    Author: Ege Bilecen
+    Date  : 17.10.2026
+
+    Notes:
+    * Intrinsics of a camera: resolution, focal length (px, or from the
+      horizontal field of view), principal point and distortion coefficients
+      (k1, k2, p1, p2[, k3], OpenCV's model).
+    * Undistortion remap tables are computed once in the constructor, so
+      undistort() is a single cv2.remap() per frame.
+    * Pixels are projected to the ground (flat, altitude metres below the
+      camera) as north/east offsets in metres from the vehicle, for all the
+      points at once. Camera is assumed to be at the vehicle's position, it's
+      tilt is the angle below the vehicle's forward axis (90 = pointing down)
+      and the top of the image is towards the vehicle's front.
+    * Attitude (roll, pitch, yaw) is in radians, like ATTITUDE messages. Pixels
+      whose rays don't hit the ground (at or above the horizon) are NaN.
+
+    Example:
+        camera_model = CameraModel((640, 480), horizontal_fov=62.2, distortion=(-0.28, 0.07, 0, 0))
+        Util.set_camera_model(camera_model)
+
+        while 1:
+            frame      = camera_model.undistort(camera.get_last_frame())
+            point_list = Color.detect_blob(frame, ColorList.HSV.RED, as_array=True)
+            lat_lon    = camera_model.geolocate(point_list, vehicle.telemetry(), is_undistorted=True)
+"""
+from typing import Tuple, Union
+import math
+import numpy as np
+import cv2
+
+class CameraModel:
+    EARTH_RADIUS = 6378137 # m, WGS84 equatorial radius
+
+    def __init__(self,
+                 resolution      : Tuple[int, int]     = (640, 480),
+                 focal_length    : Union[float, tuple] = None, # px, (fx, fy) or a single value for both
+                 horizontal_fov  : float               = None, # degree, used if focal_length is None
+                 principal_point : Tuple[float, float] = None, # px, center of the frame if None
+                 distortion      : tuple               = None, # (k1, k2, p1, p2[, k3])
+                 tilt            : float               = 90) -> None: # degree
+        if focal_length is None and horizontal_fov is None:
+            raise ValueError("Either focal_length or horizontal_fov must be given.")
+
+        if focal_length is None:
+            if not 0 < horizontal_fov < 180: raise ValueError("horizontal_fov must be between 0 and 180.")
+
+            focal_length = resolution[0] / 2 / math.tan(math.radians(horizontal_fov) / 2)
+
+        if not isinstance(focal_length, (tuple, list)):
+            focal_length = (focal_length, focal_length)
+
+        if principal_point is None:
+            principal_point = (resolution[0] / 2, resolution[1] / 2)
+
+        self._resolution      = tuple(resolution)
+        self._focal_length    = tuple(float(f) for f in focal_length)
+        self._principal_point = tuple(float(c) for c in principal_point)
+        self._tilt            = math.radians(tilt)
+
+        self._camera_matrix = np.array([[self._focal_length[0], 0.,                     self._principal_point[0]],
+                                        [0.,                     self._focal_length[1], self._principal_point[1]],
+                                        [0.,                     0.,                     1.]])
+        self._distortion    = np.asarray(distortion if distortion is not None else (0., 0., 0., 0.), dtype=np.float64)
+
+        self._has_distortion = bool(np.any(self._distortion != 0))
+
+        # Fixed point tables, faster to remap with than float ones.
+        if self._has_distortion:
+            self._map_1, self._map_2 = cv2.initUndistortRectifyMap(self._camera_matrix, self._distortion, None,
+                                                                   self._camera_matrix, self._resolution, cv2.CV_16SC2)
+        else:
+            self._map_1 = self._map_2 = None
+
+    # Private Method(s)
+    # Rotation from the vehicle's body frame (front, right, down) to north, east, down.
+    @staticmethod
+    def _get_body_to_ned(roll, pitch, yaw):
+        cr, sr = math.cos(roll),  math.sin(roll)
+        cp, sp = math.cos(pitch), math.sin(pitch)
+        cy, sy = math.cos(yaw),   math.sin(yaw)
+
+        return np.array([[cy * cp, cy * sp * sr - sy * cr, cy * sp * cr + sy * sr],
+                         [sy * cp, sy * sp * sr + cy * cr, sy * sp * cr - cy * sr],
+                         [-sp,     cp * sr,                cp * cr]])
+
+    # Returns the global position and attitude records, None if they are not received yet.
+    @staticmethod
+    def _get_telemetry(telemetry):
+        global_position, attitude = telemetry.get_consistent("global_position", "attitude")
+
+        if global_position is None or attitude is None: return None
+
+        return global_position, attitude
+
+    # Public Method(s)
+    def get_resolution(self) -> Tuple[int, int]:
+        return self._resolution
+
+    def get_center_point(self) -> Tuple[int, int]:
+        return int(self._principal_point[0]), int(self._principal_point[1])
+
+    def get_focal_length(self) -> Tuple[float, float]:
+        return self._focal_length
+
+    def get_camera_matrix(self) -> np.ndarray:
+        return self._camera_matrix.copy()
+
+    def get_distortion(self) -> np.ndarray:
+        return self._distortion.copy()
+
+    # degree
+    def get_fov(self) -> Tuple[float, float]:
+        return (math.degrees(2 * math.atan(self._resolution[0] / 2 / self._focal_length[0])),
+                math.degrees(2 * math.atan(self._resolution[1] / 2 / self._focal_length[1])))
+
+    """
+        Returns the undistorted frame. It is the same frame if there is no
+        distortion. dst can be given to avoid allocating the output.
+    """
+    def undistort(self,
+                  frame : np.ndarray,
+                  dst   : np.ndarray = None) -> np.ndarray:
+        if frame is None or not self._has_distortion: return frame
+
+        if (frame.shape[1], frame.shape[0]) != self._resolution:
+            raise ValueError("Frame resolution {}x{} doesn't match the camera model's {}x{}."
+                             .format(frame.shape[1], frame.shape[0], self._resolution[0], self._resolution[1]))
+
+        return cv2.remap(frame, self._map_1, self._map_2, cv2.INTER_LINEAR, dst=dst)
+
+    """
+        Returns an (N, 2) array of the normalized image coordinates (x / z,
+        y / z on the camera's axes) of the pixels.
+        is_undistorted - points are on an undistorted frame, see undistort().
+    """
+    def normalize_points(self,
+                         points         : Union[list, np.ndarray],
+                         is_undistorted : bool = False) -> np.ndarray:
+        point_array = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+
+        if len(point_array) == 0 or is_undistorted or not self._has_distortion:
+            return (point_array - self._principal_point) / self._focal_length
+
+        return cv2.undistortPoints(point_array.reshape(-1, 1, 2), self._camera_matrix, self._distortion).reshape(-1, 2)
+
+    # Returns an (N, 2) array of the pixels' positions on the undistorted frame.
+    def undistort_points(self, points : Union[list, np.ndarray]) -> np.ndarray:
+        return self.normalize_points(points) * self._focal_length + self._principal_point
+
+    """
+        Returns an (N, 2) array of north and east offsets (m) from the vehicle
+        of the ground points that the pixels see.
+        altitude         - m, height of the camera above the ground.
+        roll, pitch, yaw - radian, vehicle's attitude.
+    """
+    def project_to_ground(self,
+                          points         : Union[list, np.ndarray],
+                          altitude       : float,
+                          roll           : float = 0,
+                          pitch          : float = 0,
+                          yaw            : float = 0,
+                          is_undistorted : bool  = False) -> np.ndarray:
+        normalized = self.normalize_points(points, is_undistorted)
+
+        if len(normalized) == 0: return np.empty((0, 2))
+
+        x, y = normalized[:, 0], normalized[:, 1]
+        ct, st = math.cos(self._tilt), math.sin(self._tilt)
+
+        # Rays in the body frame. Optical axis is (cos(tilt), 0, sin(tilt)),
+        # image right is the body's right and image down is perpendicular to both.
+        ray_array = np.column_stack((ct - y * st, x, st + y * ct))
+        ray_array = ray_array @ CameraModel._get_body_to_ned(roll, pitch, yaw).T
+
+        down = ray_array[:, 2]
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            scale = np.where(down > 1e-9, altitude / down, np.nan)
+
+        return ray_array[:, :2] * scale[:, None]
+
+    """
+        project_to_ground() with the relative altitude and attitude from the
+        vehicle's telemetry (eb.mavlink.vehicle.Vehicle.telemetry()), read from
+        the same snapshot. Returns None if they are not received yet.
+    """
+    def project_to_ground_from_telemetry(self,
+                                         points         : Union[list, np.ndarray],
+                                         telemetry,
+                                         is_undistorted : bool = False) -> Union[np.ndarray, None]:
+        record_list = CameraModel._get_telemetry(telemetry)
+
+        if record_list is None: return None
+
+        global_position, attitude = record_list
+
+        return self.project_to_ground(points, global_position.relative_alt,
+                                      attitude.roll, attitude.pitch, attitude.yaw,
+                                      is_undistorted)
+
+    """
+        Returns an (N, 2) array of latitudes and longitudes (degree) of the
+        ground points that the pixels see, None if the telemetry is not
+        received yet. Offsets are converted with a flat earth approximation,
+        which is fine for the distances a camera sees.
+    """
+    def geolocate(self,
+                  points         : Union[list, np.ndarray],
+                  telemetry,
+                  is_undistorted : bool = False) -> Union[np.ndarray, None]:
+        record_list = CameraModel._get_telemetry(telemetry)
+
+        if record_list is None: return None
+
+        global_position, attitude = record_list
+
+        offset = self.project_to_ground(points, global_position.relative_alt,
+                                        attitude.roll, attitude.pitch, attitude.yaw,
+                                        is_undistorted)
+
+        lat = global_position.lat + np.degrees(offset[:, 0] / CameraModel.EARTH_RADIUS)
+        lon = global_position.lon + np.degrees(offset[:, 1] / (CameraModel.EARTH_RADIUS * math.cos(math.radians(global_position.lat))))
+
+        return np.column_stack((lat, lon))
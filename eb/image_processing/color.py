@@ -2,6 +2,11 @@
     Author: Ege Bilecen
     Date  : 04.08.2020
 """
+from typing import List
+import threading
+import numpy as np
+import cv2
+
 class Color:
     class HSV:
         def __init__(self,
@@ -15,3 +20,155 @@ class Color:
 
         def get_high_values(self):
             return self._high
+
+    class Classifier:
+        """
+            Builds the mask of pixels that are in any of the HSV ranges of a
+            color list. Use Color.Classifier.get(color_list), classifiers are
+            cached per color list.
+
+            * Ranges that are the same, inside another one, or that can be
+              joined into a single range are merged first.
+            * Few ranges are checked with cv2.inRange() into the output mask.
+            * From LUT_MIN_RANGE_COUNT ranges, a per channel bit lookup table
+              is used. Every range gets a bit, a pixel is in the mask if the
+              bit is set for all three channels. Cost of it doesn't depend on
+              the range count, but it is slower than a few cv2.inRange() calls.
+        """
+        LUT_MIN_RANGE_COUNT = 7
+
+        _cache      = {}
+        _cache_lock = threading.Lock()
+
+        def __init__(self, color_list : List["Color.HSV"]) -> None:
+            if len(color_list) < 1: raise ValueError("No color is given.")
+
+            self._range_list = Color.Classifier._merge_ranges([(tuple(int(v) for v in color.get_low_values()),
+                                                                tuple(int(v) for v in color.get_high_values()))
+                                                               for color in color_list])
+            self._lut_list   = []
+
+            if len(self._range_list) >= Color.Classifier.LUT_MIN_RANGE_COUNT:
+                # 8 ranges (bits) per table.
+                for i in range(0, len(self._range_list), 8):
+                    lut = np.zeros((1, 256, 3), dtype=np.uint8)
+
+                    for bit, (low, high) in enumerate(self._range_list[i:i + 8]):
+                        for channel in range(3):
+                            lut[0, low[channel]:high[channel] + 1, channel] |= 1 << bit
+
+                    self._lut_list.append(lut)
+
+            self._bound_list = [(np.array(low, dtype=np.uint8), np.array(high, dtype=np.uint8))
+                                for low, high in self._range_list]
+
+        # Private Method(s)
+        @staticmethod
+        def _merge_ranges(range_list):
+            range_list = list(dict.fromkeys(range_list))
+
+            is_merged = True
+
+            while is_merged:
+                is_merged = False
+
+                for i in range(len(range_list)):
+                    for j in range(len(range_list)):
+                        if i == j: continue
+
+                        merged = Color.Classifier._merge_two_ranges(range_list[i], range_list[j])
+
+                        if merged is not None:
+                            range_list[i] = merged
+                            range_list.pop(j)
+                            is_merged = True
+                            break
+
+                    if is_merged: break
+
+            return range_list
+
+        # Returns the range that covers exactly both of them, None if there isn't one.
+        @staticmethod
+        def _merge_two_ranges(range_a, range_b):
+            (low_a, high_a), (low_b, high_b) = range_a, range_b
+
+            # b is inside a
+            if all(low_a[c] <= low_b[c] and high_b[c] <= high_a[c] for c in range(3)):
+                return range_a
+
+            different_list = [c for c in range(3) if low_a[c] != low_b[c] or high_a[c] != high_b[c]]
+
+            if len(different_list) != 1: return None
+
+            c = different_list[0]
+
+            # Overlapping or adjacent on the only different channel.
+            if low_b[c] > high_a[c] + 1 or low_a[c] > high_b[c] + 1: return None
+
+            low  = list(low_a)
+            high = list(high_a)
+            low[c]  = min(low_a[c],  low_b[c])
+            high[c] = max(high_a[c], high_b[c])
+
+            return tuple(low), tuple(high)
+
+        # Public Method(s)
+        @staticmethod
+        def get(color_list : List["Color.HSV"]) -> "Color.Classifier":
+            key = tuple((tuple(color.get_low_values()), tuple(color.get_high_values())) for color in color_list)
+
+            with Color.Classifier._cache_lock:
+                classifier = Color.Classifier._cache.get(key)
+
+                if classifier is None:
+                    classifier = Color.Classifier(color_list)
+                    Color.Classifier._cache[key] = classifier
+
+            return classifier
+
+        # Number of ranges after merging.
+        def get_range_count(self) -> int:
+            return len(self._range_list)
+
+        def is_lut(self) -> bool:
+            return len(self._lut_list) > 0
+
+        """
+            Returns the mask (255 for pixels in any of the ranges) of an HSV
+            frame. dst and work (same shape as the mask) can be given to avoid
+            allocating the mask and the per range mask.
+        """
+        def get_mask(self,
+                     hsv  : np.ndarray,
+                     dst  : np.ndarray = None,
+                     work : np.ndarray = None) -> np.ndarray:
+            if dst is None:
+                dst = np.empty(hsv.shape[:2], dtype=np.uint8)
+
+            if not self.is_lut():
+                cv2.inRange(hsv, self._bound_list[0][0], self._bound_list[0][1], dst=dst)
+
+                if len(self._bound_list) > 1:
+                    if work is None:
+                        work = np.empty_like(dst)
+
+                    for low, high in self._bound_list[1:]:
+                        cv2.inRange(hsv, low, high, dst=work)
+                        cv2.bitwise_or(dst, work, dst=dst)
+
+                return dst
+
+            for i, lut in enumerate(self._lut_list):
+                h, s, v = cv2.split(cv2.LUT(hsv, lut))
+
+                cv2.bitwise_and(h, s, dst=h)
+                cv2.bitwise_and(h, v, dst=h)
+
+                if i == 0:
+                    cv2.threshold(h, 0, 255, cv2.THRESH_BINARY, dst=dst)
+                else:
+                    cv2.threshold(h, 0, 255, cv2.THRESH_BINARY, dst=h)
+                    cv2.bitwise_or(dst, h, dst=dst)
+
+            return dst
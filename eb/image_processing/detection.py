@@ -2,8 +2,16 @@
     Author : Ege Bilecen
     Date   : 05.11.2019
     Updated: 10.09.2020 - Improved circle detection based on color.
+             17.10.2026 - Pyramid (multi-scale) detection.
+
+    Notes:
+    * If pyramid_level is given, detect_blob() and detect_circle() detect on
+      the frame downscaled by 2^pyramid_level. Areas, radiuses and distances
+      are scaled with it and the points are mapped back to full resolution.
+      If refine is True, detection is done again at full resolution, but only
+      in the regions around the points that are found on the small frame.
 """
-from typing import List
+from typing import List, Union
 import cv2
 import numpy as np
 
@@ -11,155 +19,165 @@ from eb.math import Math
 from eb.image_processing.color import Color as EB_Color
 from eb.image_processing.util  import Util
 
-class Color:
-    @staticmethod
-    def detect_blob(frame     : np.array,
-                    color_list: List[EB_Color.HSV],
-                    min_area  : int = 250) -> list:
-        if frame is None      : return []
-        if len(color_list) < 1: return []
+# Detectors return a list of (x, y) tuples, or an (N, 2) array if as_array
+# is True. See the array methods of eb.image_processing.util.Util.Point.
+def _to_center_output(center_list, as_array):
+    if as_array:
+        return np.array(center_list, dtype=np.int32).reshape(-1, 2)
 
-        cv2.GaussianBlur(frame, (11, 11), 0)
+    return center_list
 
-        hsv = cv2.cvtColor(frame, cv2.COLOR_BGR2HSV)
-        mask = cv2.inRange(hsv, color_list[0].get_low_values(), color_list[0].get_high_values())
+_kernel_list = {} # size : kernel
 
-        if len(color_list) > 1:
-            for color in color_list[1:]:
-                color_mask = cv2.inRange(hsv, color.get_low_values(), color.get_high_values())
-                mask = cv2.bitwise_or(mask, color_mask)
+# Morphology kernels are created once per size.
+def _get_kernel(size):
+    kernel = _kernel_list.get(size)
 
-        kernel = np.ones((5, 5), np.uint8)
-        eroded = cv2.erode(mask, kernel, iterations=1)
-        dilated = cv2.dilate(eroded, kernel, iterations=1)
+    if kernel is None:
+        kernel = _kernel_list[size] = np.ones((size, size), np.uint8)
 
-        contours, hierarchy = cv2.findContours(dilated, cv2.RETR_CCOMP, cv2.CHAIN_APPROX_SIMPLE)
+    return kernel
 
-        center_list = []
+# Bounding rects (x, y, w, h) of the contours that are at least min_area.
+def _get_contour_rects(contours, min_area):
+    return [cv2.boundingRect(contour) for contour in contours if cv2.contourArea(contour) >= min_area]
 
-        for i, contour in enumerate(contours):
-            contour_area = cv2.contourArea(contour)
+def _get_contour_centers(contours, min_area):
+    return [(x + int(w / 2), y + int(h / 2)) for x, y, w, h in _get_contour_rects(contours, min_area)]
 
-            if contour_area >= min_area:
-                center = cv2.boundingRect(contour)
-                # sqrArea = sqrt(contourArea)
+def _downscale(frame, pyramid_level):
+    scale = 1 << pyramid_level
 
-                cx = int(center[0] + center[2] / 2)
-                cy = int(center[1] + center[3] / 2)
+    return cv2.resize(frame, (frame.shape[1] // scale, frame.shape[0] // scale), interpolation=cv2.INTER_AREA)
 
-                center_list.append((cx, cy))
+# Maps the point on a pyramid level to full resolution (center of the pixel block).
+def _to_full_resolution(point, pyramid_level):
+    scale = 1 << pyramid_level
 
-        return center_list
+    return int(point[0] * scale + scale / 2), int(point[1] * scale + scale / 2)
 
-class Shape:
-    @staticmethod
-    def detect_corner(frame       : np.array,
-                      corner_count: int,
-                      min_area    : int = 250) -> list:
-        if frame is None   : return []
-        if corner_count < 3: return []
+# Joins the overlapping rects (x, y, w, h) until none of them overlaps.
+def _merge_rects(rect_list):
+    rect_list = list(rect_list)
+    is_merged = True
 
-        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+    while is_merged:
+        is_merged = False
 
-        ret, thresh = cv2.threshold(gray, 127, 255, 1)
+        for i in range(len(rect_list)):
+            for j in range(i + 1, len(rect_list)):
+                ax, ay, aw, ah = rect_list[i]
+                bx, by, bw, bh = rect_list[j]
 
-        contours, hierarchy = cv2.findContours(thresh, cv2.RETR_CCOMP, cv2.CHAIN_APPROX_SIMPLE)
+                if ax < bx + bw and bx < ax + aw and ay < by + bh and by < ay + ah:
+                    x, y = min(ax, bx), min(ay, by)
 
-        center_list = []
+                    rect_list[i] = (x, y, max(ax + aw, bx + bw) - x, max(ay + ah, by + bh) - y)
+                    rect_list.pop(j)
+                    is_merged = True
+                    break
 
-        for i, contour in enumerate(contours):
-            contour_area = cv2.contourArea(contour)
+            if is_merged: break
 
-            if contour_area >= min_area:
-                approx = cv2.approxPolyDP(contour, 0.01 * cv2.arcLength(contour, True), True)
+    return rect_list
 
-                if len(approx) == corner_count:
-                    center = cv2.boundingRect(contour)
+# Rect around the point, inside the frame.
+def _get_rect_around(point, size, frame_shape):
+    x = max(0, int(point[0] - size[0] / 2))
+    y = max(0, int(point[1] - size[1] / 2))
 
-                    cx = int(center[0] + center[2] / 2)
-                    cy = int(center[1] + center[3] / 2)
-
-                    center_list.append((cx, cy))
-
-        return center_list
+    return x, y, min(frame_shape[1], x + size[0]) - x, min(frame_shape[0], y + size[1]) - y
 
+class Color:
+    # Private Method(s)
     @staticmethod
-    def detect_circle(frame       : np.array,
-                      color_list  : List[EB_Color.HSV],
-                      min_area    : int = 50,
-                      min_radius  : int = 50,
-                      fusion_dist : int = 100,
-                      filter_range: int = 100,
-                      param1      : any = 100,
-                      param2      : any = 30) -> list:
-        if len(color_list) < 1: return []
-        if frame is None      : return []
-
-        original_frame = frame.copy()
-        contour_center_list    = []
-        circle_center_list     = []
-        fused_data_center_list = []
-
-        cv2.GaussianBlur(frame, (11, 11), 0)
-
-        hsv = cv2.cvtColor(frame, cv2.COLOR_BGR2HSV)
-        mask = cv2.inRange(hsv, color_list[0].get_low_values(), color_list[0].get_high_values())
+    def _detect_blob_rects(frame, color_list, min_area):
+        # See eb.image_processing.detector.BlobDetector to blur the frame and
+        # to reuse the buffers between frames.
+        hsv  = cv2.cvtColor(frame, cv2.COLOR_BGR2HSV)
+        mask = EB_Color.Classifier.get(color_list).get_mask(hsv)
 
-        if len(color_list) > 1:
-            for color in color_list[1:]:
-                color_mask = cv2.inRange(hsv, color.get_low_values(), color.get_high_values())
-                mask = cv2.bitwise_or(mask, color_mask)
+        kernel = _get_kernel(5)
+        cv2.erode(mask, kernel, dst=mask, iterations=1)
+        cv2.dilate(mask, kernel, dst=mask, iterations=1)
 
-        kernel  = np.ones((5, 5), np.uint8)
-        eroded  = cv2.erode(mask, kernel, iterations=1)
-        dilated = cv2.dilate(eroded, kernel, iterations=1)
-        edited_frame = dilated
+        contours, hierarchy = cv2.findContours(mask, cv2.RETR_CCOMP, cv2.CHAIN_APPROX_SIMPLE)
 
-        contours, _ = cv2.findContours(edited_frame, cv2.RETR_LIST, cv2.CHAIN_APPROX_SIMPLE)[-2:]
+        return _get_contour_rects(contours, min_area)
 
-        for cnt in contours:
-            if cv2.contourArea(cnt) < min_area: continue
+    # Public Method(s)
+    @staticmethod
+    def detect_blob(frame        : np.array,
+                    color_list   : List[EB_Color.HSV],
+                    min_area     : int  = 250,
+                    as_array     : bool = False,
+                    pyramid_level: int  = 0,
+                    refine       : bool = True) -> Union[list, np.ndarray]:
+        if frame is None      : return _to_center_output([], as_array)
+        if len(color_list) < 1: return _to_center_output([], as_array)
+
+        if pyramid_level <= 0:
+            rect_list = Color._detect_blob_rects(frame, color_list, min_area)
+
+            return _to_center_output([(x + int(w / 2), y + int(h / 2)) for x, y, w, h in rect_list], as_array)
+
+        scale     = 1 << pyramid_level
+        rect_list = Color._detect_blob_rects(_downscale(frame, pyramid_level), color_list, min_area / (scale * scale))
+
+        if not refine:
+            return _to_center_output([_to_full_resolution((x + w / 2, y + h / 2), pyramid_level)
+                                      for x, y, w, h in rect_list], as_array)
+
+        # Blob rects at full resolution, grown so the blobs are fully inside.
+        margin   = 2 * scale + 5
+        roi_list = _merge_rects([_get_rect_around(((x + w / 2) * scale, (y + h / 2) * scale),
+                                                  (w * scale + 2 * margin, h * scale + 2 * margin),
+                                                  frame.shape)
+                                 for x, y, w, h in rect_list])
 
-            x, y, w, h = cv2.boundingRect(cnt)
-            center     = (x + int(w / 2), y + int(h / 2))
+        center_list = []
 
-            contour_center_list.append(center)
+        for roi_x, roi_y, roi_w, roi_h in roi_list:
+            for x, y, w, h in Color._detect_blob_rects(frame[roi_y:roi_y+roi_h, roi_x:roi_x+roi_w], color_list, min_area):
+                center_list.append((roi_x + x + int(w / 2), roi_y + y + int(h / 2)))
 
-        if len(contour_center_list) < 1: return []
+        return _to_center_output(center_list, as_array)
 
-        contour_center_list = Util.Point.filter_neighbor_points(contour_center_list, 150)
-
-        mean_contour_list_center = (Math.TwoDimensional.mean_value_of_point_list(contour_center_list))
+class Shape:
+    # Private Method(s)
+    # (x, y, width, height) of the crop_size area around the mean of the points, inside the frame.
+    @staticmethod
+    def _get_circle_crop(center_list, frame_shape, crop_size=(300, 300)):
+        mean_center = Math.TwoDimensional.mean_value_of_point_list(center_list)
 
-        crop_width  = 300
-        crop_height = 300
-        crop_x = int(mean_contour_list_center[0]) - int(crop_width  / 2)
-        crop_y = int(mean_contour_list_center[1]) - int(crop_height / 2)
+        crop_width, crop_height = crop_size
+        crop_x = int(mean_center[0]) - int(crop_width  / 2)
+        crop_y = int(mean_center[1]) - int(crop_height / 2)
 
         if crop_x < 0: crop_x = 0
         if crop_y < 0: crop_y = 0
 
-        if crop_x + crop_width > frame.shape[1]:
-            crop_width -= crop_x + crop_width - frame.shape[1]
+        if crop_x + crop_width > frame_shape[1]:
+            crop_width -= crop_x + crop_width - frame_shape[1]
 
-        if crop_y + crop_height > frame.shape[0]:
-            crop_height -= crop_y + crop_height - frame.shape[0]
+        if crop_y + crop_height > frame_shape[0]:
+            crop_height -= crop_y + crop_height - frame_shape[0]
 
-        area_of_interest = original_frame[crop_y:crop_y+crop_height, crop_x:crop_x+crop_width]
+        return crop_x, crop_y, crop_width, crop_height
 
-        gray_frame = cv2.cvtColor(area_of_interest, cv2.COLOR_BGR2GRAY)
-        detected_circles = cv2.HoughCircles(gray_frame, cv2.HOUGH_GRADIENT, 1,
-                                            minDist=30,
-                                            param1=param1, param2=param2,
-                                            minRadius=min_radius)
+    # Circle centers (of HoughCircles) in the frame's coordinates.
+    @staticmethod
+    def _get_circle_centers(detected_circles, crop_x, crop_y):
+        if detected_circles is None: return []
 
-        if detected_circles is not None:
-            detected_circles = np.round(detected_circles[0, :]).astype("int")
+        detected_circles = np.round(detected_circles[0, :]).astype("int")
 
-            for circle in detected_circles:
-                cv2.circle(area_of_interest, (circle[0], circle[1]), 2, (0, 0, 255), 2)
-                circle_center_list.append((crop_x + circle[0],
-                                           crop_y + circle[1]))
+        return [(crop_x + circle[0], crop_y + circle[1]) for circle in detected_circles]
+
+    @staticmethod
+    def _fuse_circle_points(contour_center_list, circle_center_list, fusion_dist):
+        circle_center_list     = list(circle_center_list)
+        fused_data_center_list = []
 
         for contour_point in contour_center_list:
             to_delete_list = [] # indexes
@@ -177,4 +195,115 @@ class Shape:
                 circle_center_list.pop(index - delete_count)
                 delete_count += 1
 
+        return fused_data_center_list
+
+    @staticmethod
+    def _detect_circle(frame, color_list, min_area, min_radius, fusion_dist, filter_range, param1, param2,
+                       cluster_dist=150, min_dist=30, crop_size=(300, 300)):
+        # See eb.image_processing.detector.CircleDetector to blur the frame
+        # and to reuse the buffers between frames.
+        hsv  = cv2.cvtColor(frame, cv2.COLOR_BGR2HSV)
+        mask = EB_Color.Classifier.get(color_list).get_mask(hsv)
+
+        kernel = _get_kernel(5)
+        cv2.erode(mask, kernel, dst=mask, iterations=1)
+        cv2.dilate(mask, kernel, dst=mask, iterations=1)
+
+        contours, _ = cv2.findContours(mask, cv2.RETR_LIST, cv2.CHAIN_APPROX_SIMPLE)[-2:]
+
+        contour_center_list = _get_contour_centers(contours, min_area)
+
+        if len(contour_center_list) < 1: return []
+
+        contour_center_list = Util.Point.filter_neighbor_points(contour_center_list, cluster_dist)
+
+        crop_x, crop_y, crop_width, crop_height = Shape._get_circle_crop(contour_center_list, frame.shape, crop_size)
+
+        # Only the area of interest is converted, the frame isn't copied.
+        gray_frame = cv2.cvtColor(frame[crop_y:crop_y+crop_height, crop_x:crop_x+crop_width], cv2.COLOR_BGR2GRAY)
+        detected_circles = cv2.HoughCircles(gray_frame, cv2.HOUGH_GRADIENT, 1,
+                                            minDist=min_dist,
+                                            param1=param1, param2=param2,
+                                            minRadius=min_radius)
+
+        circle_center_list     = Shape._get_circle_centers(detected_circles, crop_x, crop_y)
+        fused_data_center_list = Shape._fuse_circle_points(contour_center_list, circle_center_list, fusion_dist)
+
         return Util.Point.filter_neighbor_points(fused_data_center_list, filter_range)
+
+    # Public Method(s)
+    @staticmethod
+    def detect_corner(frame       : np.array,
+                      corner_count: int,
+                      min_area    : int  = 250,
+                      as_array    : bool = False) -> Union[list, np.ndarray]:
+        if frame is None   : return _to_center_output([], as_array)
+        if corner_count < 3: return _to_center_output([], as_array)
+
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+
+        ret, thresh = cv2.threshold(gray, 127, 255, 1)
+
+        contours, hierarchy = cv2.findContours(thresh, cv2.RETR_CCOMP, cv2.CHAIN_APPROX_SIMPLE)
+
+        center_list = []
+
+        for i, contour in enumerate(contours):
+            contour_area = cv2.contourArea(contour)
+
+            if contour_area >= min_area:
+                approx = cv2.approxPolyDP(contour, 0.01 * cv2.arcLength(contour, True), True)
+
+                if len(approx) == corner_count:
+                    center = cv2.boundingRect(contour)
+
+                    cx = int(center[0] + center[2] / 2)
+                    cy = int(center[1] + center[3] / 2)
+
+                    center_list.append((cx, cy))
+
+        return _to_center_output(center_list, as_array)
+
+    @staticmethod
+    def detect_circle(frame        : np.array,
+                      color_list   : List[EB_Color.HSV],
+                      min_area     : int  = 50,
+                      min_radius   : int  = 50,
+                      fusion_dist  : int  = 100,
+                      filter_range : int  = 100,
+                      param1       : any  = 100,
+                      param2       : any  = 30,
+                      as_array     : bool = False,
+                      pyramid_level: int  = 0,
+                      refine       : bool = True) -> Union[list, np.ndarray]:
+        if len(color_list) < 1: return _to_center_output([], as_array)
+        if frame is None      : return _to_center_output([], as_array)
+
+        if pyramid_level <= 0:
+            return _to_center_output(Shape._detect_circle(frame, color_list, min_area, min_radius, fusion_dist,
+                                                          filter_range, param1, param2), as_array)
+
+        scale = 1 << pyramid_level
+
+        center_list = Shape._detect_circle(_downscale(frame, pyramid_level), color_list,
+                                           min_area / (scale * scale), max(1, min_radius // scale),
+                                           fusion_dist / scale, filter_range / scale, param1, param2,
+                                           cluster_dist = 150 / scale,
+                                           min_dist     = max(1, 30 // scale),
+                                           crop_size    = (300 // scale, 300 // scale))
+
+        center_list = [_to_full_resolution(center, pyramid_level) for center in center_list]
+
+        if not refine: return _to_center_output(center_list, as_array)
+
+        # Area Shape._detect_circle() searches circles in, around every center.
+        roi_list = _merge_rects([_get_rect_around(center, (300, 300), frame.shape) for center in center_list])
+
+        center_list = []
+
+        for roi_x, roi_y, roi_w, roi_h in roi_list:
+            for x, y in Shape._detect_circle(frame[roi_y:roi_y+roi_h, roi_x:roi_x+roi_w], color_list, min_area,
+                                             min_radius, fusion_dist, filter_range, param1, param2):
+                center_list.append((roi_x + x, roi_y + y))
+
+        return _to_center_output(Util.Point.filter_neighbor_points(center_list, filter_range), as_array)
@@ -0,0 +1,361 @@
+"""
+    Author: Ege Bilecen
+    Date  : 17.10.2026
+
+    Notes:
+    * Runs detectors (eb.image_processing.detection or any picklable function
+      that takes the frame as it's first argument) on worker processes, so
+      detection isn't limited to a single core by the GIL.
+    * Frames are passed to the workers through a shared memory ring
+      (eb.frame_buffer), only sequence numbers go through the task queue.
+      Camera's frame buffer can be used directly, see submit_seq().
+    * Results come out in the order they are completed, tagged with the frame's
+      sequence number. Use the seq to order them if that matters.
+    * If more than max_pending frames are being processed, drop_policy
+      decides what happens to the new frame:
+      DROP_NEWEST - The new frame is not submitted, submit() returns None.
+      DROP_OLDEST - The new frame is submitted. Workers skip the frames that
+                    are max_pending frames older than the latest one.
+      BLOCK       - submit() blocks until a frame is completed.
+
+    Example:
+        pool = DetectionPool({
+            "blob"   : (Color.detect_blob,   { "color_list" : [red], "min_area" : 250 }),
+            "square" : (Shape.detect_corner, { "corner_count" : 4 })
+        })
+        pool.start()
+        pool.submit(frame)
+
+        for result in pool.results():
+            print(result.seq, result.detections["blob"])
+"""
+from multiprocessing import get_context
+from collections     import deque
+from time            import monotonic, perf_counter
+from typing          import Union
+import threading
+import queue
+import numpy as np
+import os
+
+from eb.logger       import Logger
+from eb.frame_buffer import FrameBuffer
+
+def _worker_main(worker_id, detectors, drop_age, task_queue, result_queue):
+    Logger.LOGGING_ENABLED = False
+
+    frame_buffer_list = {} # name : FrameBuffer
+    frame_list        = {} # name : preallocated frame
+
+    while 1:
+        task = task_queue.get()
+
+        if task is None: break
+
+        buffer_name, seq, timestamp, submit_time = task
+
+        if buffer_name not in frame_buffer_list:
+            frame_buffer_list[buffer_name] = FrameBuffer.attach(buffer_name)
+
+        frame_buffer = frame_buffer_list[buffer_name]
+
+        if drop_age is not None and frame_buffer.get_latest_seq() - seq >= drop_age:
+            result_queue.put((worker_id, seq, timestamp, submit_time, None, 0, "Frame is too old."))
+            continue
+
+        if buffer_name not in frame_list:
+            frame_list[buffer_name] = np.empty(frame_buffer.get_frame_shape(), dtype=np.uint8)
+
+        start_time = perf_counter()
+
+        # Copied, so the writer can reuse the slot while detectors run.
+        item = frame_buffer.read(seq, frame_list[buffer_name])
+
+        if item is None:
+            result_queue.put((worker_id, seq, timestamp, submit_time, None, 0, "Frame is overwritten."))
+            continue
+
+        detections = {}
+        error      = None
+
+        for name, (detector, kwargs) in detectors.items():
+            try:
+                detections[name] = detector(item[1], **kwargs)
+            except Exception as ex:
+                detections[name] = None
+                error            = "{}: {}".format(name, ex)
+
+        result_queue.put((worker_id, seq, timestamp, submit_time, detections,
+                          (perf_counter() - start_time) * 1000, error))
+
+    for frame_buffer in frame_buffer_list.values():
+        frame_buffer.close()
+
+class DetectionPool:
+    class DropPolicy:
+        DROP_OLDEST = 0
+        DROP_NEWEST = 1
+        BLOCK       = 2
+
+    class Result:
+        def __init__(self, seq, timestamp, detections, worker_id, latency, process_time, error):
+            self.seq          = seq
+            self.timestamp    = timestamp    # ms, capture time of the frame
+            self.detections   = detections   # { detector name : result }
+            self.worker_id    = worker_id
+            self.latency      = latency      # ms, from submit to result
+            self.process_time = process_time # ms, spent by the worker
+            self.error        = error        # None, or the last detector error
+
+    def __init__(self,
+                 detectors    : dict,
+                 worker_count : int = None, # None means CPU count - 1
+                 max_pending  : int = None, # None means worker_count * 2
+                 drop_policy  : int = DropPolicy.DROP_OLDEST,
+                 slot_count   : int = None, # None means max_pending + 2
+                 metric_size  : int = 256) -> None:
+        if len(detectors) < 1: raise ValueError("No detector is given.")
+
+        self.LOG_INFO = "detection_pool.py - "
+
+        self._detectors    = dict(detectors) # name : (function, kwargs)
+        self._worker_count = worker_count if worker_count is not None else max(1, (os.cpu_count() or 2) - 1)
+        self._max_pending  = max_pending  if max_pending  is not None else self._worker_count * 2
+        self._drop_policy  = drop_policy
+        self._slot_count   = slot_count   if slot_count   is not None else self._max_pending + 2
+
+        if self._slot_count <= self._max_pending:
+            raise ValueError("slot_count <= max_pending")
+
+        context = get_context()
+
+        self._task_queue   = context.Queue()
+        self._result_queue = context.Queue()
+        self._process_list = []
+        self._thread       = None
+        self._status       = 0
+
+        self._frame_buffer = None # Created with the first submit(frame).
+
+        # Submitted but not completed frames.
+        self._pending           = 0
+        self._pending_condition = threading.Condition()
+
+        self._results = queue.Queue()
+
+        self._submitted_count = 0
+        self._completed_count = 0
+        self._dropped_count   = 0 # by drop_policy, before or after submitting
+        self._error_count     = 0
+
+        self._latency_list      = deque(maxlen=metric_size)
+        self._process_time_list = deque(maxlen=metric_size)
+
+    # Private Method(s)
+    @staticmethod
+    def _thread_handler(cls) -> None:
+        LOG_INFO = cls.LOG_INFO+"_thread_handler() - "
+
+        while 1:
+            item = cls._result_queue.get()
+
+            if item is None: break
+
+            try:
+                cls._handle_result(*item)
+            except Exception as ex:
+                Logger.PrintException(LOG_INFO, ex)
+
+    def _handle_result(self, worker_id, seq, timestamp, submit_time, detections, process_time, error):
+        with self._pending_condition:
+            self._pending -= 1
+            self._pending_condition.notify_all()
+
+        if detections is None:
+            self._dropped_count += 1
+            return
+
+        latency = monotonic() * 1000 - submit_time
+
+        self._completed_count += 1
+        self._latency_list.append(latency)
+        self._process_time_list.append(process_time)
+
+        if error is not None:
+            self._error_count += 1
+            Logger.PrintLog(self.LOG_INFO+"_handle_result()", "Frame {} - {}".format(seq, error))
+
+        self._results.put(DetectionPool.Result(seq, timestamp, detections, worker_id, latency, process_time, error))
+
+    @staticmethod
+    def _summarize(value_list):
+        if len(value_list) == 0:
+            return { "mean" : 0, "p95" : 0, "max" : 0 }
+
+        value_list = sorted(value_list)
+
+        return {
+            "mean" : sum(value_list) / len(value_list),
+            "p95"  : value_list[min(len(value_list) - 1, int(len(value_list) * .95))],
+            "max"  : value_list[-1]
+        }
+
+    def _submit(self, buffer_name, seq, timestamp):
+        with self._pending_condition:
+            if self._pending >= self._max_pending:
+                if self._drop_policy == DetectionPool.DropPolicy.DROP_NEWEST:
+                    self._dropped_count += 1
+                    return False
+
+                if self._drop_policy == DetectionPool.DropPolicy.BLOCK:
+                    self._pending_condition.wait_for(lambda: self._pending < self._max_pending or not self._status)
+
+            self._pending += 1
+
+        self._submitted_count += 1
+        self._task_queue.put((buffer_name, seq, timestamp, monotonic() * 1000))
+
+        return True
+
+    # Public Method(s)
+    def start(self) -> None:
+        if self._status: return
+
+        drop_age = self._max_pending if self._drop_policy == DetectionPool.DropPolicy.DROP_OLDEST else None
+        context  = get_context()
+
+        for worker_id in range(self._worker_count):
+            process = context.Process(target=_worker_main,
+                                      args=(worker_id, self._detectors, drop_age,
+                                            self._task_queue, self._result_queue))
+            process.daemon = True
+            process.start()
+
+            self._process_list.append(process)
+
+        self._status = 1
+
+        self._thread = threading.Thread(target=self._thread_handler, args=(self,))
+        self._thread.daemon = True
+        self._thread.start()
+
+        Logger.PrintLog(self.LOG_INFO+"start()", "Started {} worker(s).".format(self._worker_count))
+
+    # Waits for the submitted frames to be completed.
+    def stop(self) -> None:
+        if not self._status: return
+
+        for _ in self._process_list:
+            self._task_queue.put(None)
+
+        for process in self._process_list:
+            process.join()
+
+        self._result_queue.put(None)
+        self._thread.join()
+
+        self._status       = 0
+        self._thread       = None
+        self._process_list = []
+
+        with self._pending_condition:
+            self._pending_condition.notify_all()
+
+        if self._frame_buffer is not None:
+            self._frame_buffer.close()
+            self._frame_buffer.unlink()
+            self._frame_buffer = None
+
+    def is_running(self) -> bool:
+        return self._status == 1
+
+    """
+        Copies the frame into the pool's frame buffer and submits it. Frames
+        must have the same shape as the first one. Returns the sequence number
+        the result will have, None if the frame is dropped.
+        timestamp - ms, capture time of the frame. None means now.
+    """
+    def submit(self,
+               frame     : np.ndarray,
+               timestamp : float = None) -> Union[int, None]:
+        if not self._status: raise Exception("Detection pool is not started.")
+
+        if timestamp is None:
+            timestamp = monotonic() * 1000
+
+        if self._frame_buffer is None:
+            self._frame_buffer = FrameBuffer(self._slot_count, frame.shape)
+
+        # Slot of a pending frame mustn't be overwritten, unless it is old
+        # enough to be dropped anyway.
+        with self._pending_condition:
+            if  self._pending >= self._max_pending \
+            and self._drop_policy == DetectionPool.DropPolicy.DROP_NEWEST:
+                self._dropped_count += 1
+                return None
+
+            if self._drop_policy == DetectionPool.DropPolicy.BLOCK:
+                self._pending_condition.wait_for(lambda: self._pending < self._max_pending or not self._status)
+
+        seq = self._frame_buffer.write(frame, timestamp)
+
+        if not self._submit(self._frame_buffer.get_name(), seq, timestamp): return None
+
+        return seq
+
+    """
+        Submits a frame that is already in a frame buffer, e.g.
+        camera.get_frame_buffer(). Workers read the frame from that buffer, so
+        it's slots must not be overwritten before the frame is processed. If it
+        is, the frame is counted as dropped.
+    """
+    def submit_seq(self,
+                   frame_buffer : FrameBuffer,
+                   seq          : int,
+                   timestamp    : float = None) -> bool:
+        if not self._status: raise Exception("Detection pool is not started.")
+
+        if timestamp is None:
+            view      = frame_buffer.get_view(seq)
+            timestamp = view[0] if view is not None else monotonic() * 1000
+
+        return self._submit(frame_buffer.get_name(), seq, timestamp)
+
+    # Returns the next completed result, None on timeout (ms). None means wait forever.
+    def get_result(self, timeout : int = None) -> Union["DetectionPool.Result", None]:
+        try:
+            return self._results.get(timeout=None if timeout is None else timeout / 1000)
+        except queue.Empty:
+            return None
+
+    # Yields results until the pool stops and every result is handed out.
+    def results(self):
+        while self._status or not self._results.empty():
+            result = self.get_result(100)
+
+            if result is not None:
+                yield result
+
+    # Number of submitted frames that are not completed yet.
+    def get_pipeline_depth(self) -> int:
+        return self._pending
+
+    """
+        {
+            "submitted" : count, "completed" : count, "dropped" : count, "errors" : count,
+            "pipeline_depth" : count,
+            "latency"        : { "mean" : ms, "p95" : ms, "max" : ms },
+            "process_time"   : { "mean" : ms, "p95" : ms, "max" : ms }
+        }
+        Latency and process time are of the last metric_size results.
+    """
+    def get_statistics(self) -> dict:
+        return {
+            "submitted"      : self._submitted_count,
+            "completed"      : self._completed_count,
+            "dropped"        : self._dropped_count,
+            "errors"         : self._error_count,
+            "pipeline_depth" : self._pending,
+            "latency"        : DetectionPool._summarize(list(self._latency_list)),
+            "process_time"   : DetectionPool._summarize(list(self._process_time_list))
+        }
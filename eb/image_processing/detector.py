@@ -0,0 +1,213 @@
+"""
+    Author: Ege Bilecen
+    Date  : 17.10.2026
+
+    Notes:
+    * Reusable versions of the detectors in eb.image_processing.detection for
+      running on every frame. Buffers of every stage are allocated with the
+      first frame and reused (dst= arguments) while the frame shape stays the
+      same, morphology kernels and color classifiers are created once.
+    * Unlike the functions in detection.py, the frame is really blurred
+      before it is converted to HSV. blur_size=0 disables it.
+    * Time spent in every stage is kept for the last metric_size frames,
+      see get_timings().
+
+    Example:
+        detector = BlobDetector(ColorList.HSV.RED)
+
+        while 1:
+            point_list = detector.detect(camera.get_last_frame())
+"""
+from collections import deque
+from time        import perf_counter
+from typing      import List, Tuple, Union
+import numpy as np
+import cv2
+
+from eb.image_processing.color     import Color as EB_Color
+from eb.image_processing.util      import Util
+from eb.image_processing.detection import Shape, _get_kernel, _get_contour_centers, _to_center_output
+
+class Detector:
+    def __init__(self,
+                 blur_size   : int  = 11,
+                 kernel_size : int  = 5,
+                 as_array    : bool = False,
+                 metric_size : int  = 256) -> None:
+        if blur_size != 0 and blur_size % 2 == 0: raise ValueError("blur_size must be odd.")
+
+        self._blur_size   = blur_size
+        self._kernel      = _get_kernel(kernel_size)
+        self._as_array    = as_array
+        self._metric_size = metric_size
+
+        self._buffer_list = {} # name : ndarray
+        self._timing_list = {} # stage : deque of ms
+        self._stage_start = 0
+
+    # Private Method(s)
+    # Returns the buffer with the name, it is allocated again if shape changes.
+    def _get_buffer(self, name, shape, dtype=np.uint8):
+        buffer = self._buffer_list.get(name)
+
+        if buffer is None or buffer.shape != tuple(shape):
+            buffer = self._buffer_list[name] = np.empty(shape, dtype=dtype)
+
+        return buffer
+
+    def _start_timing(self):
+        self._stage_start = perf_counter()
+
+    # Records the time since the previous stage ended.
+    def _end_stage(self, stage):
+        now = perf_counter()
+
+        if stage not in self._timing_list:
+            self._timing_list[stage] = deque(maxlen=self._metric_size)
+
+        self._timing_list[stage].append((now - self._stage_start) * 1000)
+        self._stage_start = now
+
+    def _blur(self, frame):
+        if self._blur_size == 0: return frame
+
+        return cv2.GaussianBlur(frame, (self._blur_size, self._blur_size), 0,
+                                dst=self._get_buffer("blur", frame.shape))
+
+    def _get_color_mask(self, frame, classifier):
+        hsv  = cv2.cvtColor(frame, cv2.COLOR_BGR2HSV, dst=self._get_buffer("hsv", frame.shape))
+        self._end_stage("hsv")
+
+        mask = classifier.get_mask(hsv,
+                                   dst  = self._get_buffer("mask", frame.shape[:2]),
+                                   work = self._get_buffer("work", frame.shape[:2]))
+        self._end_stage("mask")
+
+        work = self._get_buffer("work", frame.shape[:2])
+        cv2.erode(mask,  self._kernel, dst=work, iterations=1)
+        cv2.dilate(work, self._kernel, dst=mask, iterations=1)
+        self._end_stage("morphology")
+
+        return mask
+
+    # Public Method(s)
+    def detect(self, frame : np.ndarray) -> Union[list, np.ndarray]:
+        raise NotImplementedError
+
+    # { stage : { "mean" : ms, "max" : ms, "last" : ms } }, stages are in the order they run.
+    def get_timings(self) -> dict:
+        return {
+            stage : {
+                "mean" : sum(timing_list) / len(timing_list),
+                "max"  : max(timing_list),
+                "last" : timing_list[-1]
+            } for stage, timing_list in self._timing_list.items() if len(timing_list) > 0
+        }
+
+    # Total of the mean stage times (ms).
+    def get_total_time(self) -> float:
+        return sum(timing["mean"] for timing in self.get_timings().values())
+
+    def reset_timings(self) -> None:
+        self._timing_list = {}
+
+class BlobDetector(Detector):
+    # See Color.detect_blob().
+    def __init__(self,
+                 color_list  : List[EB_Color.HSV],
+                 min_area    : int  = 250,
+                 blur_size   : int  = 11,
+                 kernel_size : int  = 5,
+                 as_array    : bool = False,
+                 metric_size : int  = 256) -> None:
+        super().__init__(blur_size, kernel_size, as_array, metric_size)
+
+        self._classifier = EB_Color.Classifier.get(color_list)
+        self._min_area   = min_area
+
+    # Public Method(s)
+    def detect(self, frame : np.ndarray) -> Union[list, np.ndarray]:
+        if frame is None: return _to_center_output([], self._as_array)
+
+        self._start_timing()
+
+        blurred = self._blur(frame)
+        self._end_stage("blur")
+
+        mask = self._get_color_mask(blurred, self._classifier)
+
+        contours, _ = cv2.findContours(mask, cv2.RETR_CCOMP, cv2.CHAIN_APPROX_SIMPLE)
+        self._end_stage("contours")
+
+        center_list = _get_contour_centers(contours, self._min_area)
+        self._end_stage("filter")
+
+        return _to_center_output(center_list, self._as_array)
+
+class CircleDetector(Detector):
+    # See Shape.detect_circle().
+    def __init__(self,
+                 color_list   : List[EB_Color.HSV],
+                 min_area     : int             = 50,
+                 min_radius   : int             = 50,
+                 fusion_dist  : int             = 100,
+                 filter_range : int             = 100,
+                 param1       : any             = 100,
+                 param2       : any             = 30,
+                 crop_size    : Tuple[int, int] = (300, 300),
+                 blur_size    : int             = 11,
+                 kernel_size  : int             = 5,
+                 as_array     : bool            = False,
+                 metric_size  : int             = 256) -> None:
+        super().__init__(blur_size, kernel_size, as_array, metric_size)
+
+        self._classifier   = EB_Color.Classifier.get(color_list)
+        self._min_area     = min_area
+        self._min_radius   = min_radius
+        self._fusion_dist  = fusion_dist
+        self._filter_range = filter_range
+        self._param1       = param1
+        self._param2       = param2
+        self._crop_size    = crop_size
+
+    # Public Method(s)
+    def detect(self, frame : np.ndarray) -> Union[list, np.ndarray]:
+        if frame is None: return _to_center_output([], self._as_array)
+
+        self._start_timing()
+
+        blurred = self._blur(frame)
+        self._end_stage("blur")
+
+        mask = self._get_color_mask(blurred, self._classifier)
+
+        contours, _ = cv2.findContours(mask, cv2.RETR_LIST, cv2.CHAIN_APPROX_SIMPLE)[-2:]
+        self._end_stage("contours")
+
+        contour_center_list = _get_contour_centers(contours, self._min_area)
+
+        if len(contour_center_list) < 1:
+            self._end_stage("filter")
+            return _to_center_output([], self._as_array)
+
+        contour_center_list = Util.Point.filter_neighbor_points(contour_center_list, 150)
+        self._end_stage("filter")
+
+        # Circles are searched on the frame that isn't blurred, like Shape.detect_circle().
+        crop_x, crop_y, crop_width, crop_height = Shape._get_circle_crop(contour_center_list, frame.shape, self._crop_size)
+
+        gray = cv2.cvtColor(frame[crop_y:crop_y+crop_height, crop_x:crop_x+crop_width], cv2.COLOR_BGR2GRAY,
+                            dst=self._get_buffer("gray", (crop_height, crop_width)))
+
+        detected_circles = cv2.HoughCircles(gray, cv2.HOUGH_GRADIENT, 1,
+                                            minDist=30,
+                                            param1=self._param1, param2=self._param2,
+                                            minRadius=self._min_radius)
+        self._end_stage("hough")
+
+        circle_center_list     = Shape._get_circle_centers(detected_circles, crop_x, crop_y)
+        fused_data_center_list = Shape._fuse_circle_points(contour_center_list, circle_center_list, self._fusion_dist)
+        center_list            = Util.Point.filter_neighbor_points(fused_data_center_list, self._filter_range)
+        self._end_stage("fusion")
+
+        return _to_center_output(center_list, self._as_array)
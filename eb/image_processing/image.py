@@ -7,10 +7,20 @@ import numpy as np
 
 class Image:
     class Encode:
+        # quality - 0-100, only used by JPEG and WebP. None means OpenCV's default.
         @staticmethod
         def FromRawImage(frame     : bytes,
-                         extension : str = ".jpg") -> bytes:
-            _, encoded_frame = cv2.imencode(extension, frame)
+                         extension : str = ".jpg",
+                         quality   : int = None) -> bytes:
+            params = []
+
+            if quality is not None:
+                if extension.lower() in (".jpg", ".jpeg"):
+                    params = [cv2.IMWRITE_JPEG_QUALITY, int(quality)]
+                elif extension.lower() == ".webp":
+                    params = [cv2.IMWRITE_WEBP_QUALITY, int(quality)]
+
+            _, encoded_frame = cv2.imencode(extension, frame, params)
             return encoded_frame.tobytes()
 
     class Decode:
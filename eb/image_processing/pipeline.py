@@ -0,0 +1,279 @@
+"""
+    Author: Ege Bilecen
+    Date  : 17.10.2026
+
+    Notes:
+    * Detection as a graph of stages. A stage is a function and the names of
+      the stages it takes as input ("frame" is the frame given to run()).
+    * A stage that is added with the same function, inputs and parameters as
+      an existing one isn't added again, add_stage() returns the name of the
+      existing one. So detectors that start the same way (blur, HSV, color
+      mask...) share those stages.
+    * run() only runs the stages that the requested outputs need, each of
+      them once per frame. Stage results are shared, stage functions must
+      not modify their inputs.
+    * Time spent in every stage is given to metrics_hook(stage, ms) and kept
+      for the last metric_size frames, see get_timings().
+
+    Example:
+        pipeline = Pipeline()
+        pipeline.add_blob_detector("red_blob",     ColorList.HSV.RED)
+        pipeline.add_circle_detector("red_circle", ColorList.HSV.RED)
+
+        result = pipeline.run(frame) # { "red_blob" : [...], "red_circle" : [...] }
+"""
+from collections import deque
+from time        import perf_counter
+from typing      import List, Tuple
+import numpy as np
+import cv2
+
+from eb.image_processing.color     import Color as EB_Color
+from eb.image_processing.util      import Util
+from eb.image_processing.detection import Shape, _get_kernel, _get_contour_centers, _to_center_output
+
+class Pipeline:
+    class Stage:
+        """
+            Stage functions. First arguments are the results of the input
+            stages, in order.
+        """
+        @staticmethod
+        def blur(frame, size=11):
+            if size == 0: return frame
+
+            return cv2.GaussianBlur(frame, (size, size), 0)
+
+        @staticmethod
+        def hsv(frame):
+            return cv2.cvtColor(frame, cv2.COLOR_BGR2HSV)
+
+        @staticmethod
+        def color_mask(hsv, color_list):
+            return EB_Color.Classifier.get(color_list).get_mask(hsv)
+
+        # Erode and dilate (opening), removes the small noise.
+        @staticmethod
+        def morphology(mask, kernel_size=5):
+            return cv2.morphologyEx(mask, cv2.MORPH_OPEN, _get_kernel(kernel_size))
+
+        @staticmethod
+        def contours(mask, mode=cv2.RETR_LIST):
+            return cv2.findContours(mask, mode, cv2.CHAIN_APPROX_SIMPLE)[-2]
+
+        @staticmethod
+        def contour_centers(contours, min_area=250):
+            return _get_contour_centers(contours, min_area)
+
+        @staticmethod
+        def cluster(point_list, distance=150):
+            return Util.Point.filter_neighbor_points(point_list, distance)
+
+        # Circle centers found in the crop_size area around the points, see Shape.detect_circle().
+        @staticmethod
+        def circles(frame, point_list, min_radius=50, param1=100, param2=30, crop_size=(300, 300)):
+            if len(point_list) < 1: return []
+
+            crop_x, crop_y, crop_width, crop_height = Shape._get_circle_crop(point_list, frame.shape, crop_size)
+
+            gray_frame = cv2.cvtColor(frame[crop_y:crop_y+crop_height, crop_x:crop_x+crop_width], cv2.COLOR_BGR2GRAY)
+            detected_circles = cv2.HoughCircles(gray_frame, cv2.HOUGH_GRADIENT, 1,
+                                                minDist=30,
+                                                param1=param1, param2=param2,
+                                                minRadius=min_radius)
+
+            return Shape._get_circle_centers(detected_circles, crop_x, crop_y)
+
+        @staticmethod
+        def fuse_circles(point_list, circle_list, fusion_dist=100, filter_range=100):
+            return Util.Point.filter_neighbor_points(Shape._fuse_circle_points(point_list, circle_list, fusion_dist), filter_range)
+
+    def __init__(self,
+                 metrics_hook : callable = None,
+                 metric_size  : int      = 256) -> None:
+        self._metrics_hook = metrics_hook # metrics_hook(stage, ms)
+        self._metric_size  = metric_size
+
+        self._stage_list  = {} # name : (function, inputs, kwargs)
+        self._key_list    = {} # key of the stage : name
+        self._output_list = {} # output name : (stage name, as_array)
+        self._timing_list = {} # stage : deque of ms
+
+    # Private Method(s)
+    # Hashable version of a stage parameter.
+    @staticmethod
+    def _freeze(value):
+        if isinstance(value, (list, tuple)):
+            return tuple(Pipeline._freeze(item) for item in value)
+
+        if isinstance(value, dict):
+            return tuple(sorted((key, Pipeline._freeze(item)) for key, item in value.items()))
+
+        if isinstance(value, EB_Color.HSV):
+            return ("HSV", tuple(value.get_low_values()), tuple(value.get_high_values()))
+
+        if isinstance(value, np.ndarray):
+            return ("ndarray", value.shape, value.tobytes())
+
+        try:
+            hash(value)
+            return value
+        except TypeError:
+            return ("id", id(value))
+
+    def _run_stage(self, name, result_list):
+        if name in result_list: return result_list[name]
+
+        function, inputs, kwargs = self._stage_list[name]
+
+        args = [self._run_stage(input_name, result_list) for input_name in inputs]
+
+        start_time = perf_counter()
+        result     = function(*args, **kwargs)
+        elapsed    = (perf_counter() - start_time) * 1000
+
+        if name not in self._timing_list:
+            self._timing_list[name] = deque(maxlen=self._metric_size)
+
+        self._timing_list[name].append(elapsed)
+
+        if self._metrics_hook is not None:
+            self._metrics_hook(name, elapsed)
+
+        result_list[name] = result
+
+        return result
+
+    # Public Method(s)
+    """
+        Adds a stage and returns it's name. If an identical stage (function,
+        inputs and kwargs) exists, nothing is added and the name of that
+        stage is returned, use the returned name as the input of other stages.
+    """
+    def add_stage(self,
+                  name     : str,
+                  function : callable,
+                  inputs   : List[str] = ("frame",),
+                  **kwargs) -> str:
+        for input_name in inputs:
+            if input_name != "frame" and input_name not in self._stage_list:
+                raise ValueError("Stage {} doesn't exist.".format(input_name))
+
+        key = (function, tuple(inputs), Pipeline._freeze(kwargs))
+
+        if key in self._key_list:
+            return self._key_list[key]
+
+        if name == "frame" or name in self._stage_list:
+            raise ValueError("Stage {} already exists.".format(name))
+
+        self._stage_list[name] = (function, tuple(inputs), kwargs)
+        self._key_list[key]    = name
+
+        return name
+
+    # Result of the stage is returned by run() as output_name.
+    def add_output(self,
+                   output_name : str,
+                   stage       : str,
+                   as_array    : bool = False) -> None:
+        if stage not in self._stage_list: raise ValueError("Stage {} doesn't exist.".format(stage))
+
+        self._output_list[output_name] = (stage, as_array)
+
+    # Blur, HSV, color mask and morphology stages, returns the name of the last one.
+    def add_color_mask(self,
+                       name        : str,
+                       color_list  : List[EB_Color.HSV],
+                       blur_size   : int = 11,
+                       kernel_size : int = 5) -> str:
+        stage = self.add_stage(name+".blur",       Pipeline.Stage.blur,       ["frame"], size=blur_size)
+        stage = self.add_stage(name+".hsv",        Pipeline.Stage.hsv,        [stage])
+        stage = self.add_stage(name+".mask",       Pipeline.Stage.color_mask, [stage], color_list=color_list)
+
+        return self.add_stage(name+".morphology",  Pipeline.Stage.morphology, [stage], kernel_size=kernel_size)
+
+    # See Color.detect_blob() and eb.image_processing.detector.BlobDetector.
+    def add_blob_detector(self,
+                          name        : str,
+                          color_list  : List[EB_Color.HSV],
+                          min_area    : int  = 250,
+                          blur_size   : int  = 11,
+                          kernel_size : int  = 5,
+                          as_array    : bool = False) -> str:
+        stage = self.add_color_mask(name, color_list, blur_size, kernel_size)
+        stage = self.add_stage(name+".contours", Pipeline.Stage.contours,        [stage], mode=cv2.RETR_CCOMP)
+        stage = self.add_stage(name+".centers",  Pipeline.Stage.contour_centers, [stage], min_area=min_area)
+
+        self.add_output(name, stage, as_array)
+
+        return stage
+
+    # See Shape.detect_circle() and eb.image_processing.detector.CircleDetector.
+    def add_circle_detector(self,
+                            name         : str,
+                            color_list   : List[EB_Color.HSV],
+                            min_area     : int             = 50,
+                            min_radius   : int             = 50,
+                            fusion_dist  : int             = 100,
+                            filter_range : int             = 100,
+                            param1       : any             = 100,
+                            param2       : any             = 30,
+                            crop_size    : Tuple[int, int] = (300, 300),
+                            blur_size    : int             = 11,
+                            kernel_size  : int             = 5,
+                            as_array     : bool            = False) -> str:
+        stage   = self.add_color_mask(name, color_list, blur_size, kernel_size)
+        stage   = self.add_stage(name+".contours", Pipeline.Stage.contours,        [stage], mode=cv2.RETR_LIST)
+        stage   = self.add_stage(name+".centers",  Pipeline.Stage.contour_centers, [stage], min_area=min_area)
+        centers = self.add_stage(name+".cluster",  Pipeline.Stage.cluster,         [stage], distance=150)
+        circles = self.add_stage(name+".circles",  Pipeline.Stage.circles,         ["frame", centers],
+                                 min_radius=min_radius, param1=param1, param2=param2, crop_size=crop_size)
+        stage   = self.add_stage(name+".fusion",   Pipeline.Stage.fuse_circles,    [centers, circles],
+                                 fusion_dist=fusion_dist, filter_range=filter_range)
+
+        self.add_output(name, stage, as_array)
+
+        return stage
+
+    """
+        Runs the stages the outputs need and returns { output name : result }.
+        outputs - None means every output.
+    """
+    def run(self,
+            frame   : np.ndarray,
+            outputs : List[str] = None) -> dict:
+        if outputs is None:
+            outputs = list(self._output_list)
+
+        result_list = { "frame" : frame }
+        output_list = {}
+
+        for output_name in outputs:
+            stage, as_array = self._output_list[output_name]
+
+            if frame is None:
+                output_list[output_name] = _to_center_output([], as_array)
+                continue
+
+            result = self._run_stage(stage, result_list)
+
+            output_list[output_name] = _to_center_output(result, as_array)
+
+        return output_list
+
+    def get_stage_names(self) -> List[str]:
+        return list(self._stage_list)
+
+    # { stage : { "mean" : ms, "max" : ms, "last" : ms } }
+    def get_timings(self) -> dict:
+        return {
+            stage : {
+                "mean" : sum(timing_list) / len(timing_list),
+                "max"  : max(timing_list),
+                "last" : timing_list[-1]
+            } for stage, timing_list in self._timing_list.items() if len(timing_list) > 0
+        }
+
+    def reset_timings(self) -> None:
+        self._timing_list = {}
@@ -0,0 +1,158 @@
+"""
+    Author: Ege Bilecen
+    Date  : 17.10.2026
+
+    Notes:
+    * Runs a detector (eb.image_processing.detection or any function that
+      takes the frame as it's first argument and returns center points) only
+      in a region of interest around the last detections, instead of the
+      full frame.
+    * Region is the bounding box of the last detections, grown by margin and
+      by how far the detections moved since the frame before, so fast targets
+      stay in it. It is never smaller than min_roi_size.
+    * Full frame is scanned when nothing is tracked, every full_scan_interval
+      frames (to find new targets), and when the targets are lost in the
+      region (on the same frame, if rescan_on_loss is True).
+
+    Example:
+        tracker = RoiTracker(Color.detect_blob, color_list=ColorList.HSV.RED)
+
+        while 1:
+            point_list = tracker.detect(camera.get_last_frame())
+"""
+from typing import Tuple, Union
+import numpy as np
+
+from eb.image_processing.detection import _to_center_output
+
+class RoiTracker:
+    def __init__(self,
+                 detector           : callable,
+                 margin             : int             = 60,
+                 motion_gain        : float           = 2,
+                 min_roi_size       : Tuple[int, int] = (160, 160),
+                 full_scan_interval : int             = 30,
+                 rescan_on_loss     : bool            = True,
+                 **detector_kwargs) -> None:
+        if full_scan_interval < 1: raise ValueError("full_scan_interval < 1")
+
+        self._detector           = detector
+        self._detector_kwargs    = detector_kwargs
+        self._margin             = margin       # px
+        self._motion_gain        = motion_gain  # region grows by gain * movement (px) of the last frame
+        self._min_roi_size       = min_roi_size # (width, height)
+        self._full_scan_interval = full_scan_interval
+        self._rescan_on_loss     = rescan_on_loss
+
+        self._last_points    = None # (N, 2) array, None if nothing is tracked
+        self._last_mean      = None
+        self._motion         = 0    # px
+        self._last_roi       = None # (x, y, width, height), None if the last scan was a full scan
+        self._frames_since_full_scan = 0
+
+        self._full_scan_count = 0
+        self._roi_scan_count  = 0
+        self._lost_count      = 0
+        self._roi_area_total  = 0 # ratio of region area to frame area, summed
+
+    # Private Method(s)
+    def _get_roi(self, frame_width, frame_height):
+        grow = self._margin + self._motion_gain * self._motion
+
+        x0, y0 = self._last_points.min(axis=0) - grow
+        x1, y1 = self._last_points.max(axis=0) + grow
+
+        # Grown around the center up to the minimum size.
+        cx, cy = (x0 + x1) / 2, (y0 + y1) / 2
+        half_w = max(x1 - x0, self._min_roi_size[0]) / 2
+        half_h = max(y1 - y0, self._min_roi_size[1]) / 2
+
+        x0 = int(max(0, cx - half_w))
+        y0 = int(max(0, cy - half_h))
+        x1 = int(min(frame_width,  cx + half_w))
+        y1 = int(min(frame_height, cy + half_h))
+
+        return x0, y0, x1 - x0, y1 - y0
+
+    def _run_detector(self, frame, offset=(0, 0)):
+        result = self._detector(frame, **self._detector_kwargs)
+
+        return np.asarray(result, dtype=np.int64).reshape(-1, 2) + offset
+
+    def _update(self, point_array):
+        if len(point_array) == 0:
+            self.reset()
+            return
+
+        mean = point_array.mean(axis=0)
+
+        self._motion      = float(np.hypot(*(mean - self._last_mean))) if self._last_mean is not None else 0
+        self._last_mean   = mean
+        self._last_points = point_array
+
+    def _full_scan(self, frame):
+        self._full_scan_count       += 1
+        self._frames_since_full_scan = 0
+        self._last_roi               = None
+
+        return self._run_detector(frame)
+
+    # Public Method(s)
+    """
+        Returns the detected points in full frame coordinates, as a list of
+        (x, y) tuples or as an (N, 2) array if as_array is True.
+    """
+    def detect(self,
+               frame    : np.ndarray,
+               as_array : bool = False) -> Union[list, np.ndarray]:
+        if frame is None: return _to_center_output([], as_array)
+
+        frame_height, frame_width = frame.shape[:2]
+
+        if self._last_points is None \
+        or self._frames_since_full_scan + 1 >= self._full_scan_interval:
+            point_array = self._full_scan(frame)
+        else:
+            self._frames_since_full_scan += 1
+
+            x, y, w, h     = self._get_roi(frame_width, frame_height)
+            self._last_roi = (x, y, w, h)
+
+            self._roi_scan_count += 1
+            self._roi_area_total += w * h / (frame_width * frame_height)
+
+            point_array = self._run_detector(frame[y:y + h, x:x + w], (x, y))
+
+            if len(point_array) == 0:
+                self._lost_count += 1
+
+                if self._rescan_on_loss:
+                    point_array = self._full_scan(frame)
+
+        self._update(point_array)
+
+        if as_array: return point_array
+
+        return [(int(px), int(py)) for px, py in point_array]
+
+    # Forgets the tracked points, next frame is scanned fully.
+    def reset(self) -> None:
+        self._last_points = None
+        self._last_mean   = None
+        self._motion      = 0
+
+    def is_tracking(self) -> bool:
+        return self._last_points is not None
+
+    # (x, y, width, height) of the region the last frame is scanned in, None if it was a full scan.
+    def get_last_roi(self) -> Union[Tuple[int, int, int, int], None]:
+        return self._last_roi
+
+    # { "full_scans" : count, "roi_scans" : count, "lost" : count, "roi_area_mean" : ratio of the frame }
+    def get_statistics(self) -> dict:
+        return {
+            "full_scans"    : self._full_scan_count,
+            "roi_scans"     : self._roi_scan_count,
+            "lost"          : self._lost_count,
+            "roi_area_mean" : self._roi_area_total / self._roi_scan_count if self._roi_scan_count > 0 else 0
+        }
@@ -0,0 +1,295 @@
+"""
+    Author: Ege Bilecen
+    Date  : 17.10.2026
+
+    Notes:
+    * Tracks the points that detectors return across frames. Every target
+      gets a track with an ID that stays the same while it is tracked.
+    * Position and velocity of a track are smoothed with a Kalman filter
+      (constant velocity model). Between detections, predict() gives where
+      the targets should be, so the detector can run at a lower rate than the
+      control loop.
+    * Detections are associated to the tracks by distance, either greedily
+      (closest pairs first) or optimally (Hungarian algorithm). Pairs that
+      are further than max_distance are never associated.
+    * A track is confirmed after min_hits detections and removed after
+      max_missed updates without a detection.
+    * Timestamps are in ms (time.monotonic() based), velocities in px/s.
+
+    Example:
+        tracker = TargetTracker()
+
+        while 1:
+            if frame_index % 3 == 0:
+                track_list = tracker.update(Shape.detect_circle(frame, ColorList.HSV.RED))
+            else:
+                track_list = tracker.predict()
+"""
+from time   import monotonic
+from typing import List, Tuple, Union
+import numpy as np
+
+from eb.image_processing.util import Util
+
+class TargetTracker:
+    class Association:
+        GREEDY    = 0
+        HUNGARIAN = 1
+
+    class Track:
+        # Observation matrix, only the position is measured.
+        _H = np.array([[1., 0., 0., 0.],
+                       [0., 1., 0., 0.]])
+
+        def __init__(self, track_id, point, timestamp, process_noise, measurement_noise):
+            self.id = track_id
+
+            self._x = np.array([point[0], point[1], 0., 0.]) # x, y, vx, vy
+            self._P = np.diag([measurement_noise, measurement_noise, 1e4, 1e4])
+            self._R = np.eye(2) * measurement_noise
+            self._q = process_noise
+
+            self._timestamp       = timestamp # ms, time the state is at
+            self._first_timestamp = timestamp
+            self._hit_count       = 1
+            self._missed_count    = 0
+
+        # Private Method(s)
+        def _predict(self, timestamp):
+            dt = (timestamp - self._timestamp) / 1000
+
+            if dt <= 0: return
+
+            F = np.array([[1., 0., dt, 0.],
+                          [0., 1., 0., dt],
+                          [0., 0., 1., 0.],
+                          [0., 0., 0., 1.]])
+
+            # White noise acceleration.
+            dt2, dt3, dt4 = dt * dt, dt * dt * dt / 2, dt * dt * dt * dt / 4
+            Q = self._q * np.array([[dt4, 0.,  dt3, 0. ],
+                                    [0.,  dt4, 0.,  dt3],
+                                    [dt3, 0.,  dt2, 0. ],
+                                    [0.,  dt3, 0.,  dt2]])
+
+            self._x = F @ self._x
+            self._P = F @ self._P @ F.T + Q
+            self._timestamp = timestamp
+
+        def _correct(self, point):
+            H = TargetTracker.Track._H
+
+            y = np.asarray(point, dtype=np.float64) - H @ self._x
+            S = H @ self._P @ H.T + self._R
+            K = self._P @ H.T @ np.linalg.inv(S)
+
+            self._x = self._x + K @ y
+            self._P = (np.eye(4) - K @ H) @ self._P
+
+            self._hit_count   += 1
+            self._missed_count = 0
+
+        # Public Method(s)
+        def get_position(self) -> Tuple[int, int]:
+            return int(round(self._x[0])), int(round(self._x[1]))
+
+        # px/s
+        def get_velocity(self) -> Tuple[float, float]:
+            return float(self._x[2]), float(self._x[3])
+
+        def get_hit_count(self) -> int:
+            return self._hit_count
+
+        # Updates since the last detection.
+        def get_missed_count(self) -> int:
+            return self._missed_count
+
+        # ms since the track is created.
+        def get_age(self) -> float:
+            return self._timestamp - self._first_timestamp
+
+    def __init__(self,
+                 max_distance      : float = 80,
+                 min_hits          : int   = 3,
+                 max_missed        : int   = 5,
+                 association       : int   = Association.HUNGARIAN,
+                 process_noise     : float = 5e4, # px^2/s^4, how fast targets can change velocity
+                 measurement_noise : float = 25) -> None: # px^2, detector's position error
+        self._max_distance      = max_distance
+        self._min_hits          = min_hits
+        self._max_missed        = max_missed
+        self._association       = association
+        self._process_noise     = process_noise
+        self._measurement_noise = measurement_noise
+
+        self._track_list    = []
+        self._next_track_id = 1
+
+    # Private Method(s)
+    # Returns [(row, col)] of the assignment with the lowest total cost.
+    @staticmethod
+    def _hungarian(cost):
+        is_transposed = cost.shape[0] > cost.shape[1]
+
+        if is_transposed: cost = cost.T
+
+        n, m = cost.shape
+        u    = np.zeros(n + 1)
+        v    = np.zeros(m + 1)
+        p    = np.zeros(m + 1, dtype=int) # row assigned to the column, 1 based
+        way  = np.zeros(m + 1, dtype=int)
+
+        for i in range(1, n + 1):
+            p[0]    = i
+            j0      = 0
+            min_v   = np.full(m + 1, np.inf)
+            used    = np.zeros(m + 1, dtype=bool)
+
+            while 1:
+                used[j0] = True
+                i0       = p[j0]
+                free     = ~used[1:]
+
+                cur = cost[i0 - 1] - u[i0] - v[1:]
+                better = free & (cur < min_v[1:])
+                min_v[1:][better] = cur[better]
+                way[1:][better]   = j0
+
+                candidate = np.where(free, min_v[1:], np.inf)
+                j1        = int(np.argmin(candidate)) + 1
+                delta     = candidate[j1 - 1]
+
+                u[p[used]] += delta
+                v[used]    -= delta
+                min_v[1:][free] -= delta
+
+                j0 = j1
+
+                if p[j0] == 0: break
+
+            while 1:
+                j1    = way[j0]
+                p[j0] = p[j1]
+                j0    = j1
+
+                if j0 == 0: break
+
+        pair_list = [(p[j] - 1, j - 1) for j in range(1, m + 1) if p[j] != 0]
+
+        if is_transposed:
+            pair_list = [(col, row) for row, col in pair_list]
+
+        return pair_list
+
+    @staticmethod
+    def _greedy(cost):
+        pair_list = []
+        used_rows = set()
+        used_cols = set()
+
+        for index in np.argsort(cost, axis=None):
+            row, col = divmod(int(index), cost.shape[1])
+
+            if row in used_rows or col in used_cols: continue
+
+            pair_list.append((row, col))
+            used_rows.add(row)
+            used_cols.add(col)
+
+        return pair_list
+
+    def _associate(self, point_array):
+        if len(self._track_list) == 0 or len(point_array) == 0: return []
+
+        predicted = np.array([track._x[:2] for track in self._track_list])
+        diff      = predicted[:, None, :] - point_array[None, :, :]
+        cost      = np.sqrt((diff * diff).sum(axis=2))
+
+        # Gated pairs are too expensive to be preferred over leaving them unassigned.
+        gated = np.where(cost > self._max_distance, self._max_distance * 1e3, cost)
+
+        if self._association == TargetTracker.Association.HUNGARIAN:
+            pair_list = TargetTracker._hungarian(gated)
+        else:
+            pair_list = TargetTracker._greedy(gated)
+
+        return [(row, col) for row, col in pair_list if cost[row, col] <= self._max_distance]
+
+    def _get_confirmed_tracks(self):
+        return [track for track in self._track_list if track._hit_count >= self._min_hits]
+
+    # Public Method(s)
+    """
+        Associates the detected points to the tracks and returns the
+        confirmed tracks.
+        timestamp - ms, capture time of the frame. None means now.
+    """
+    def update(self,
+               point_list : Union[List[Tuple[int, int]], np.ndarray],
+               timestamp  : float = None) -> List["TargetTracker.Track"]:
+        if timestamp is None:
+            timestamp = monotonic() * 1000
+
+        point_array = np.asarray(point_list, dtype=np.float64).reshape(-1, 2)
+
+        for track in self._track_list:
+            track._predict(timestamp)
+
+        pair_list = self._associate(point_array)
+
+        matched_tracks = set()
+        matched_points = set()
+
+        for row, col in pair_list:
+            self._track_list[row]._correct(point_array[col])
+            matched_tracks.add(row)
+            matched_points.add(col)
+
+        for row, track in enumerate(self._track_list):
+            if row not in matched_tracks:
+                track._missed_count += 1
+
+        self._track_list = [track for track in self._track_list if track._missed_count <= self._max_missed]
+
+        for col, point in enumerate(point_array):
+            if col in matched_points: continue
+
+            self._track_list.append(TargetTracker.Track(self._next_track_id, point, timestamp,
+                                                        self._process_noise, self._measurement_noise))
+            self._next_track_id += 1
+
+        return self._get_confirmed_tracks()
+
+    # Moves the tracks to the timestamp (ms, None means now) without a detection and returns the confirmed ones.
+    def predict(self, timestamp : float = None) -> List["TargetTracker.Track"]:
+        if timestamp is None:
+            timestamp = monotonic() * 1000
+
+        for track in self._track_list:
+            track._predict(timestamp)
+
+        return self._get_confirmed_tracks()
+
+    def get_tracks(self, confirmed_only : bool = True) -> List["TargetTracker.Track"]:
+        if confirmed_only: return self._get_confirmed_tracks()
+
+        return list(self._track_list)
+
+    def get_track(self, track_id : int) -> Union["TargetTracker.Track", None]:
+        for track in self._track_list:
+            if track.id == track_id: return track
+
+        return None
+
+    # Confirmed track that is the closest to Util.CAMERA_CENTER_POINT, None if there isn't any.
+    def get_closest_track_to_center(self) -> Union["TargetTracker.Track", None]:
+        track_list = self._get_confirmed_tracks()
+
+        if len(track_list) == 0: return None
+
+        index = Util.Point.get_index_of_closest_point_to_center([track._x[:2] for track in track_list])
+
+        return track_list[index]
+
+    def reset(self) -> None:
+        self._track_list = []
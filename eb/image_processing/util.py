@@ -2,26 +2,77 @@
     Author: Ege Bilecen
     Date  : 05.09.2020
 """
-from typing import List, Tuple
+from typing import List, Tuple, Union
+import numpy as np
 
 from eb.math    import Math
 from eb.compass import Compass
 
+from eb.image_processing.camera_model import CameraModel
+
 class Util:
+    # Defaults, see set_camera_model().
     CAMERA_RESOLUTION   = (640, 480)
     CAMERA_CENTER_POINT = (int(CAMERA_RESOLUTION[0] / 2), int(CAMERA_RESOLUTION[1] / 2))
+    CAMERA_MODEL        = None
+
+    """
+        Sets the camera the points are on. CAMERA_RESOLUTION and
+        CAMERA_CENTER_POINT (principal point of the camera) are updated, so
+        distances and bearings are calculated from the camera's optical
+        center.
+    """
+    @staticmethod
+    def set_camera_model(camera_model : CameraModel) -> None:
+        Util.CAMERA_MODEL        = camera_model
+        Util.CAMERA_RESOLUTION   = camera_model.get_resolution()
+        Util.CAMERA_CENTER_POINT = camera_model.get_center_point()
+
+    # None if set_camera_model() is not called.
+    @staticmethod
+    def get_camera_model() -> Union[CameraModel, None]:
+        return Util.CAMERA_MODEL
 
     class Point:
+        # Point count from which filter_neighbor_points() computes the distances
+        # with numpy. Below it, numpy's overhead is larger than the loop's cost.
+        VECTORIZE_MIN_POINT_COUNT = 64
+
+        """
+            Merges every point with it's neighbors (points within distance of
+            it) into their mean, repeatedly until no point has a neighbor.
+
+            Points are processed in the list order like the original loop
+            did, but from VECTORIZE_MIN_POINT_COUNT points, distances from a
+            point to the remaining points are computed with numpy in one go.
+            Results are the same either way.
+        """
         @staticmethod
         def filter_neighbor_points(points  : List[Tuple[int, int]],
                                    distance: int) -> List[Tuple[int, int]]:
-            point_list      = points.copy()
+            point_list = list(points)
+
+            while len(point_list) >= 2:
+                if len(point_list) >= Util.Point.VECTORIZE_MIN_POINT_COUNT:
+                    filtered_points, non_neighbors = Util.Point._filter_neighbor_points_array(point_list, distance)
+                else:
+                    filtered_points, non_neighbors = Util.Point._filter_neighbor_points_list(point_list, distance)
+
+                if len(filtered_points) == non_neighbors:
+                    return filtered_points
+
+                point_list = filtered_points
+
+            return point_list
+
+        # A single pass of filter_neighbor_points(). Returns the filtered points
+        # and the count of points without neighbors.
+        @staticmethod
+        def _filter_neighbor_points_list(point_list, distance):
+            point_list      = point_list.copy()
             filtered_points = []
             non_neighbors   = 0
 
-            if len(point_list) < 2:
-                return point_list
-
             for index_i, i in enumerate(point_list):
                 to_delete_list  = [] # indexes
                 delete_count    = 0
@@ -56,10 +107,115 @@ class Util:
                     point_list.pop(index - delete_count)
                     delete_count += 1
 
-            if len(filtered_points) == non_neighbors:
-                return filtered_points
+            return filtered_points, non_neighbors
+
+        # Same as _filter_neighbor_points_list(). Remaining points are kept as
+        # indexes into point_list, in list order.
+        @staticmethod
+        def _filter_neighbor_points_array(point_list, distance):
+            point_array = np.asarray(point_list, dtype=np.float64).reshape(-1, 2)
+
+            order = np.arange(len(point_list))
+            x     = point_array[:, 0]
+            y     = point_array[:, 1]
+
+            filtered_points = []
+            non_neighbors   = 0
+            position        = 0
+
+            while position < len(order):
+                i  = point_list[order[position]]
+                dx = x[order] - x[order[position]]
+                dy = y[order] - y[order[position]]
+
+                # Same operations as Math.TwoDimensional.distance_between_two_points(),
+                # so points exactly at distance are handled the same. Points equal
+                # to i (i itself too) aren't it's neighbors.
+                neighbor_list = np.flatnonzero((np.sqrt(dx * dx + dy * dy) <= distance) & ((dx != 0) | (dy != 0)))
+
+                position += 1
+
+                if len(neighbor_list) == 0:
+                    non_neighbors += 1
+                    filtered_points.append(i)
+                    continue
+
+                # Summed in list order like the loop, for the same rounding.
+                neighbor_points = [point_list[index] for index in order[neighbor_list]]
+                mean_x = sum(point[0] for point in neighbor_points) / len(neighbor_points)
+                mean_y = sum(point[1] for point in neighbor_points) / len(neighbor_points)
+
+                filtered_points.append((int(mean_x), int(mean_y)))
+
+                # Removing the neighbors before i shifts the next point, like
+                # popping them from the list while it is iterated did.
+                order = np.delete(order, neighbor_list)
 
-            return Util.Point.filter_neighbor_points(filtered_points, distance)
+            return filtered_points, non_neighbors
+
+        """
+            Merges the points that are within distance of each other, directly
+            or through other points, and returns the mean of every group.
+            Groups are ordered by their first point in the list.
+
+            Unlike filter_neighbor_points(), it is done in a single pass: points
+            are sorted by x, so only the pairs whose x difference is within
+            distance are compared (O(n log n) for spread out points).
+
+            Results are not the same as filter_neighbor_points(). Groups are
+            chained (single linkage), so points far from each other are merged
+            if there are points between them, e.g. x = 0, 100, ..., 600 with
+            distance 150 is a single group, where filter_neighbor_points()
+            gives 3 points. Detectors use filter_neighbor_points(), use this
+            one for hundreds of points where chaining is wanted.
+        """
+        @staticmethod
+        def cluster_points(points  : Union[List[Tuple[int, int]], np.ndarray],
+                           distance: float) -> List[Tuple[int, int]]:
+            point_array = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+            point_count = len(point_array)
+
+            if point_count < 2:
+                return [(int(x), int(y)) for x, y in point_array]
+
+            # Candidate pairs (i, j), j after i in x order and within distance on x.
+            order      = np.argsort(point_array[:, 0], kind="stable")
+            sorted_x   = point_array[order, 0]
+            end_list   = np.searchsorted(sorted_x, sorted_x + distance, side="right")
+            count_list = end_list - np.arange(point_count) - 1
+
+            i_list = np.repeat(np.arange(point_count), count_list)
+            j_list = i_list + 1 + np.arange(len(i_list)) - np.repeat(np.cumsum(count_list) - count_list, count_list)
+
+            i_list = order[i_list]
+            j_list = order[j_list]
+
+            diff   = point_array[i_list] - point_array[j_list]
+            mask   = (diff * diff).sum(axis=1) <= distance * distance
+            i_list = i_list[mask]
+            j_list = j_list[mask]
+
+            # Every point gets the lowest index of it's group.
+            label_list = np.arange(point_count)
+
+            while 1:
+                new_label_list = label_list.copy()
+                np.minimum.at(new_label_list, i_list, label_list[j_list])
+                np.minimum.at(new_label_list, j_list, label_list[i_list])
+                new_label_list = new_label_list[new_label_list]
+
+                if np.array_equal(new_label_list, label_list): break
+
+                label_list = new_label_list
+
+            _, group_list = np.unique(label_list, return_inverse=True)
+
+            sum_list = np.zeros((group_list.max() + 1, 2))
+            np.add.at(sum_list, group_list, point_array)
+
+            center_list = sum_list / np.bincount(group_list)[:, None]
+
+            return [(int(x), int(y)) for x, y in center_list]
 
         @staticmethod
         def extract_information(point: Tuple[int, int]) -> Tuple[float, int]:
@@ -92,3 +248,39 @@ class Util:
                     dist = dist_to_center
 
             return ret_point
+
+        # Array version of extract_information_from_list(). Returns an (N, 4)
+        # array of x, y, distance and bearing.
+        @staticmethod
+        def extract_information_from_array(point_array: Union[List[Tuple[int, int]], np.ndarray]) -> np.ndarray:
+            point_array = np.asarray(point_array, dtype=np.float64).reshape(-1, 2)
+
+            dist    = Math.TwoDimensional.distance_between_point_and_array(Util.CAMERA_CENTER_POINT, point_array)
+            bearing = Compass.atan2_mapped_deg_to_compass_deg(
+                              Math.TwoDimensional.angle_between_point_and_array(Util.CAMERA_CENTER_POINT, point_array))
+
+            return np.column_stack((point_array, dist, bearing))
+
+        # Array version of get_closest_point_to_center(). Returns the index of
+        # the point, None if the array is empty.
+        @staticmethod
+        def get_index_of_closest_point_to_center(point_array: Union[List[Tuple[int, int]], np.ndarray]) -> Union[int, None]:
+            if len(point_array) == 0: return None
+
+            return int(np.argmin(Math.TwoDimensional.distance_between_point_and_array(Util.CAMERA_CENTER_POINT, point_array)))
+
+        """
+            Returns an (N, 2) array of north and east offsets (m) from the
+            vehicle of the points, see CameraModel.project_to_ground(). Camera
+            model must be set with set_camera_model().
+        """
+        @staticmethod
+        def project_array_to_ground(point_array   : Union[List[Tuple[int, int]], np.ndarray],
+                                    altitude      : float,
+                                    roll          : float = 0,
+                                    pitch         : float = 0,
+                                    yaw           : float = 0,
+                                    is_undistorted: bool  = False) -> np.ndarray:
+            if Util.CAMERA_MODEL is None: raise ValueError("Camera model is not set.")
+
+            return Util.CAMERA_MODEL.project_to_ground(point_array, altitude, roll, pitch, yaw, is_undistorted)
@@ -4,6 +4,11 @@
 """
 from math import sqrt, atan2, degrees
 
+try:
+    import numpy as np
+except ImportError: # Only the point array methods need numpy.
+    np = None
+
 class Math:
     class Value:
         @staticmethod
@@ -39,3 +44,28 @@ class Math:
             mean_val[1] /= len(point_list)
 
             return mean_val[0], mean_val[1]
+
+        # Point array methods take an (N, 2) array (or list of points) and
+        # return an array of N values, see eb.image_processing.util.
+        @staticmethod
+        def distance_between_point_and_array(pt, point_array):
+            diff = np.asarray(point_array, dtype=np.float64).reshape(-1, 2) - pt
+
+            return np.sqrt((diff * diff).sum(axis=1))
+
+        @staticmethod
+        def angle_between_point_and_array(pt, point_array, map_to_360=True):
+            diff = np.asarray(point_array, dtype=np.float64).reshape(-1, 2) - pt
+            deg  = np.degrees(np.arctan2(diff[:, 1], diff[:, 0]))
+
+            if map_to_360:
+                # Same as Math.Value.map(deg, -180, 180, 0, 360)
+                return deg + 180
+
+            return deg
+
+        @staticmethod
+        def mean_value_of_point_array(point_array):
+            mean_val = np.asarray(point_array, dtype=np.float64).reshape(-1, 2).mean(axis=0)
+
+            return float(mean_val[0]), float(mean_val[1])
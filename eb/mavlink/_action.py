@@ -6,9 +6,9 @@ from math import floor
 import threading
 
 from eb.logger import Logger
-from eb.method import Method
 from eb.math   import Math
 from eb.time   import Time
+from eb.mavlink._command import Command
 import eb.mavlink.helper as eb_mavutil
 
 class Action:
@@ -16,259 +16,165 @@ class Action:
         self.LOG_INFO = "_action.py"
         self._vehicle = vehicle
 
+    # Private Method(s)
+    """
+        Sends the command through vehicle's command engine, see _command.py.
+
+        If blocking is True, waits for the ACK and returns True if the command
+        is accepted. Otherwise returns Command.Pending right after sending,
+        so several commands can be in flight at the same time.
+
+        Commands are resent on any rejection (DENIED, FAILED, ...) until
+        retries run out, like actions did before the command engine.
+    """
+    def _send_command(self, func_name, command_str, params, retries, timeout, target_component=None, blocking=True,
+                      retry_on=Command.RetryOn.ANY_REJECTION):
+        pending = self._vehicle.command().send(eb_mavutil.Enum.get_int_reference(command_str),
+                                               params,
+                                               target_component = target_component,
+                                               retries          = retries,
+                                               timeout          = timeout,
+                                               retry_on         = retry_on)
+
+        if not blocking: return pending
+
+        res = pending.wait()
+        Logger.PrintLog(self.LOG_INFO, "{}() - Result: {}."
+                        .format(func_name, str(res)))
+
+        return res == 0
+
+    # Return value of a command that can't be sent, False or a Command.Pending
+    # that has already failed, so blocking=False always returns Command.Pending.
+    def _get_not_sent(self, command_str, blocking):
+        if blocking: return False
+
+        return self._vehicle.command().get_not_sent(eb_mavutil.Enum.get_int_reference(command_str))
+
     # Public Method(s)
     def set_flight_mode(self, flight_mode, retries=4, timeout=1500):
         Logger.PrintLog(self.LOG_INFO, "set_flight_mode() - Setting flight mode to {}."
                         .format(flight_mode.upper()))
 
         flight_mode = flight_mode.upper()
-        flight_mode_list = eb_mavutil.get_flight_modes(self._vehicle.mavlink())
+        flight_mode_list = self._vehicle._get_flight_modes()
 
         if flight_mode not in flight_mode_list:
             Logger.PrintLog(self.LOG_INFO, "set_flight_mode() - Flight mode {} not in flight mode list."
                             .format(flight_mode))
             return False
 
-        def impl():
-            COMMAND = eb_mavutil.Enum.get_int_reference("MAV_CMD_DO_SET_MODE")
-
-            self._vehicle.mav().command_long_send(
-                self._vehicle._get_target_system(),
-                0,
-                COMMAND,
-                0,
-                # params
-                eb_mavutil.Enum.get_int_reference("MAV_MODE_FLAG_CUSTOM_MODE_ENABLED"),
-                flight_mode_list[flight_mode],
-                0, 0, 0, 0, 0
-            )
-
-            res = self._vehicle.wait_cmd_ack(COMMAND, timeout)
-
-            if res == 0:
-                Logger.PrintLog(self.LOG_INFO, "set_flight_mode() - Flight mode successfully set to {}."
-                                .format(flight_mode))
-                return True
-            else:
-                Logger.PrintLog(self.LOG_INFO, "set_flight_mode() - An error occured while setting flight mode to {}. Result: {}."
-                                .format(flight_mode, str(res)))
-                return False
+        res = self._vehicle.command().send(eb_mavutil.Enum.get_int_reference("MAV_CMD_DO_SET_MODE"),
+                                           (eb_mavutil.Enum.get_int_reference("MAV_MODE_FLAG_CUSTOM_MODE_ENABLED"),
+                                            flight_mode_list[flight_mode],
+                                            0, 0, 0, 0, 0),
+                                           target_component = 0,
+                                           retries          = retries,
+                                           timeout          = timeout,
+                                           retry_on         = Command.RetryOn.ANY_REJECTION).wait()
+
+        if res == 0:
+            Logger.PrintLog(self.LOG_INFO, "set_flight_mode() - Flight mode successfully set to {}."
+                            .format(flight_mode))
+            return True
 
-        return Method.Repeat.until_value(impl, (), retries, ret_val=True)[0]
+        Logger.PrintLog(self.LOG_INFO, "set_flight_mode() - An error occured while setting flight mode to {}. Result: {}."
+                        .format(flight_mode, str(res)))
+        return False
 
     def arm(self, retries=4, timeout=1500):
         Logger.PrintLog(self.LOG_INFO, "arm() - Arming.")
 
-        def impl():
-            COMMAND = eb_mavutil.Enum.get_int_reference("MAV_CMD_COMPONENT_ARM_DISARM")
-
-            self._vehicle.mav().command_long_send(
-                self._vehicle._get_target_system(),
-                self._vehicle._get_target_component(),
-                COMMAND,
-                0,
-                1, 0, 0, 0, 0, 0, 0
-            )
-
-            res = self._vehicle.wait_cmd_ack(COMMAND, timeout)
-
-            Logger.PrintLog(self.LOG_INFO, "arm() - Result: {}."
-                            .format(str(res)))
-
-            if res == 0: return True
-            else:        return False
-
         if self._vehicle._first_arm:
-            first_arm_res = Method.Repeat.until_value(impl, (), retries, ret_val=True)[0]
+            first_arm_res = self._send_command("arm", "MAV_CMD_COMPONENT_ARM_DISARM",
+                                               (1, 0, 0, 0, 0, 0, 0),
+                                               retries, timeout)
 
             if not first_arm_res: return first_arm_res
             else:
                 self._vehicle._first_arm = False
                 self.arm(retries + 2, timeout)
 
-        return Method.Repeat.until_value(impl, (), retries, ret_val=True)[0]
+        return self._send_command("arm", "MAV_CMD_COMPONENT_ARM_DISARM",
+                                  (1, 0, 0, 0, 0, 0, 0),
+                                  retries, timeout)
 
     def disarm(self, retries=4, timeout=1500):
         Logger.PrintLog(self.LOG_INFO, "disarm() - Disarming.")
 
-        def impl():
-            COMMAND = eb_mavutil.Enum.get_int_reference("MAV_CMD_COMPONENT_ARM_DISARM")
-
-            self._vehicle.mav().command_long_send(
-                self._vehicle._get_target_system(),
-                self._vehicle._get_target_component(),
-                COMMAND,
-                0,
-                0, 0, 0, 0, 0, 0, 0
-            )
-
-            res = self._vehicle.wait_cmd_ack(COMMAND, timeout)
-            Logger.PrintLog(self.LOG_INFO, "disarm() - Result: {}."
-                            .format(str(res)))
-
-            if res == 0:
-                return True
-            else:
-                return False
-
-        return Method.Repeat.until_value(impl, (), retries, ret_val=True)[0]
+        return self._send_command("disarm", "MAV_CMD_COMPONENT_ARM_DISARM",
+                                  (0, 0, 0, 0, 0, 0, 0),
+                                  retries, timeout)
 
     # GUIDED mode only.
     # spd - m/s
-    def set_air_speed(self, spd, retries=4, timeout=1500):
+    def set_air_speed(self, spd, retries=4, timeout=1500, blocking=True):
         Logger.PrintLog(self.LOG_INFO, "set_air_speed() - Setting air speed to {} m/s."
                         .format(str(spd)))
 
         if self._vehicle.telemetry().get_flight_mode() != "GUIDED":
             Logger.PrintLog(self.LOG_INFO, "set_air_speed() - Cannot set air speed. Vehicle is not in GUIDED mode.")
-            return False
+            return self._get_not_sent("MAV_CMD_DO_CHANGE_SPEED", blocking)
 
-        def impl():
-            COMMAND = eb_mavutil.Enum.get_int_reference("MAV_CMD_DO_CHANGE_SPEED")
-
-            self._vehicle.mav().command_long_send(
-                self._vehicle._get_target_system(),
-                self._vehicle._get_target_component(),
-                COMMAND,
-                0,
-                # params
-                0, spd, -1, 0, 0, 0, 0
-            )
-
-            res = self._vehicle.wait_cmd_ack(COMMAND, timeout)
-            Logger.PrintLog(self.LOG_INFO, "set_air_speed() - Result: {}."
-                            .format(str(res)))
-
-            if res == 0:
-                return True
-            else:
-                return False
-
-        return Method.Repeat.until_value(impl, (), retries, ret_val=True)[0]
+        return self._send_command("set_air_speed", "MAV_CMD_DO_CHANGE_SPEED",
+                                  (0, spd, -1, 0, 0, 0, 0),
+                                  retries, timeout, blocking=blocking)
 
     # GUIDED mode only.
     # spd - m/s
-    def set_ground_speed(self, spd, retries=4, timeout=1500):
+    def set_ground_speed(self, spd, retries=4, timeout=1500, blocking=True):
         Logger.PrintLog(self.LOG_INFO, "set_ground_speed() - Setting ground speed to {} m/s."
                         .format(str(spd)))
 
         if self._vehicle.telemetry().get_flight_mode() != "GUIDED":
             Logger.PrintLog(self.LOG_INFO, "set_ground_speed() - Cannot set ground speed. Vehicle is not in GUIDED mode.")
-            return False
+            return self._get_not_sent("MAV_CMD_DO_CHANGE_SPEED", blocking)
 
-        def impl():
-            COMMAND = eb_mavutil.Enum.get_int_reference("MAV_CMD_DO_CHANGE_SPEED")
-
-            self._vehicle.mav().command_long_send(
-                self._vehicle._get_target_system(),
-                self._vehicle._get_target_component(),
-                COMMAND,
-                0,
-                # params
-                1, spd, -1, 0, 0, 0, 0
-            )
-
-            res = self._vehicle.wait_cmd_ack(COMMAND, timeout)
-            Logger.PrintLog(self.LOG_INFO, "set_ground_speed() - Result: {}."
-                            .format(str(res)))
-
-            if res == 0: return True
-            else:        return False
-
-        return Method.Repeat.until_value(impl, (), retries, ret_val=True)[0]
+        return self._send_command("set_ground_speed", "MAV_CMD_DO_CHANGE_SPEED",
+                                  (1, spd, -1, 0, 0, 0, 0),
+                                  retries, timeout, blocking=blocking)
 
     # GUIDED mode only.
     # spd - m/s
-    def set_climb_speed(self, spd, retries=4, timeout=1500):
+    def set_climb_speed(self, spd, retries=4, timeout=1500, blocking=True):
         Logger.PrintLog(self.LOG_INFO, "set_climb_speed() - Setting climb speed to {} m/s."
                         .format(str(spd)))
 
         if self._vehicle.telemetry().get_flight_mode() != "GUIDED":
             Logger.PrintLog(self.LOG_INFO, "set_climb_speed() - Cannot set climb speed. Vehicle is not in GUIDED mode.")
-            return False
-
-        def impl():
-            COMMAND = eb_mavutil.Enum.get_int_reference("MAV_CMD_DO_CHANGE_SPEED")
+            return self._get_not_sent("MAV_CMD_DO_CHANGE_SPEED", blocking)
 
-            self._vehicle.mav().command_long_send(
-                self._vehicle._get_target_system(),
-                self._vehicle._get_target_component(),
-                COMMAND,
-                0,
-                # params
-                2, spd, -1, 0, 0, 0, 0
-            )
-
-            res = self._vehicle.wait_cmd_ack(COMMAND, timeout)
-            Logger.PrintLog(self.LOG_INFO, "set_climb_speed() - Result: {}."
-                            .format(str(res)))
-
-            if res == 0: return True
-            else:        return False
-
-        return Method.Repeat.until_value(impl, (), retries, ret_val=True)[0]
+        return self._send_command("set_climb_speed", "MAV_CMD_DO_CHANGE_SPEED",
+                                  (2, spd, -1, 0, 0, 0, 0),
+                                  retries, timeout, blocking=blocking)
 
     # GUIDED mode only.
     # spd - m/s
-    def set_descent_speed(self, spd, retries=4, timeout=1500):
+    def set_descent_speed(self, spd, retries=4, timeout=1500, blocking=True):
         Logger.PrintLog(self.LOG_INFO, "set_descent_speed() - Setting descent speed to {} m/s."
                         .format(str(spd)))
 
         if self._vehicle.telemetry().get_flight_mode() != "GUIDED":
             Logger.PrintLog(self.LOG_INFO, "set_descent_speed() - Cannot set descent speed. Vehicle is not in GUIDED mode.")
-            return False
+            return self._get_not_sent("MAV_CMD_DO_CHANGE_SPEED", blocking)
 
-        def impl():
-            COMMAND = eb_mavutil.Enum.get_int_reference("MAV_CMD_DO_CHANGE_SPEED")
-
-            self._vehicle.mav().command_long_send(
-                self._vehicle._get_target_system(),
-                self._vehicle._get_target_component(),
-                COMMAND,
-                0,
-                # params
-                3, spd, -1, 0, 0, 0, 0
-            )
-
-            res = self._vehicle.wait_cmd_ack(COMMAND, timeout)
-            Logger.PrintLog(self.LOG_INFO, "set_descent_speed() - Result: {}."
-                            .format(str(res)))
-
-            if res == 0: return True
-            else:        return False
-
-        return Method.Repeat.until_value(impl, (), retries, ret_val=True)[0]
+        return self._send_command("set_descent_speed", "MAV_CMD_DO_CHANGE_SPEED",
+                                  (3, spd, -1, 0, 0, 0, 0),
+                                  retries, timeout, blocking=blocking)
 
     # GUIDED mode only.
     # deg - degree | spd - m/s
-    def set_yaw(self, deg, retries=4, timeout=1500):
+    def set_yaw(self, deg, retries=4, timeout=1500, blocking=True):
         Logger.PrintLog(self.LOG_INFO, "set_yaw() - Setting yaw degree to {}°."
                         .format(str(deg)))
 
         if self._vehicle.telemetry().get_flight_mode() != "GUIDED":
             Logger.PrintLog(self.LOG_INFO, "set_yaw() - Cannot set yaw degree. Vehicle is not in GUIDED mode.")
-            return False
-
-        def impl():
-            COMMAND = eb_mavutil.Enum.get_int_reference("MAV_CMD_CONDITION_YAW")
-
-            self._vehicle.mav().command_long_send(
-                self._vehicle._get_target_system(),
-                self._vehicle._get_target_component(),
-                COMMAND,
-                0,
-                # params
-                deg, 0, 0, 0, 0, 0, 0
-            )
-
-            res = self._vehicle.wait_cmd_ack(COMMAND, timeout)
-            Logger.PrintLog(self.LOG_INFO, "set_yaw() - Result: {}."
-                            .format(str(res)))
-
-            if res == 0: return True
-            else:        return False
+            return self._get_not_sent("MAV_CMD_CONDITION_YAW", blocking)
 
-        return Method.Repeat.until_value(impl, (), retries, ret_val=True)[0]
+        return self._send_command("set_yaw", "MAV_CMD_CONDITION_YAW",
+                                  (deg, 0, 0, 0, 0, 0, 0),
+                                  retries, timeout, blocking=blocking)
 
     # GUIDED mode only.
     # vel_x - m/s | vel_y - m/s | vel_z - m/s
@@ -485,100 +391,43 @@ class Action:
         _.start()
 
     # GUIDED mode only.
-    def takeoff(self, rel_alt, retries=12, timeout=500):
+    def takeoff(self, rel_alt, retries=12, timeout=500, blocking=True):
         Logger.PrintLog(self.LOG_INFO, "takeoff() - Attempting to taking off to altitude: {} m."
                         .format(str(rel_alt)))
 
         if self._vehicle.telemetry().get_flight_mode() != "GUIDED":
             Logger.PrintLog(self.LOG_INFO, "takeoff() - Cannot takeoff. Vehicle is not in GUIDED mode.")
-            return False
-
-        def impl():
-            COMMAND = eb_mavutil.Enum.get_int_reference("MAV_CMD_NAV_TAKEOFF")
-
-            self._vehicle.mav().command_long_send(
-                self._vehicle._get_target_system(),
-                self._vehicle._get_target_component(),
-                COMMAND,
-                0,
-                # params
-                0, 0, 0, 0,
-                0, 0, rel_alt
-            )
-
-            res = self._vehicle.wait_cmd_ack(COMMAND, timeout)
-            Logger.PrintLog(self.LOG_INFO, "takeoff() - Result: {}."
-                            .format(str(res)))
+            return self._get_not_sent("MAV_CMD_NAV_TAKEOFF", blocking)
 
-            if res == 0:
-                return True
-            else:
-                return False
-
-        return Method.Repeat.until_value(impl, (), retries, ret_val=True)[0]
+        return self._send_command("takeoff", "MAV_CMD_NAV_TAKEOFF",
+                                  (0, 0, 0, 0,
+                                   0, 0, rel_alt),
+                                  retries, timeout, blocking=blocking)
 
     # GUIDED mode only.
-    def land(self, retries=12, timeout=500):
+    def land(self, retries=12, timeout=500, blocking=True):
         Logger.PrintLog(self.LOG_INFO, "land() - Attempting to land.")
 
         if self._vehicle.telemetry().get_flight_mode() != "GUIDED":
             Logger.PrintLog(self.LOG_INFO, "land() - Cannot land. Vehicle is not in GUIDED mode.")
-            return False
-
-        def impl():
-            COMMAND = eb_mavutil.Enum.get_int_reference("MAV_CMD_NAV_LAND")
+            return self._get_not_sent("MAV_CMD_NAV_LAND", blocking)
 
-            self._vehicle.mav().command_long_send(
-                self._vehicle._get_target_system(),
-                self._vehicle._get_target_component(),
-                COMMAND,
-                0,
-                # params
-                0, 0, 0, 0,
-                0, 0, 0
-            )
-
-            res = self._vehicle.wait_cmd_ack(COMMAND, timeout)
-            Logger.PrintLog(self.LOG_INFO, "land() - Result: {}."
-                            .format(str(res)))
-
-            if res == 0:
-                return True
-            else:
-                return False
-
-        return Method.Repeat.until_value(impl, (), retries, ret_val=True)[0]
+        return self._send_command("land", "MAV_CMD_NAV_LAND",
+                                  (0, 0, 0, 0,
+                                   0, 0, 0),
+                                  retries, timeout, blocking=blocking)
 
     # GUIDED mode only.
-    def set_home_position(self, retries=12, timeout=500):
+    def set_home_position(self, retries=12, timeout=500, blocking=True):
         Logger.PrintLog(self.LOG_INFO, "set_home_position() - Attempting to set home position.")
 
         if self._vehicle.telemetry().get_flight_mode() != "GUIDED":
             Logger.PrintLog(self.LOG_INFO, "set_home_position() - Cannot set home position. Vehicle is not in GUIDED mode.")
-            return False
-
-        def impl():
-            COMMAND = eb_mavutil.Enum.get_int_reference("MAV_CMD_DO_SET_HOME")
-
-            self._vehicle.mav().command_long_send(
-                self._vehicle._get_target_system(),
-                self._vehicle._get_target_component(),
-                COMMAND,
-                0,
-                # params
-                1, 0, 0, 0, 0, 0, 0
-            )
-
-            res = self._vehicle.wait_cmd_ack(COMMAND, timeout)
-            Logger.PrintLog(self.LOG_INFO, "set_home_position() - Result: {}."
-                            .format(str(res)))
+            return self._get_not_sent("MAV_CMD_DO_SET_HOME", blocking)
 
-            if res == 0:
-                return True
-            else:
-                return False
-
-        return Method.Repeat.until_value(impl, (), retries, ret_val=True)[0]
+        return self._send_command("set_home_position", "MAV_CMD_DO_SET_HOME",
+                                  (1, 0, 0, 0, 0, 0, 0),
+                                  retries, timeout, blocking=blocking)
 
     """
         Main Out 1 - Servo Channel: 1
@@ -596,62 +445,24 @@ class Action:
         Aux  Out 5 - Servo Channel: 13
         Aux  Out 6 - Servo Channel: 14
     """
-    def set_servo_pwm(self, channel, pwm, retries=12, timeout=500):
+    def set_servo_pwm(self, channel, pwm, retries=12, timeout=500, blocking=True):
         Logger.PrintLog(self.LOG_INFO, "set_servo_pwm() - Setting servo's pwm at channel {} to {}."
                         .format(str(channel), str(pwm)))
 
-        def impl():
-            COMMAND = eb_mavutil.Enum.get_int_reference("MAV_CMD_DO_SET_SERVO")
-
-            self._vehicle.mav().command_long_send(
-                self._vehicle._get_target_system(),
-                self._vehicle._get_target_component(),
-                COMMAND,
-                0,
-                # params
-                channel, pwm, 0, 0, 0, 0, 0
-            )
-
-            res = self._vehicle.wait_cmd_ack(COMMAND, timeout)
-            Logger.PrintLog(self.LOG_INFO, "set_servo_pwm() - Result: {}."
-                            .format(str(res)))
+        return self._send_command("set_servo_pwm", "MAV_CMD_DO_SET_SERVO",
+                                  (channel, pwm, 0, 0, 0, 0, 0),
+                                  retries, timeout, blocking=blocking)
 
-            if res == 0:
-                return True
-            else:
-                return False
-
-        return Method.Repeat.until_value(impl, (), retries, ret_val=True)[0]
-
-    def set_relay(self, channel, status, retries=12, timeout=500):
+    def set_relay(self, channel, status, retries=12, timeout=500, blocking=True):
         Logger.PrintLog(self.LOG_INFO, "set_relay() - Setting relay's status at channel {} to {}."
                         .format(str(channel), str(status)))
 
         if  status != 0 \
         and status != 1: raise ValueError("Status must be either 0 or 1.")
 
-        def impl():
-            COMMAND = eb_mavutil.Enum.get_int_reference("MAV_CMD_DO_SET_RELAY")
-
-            self._vehicle.mav().command_long_send(
-                self._vehicle._get_target_system(),
-                self._vehicle._get_target_component(),
-                COMMAND,
-                0,
-                # params
-                channel, status, 0, 0, 0, 0, 0
-            )
-
-            res = self._vehicle.wait_cmd_ack(COMMAND, timeout)
-            Logger.PrintLog(self.LOG_INFO, "set_relay() - Result: {}."
-                            .format(str(res)))
-
-            if res == 0:
-                return True
-            else:
-                return False
-
-        return Method.Repeat.until_value(impl, (), retries, ret_val=True)[0]
+        return self._send_command("set_relay", "MAV_CMD_DO_SET_RELAY",
+                                  (channel, status, 0, 0, 0, 0, 0),
+                                  retries, timeout, blocking=blocking)
 
     def rc_channel_override(self, channel, val_or_percentage, use_val=True, min_ppm_us=1000, max_ppm_us=2000):
         CHANNEL_COUNT = 8
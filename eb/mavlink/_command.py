@@ -0,0 +1,253 @@
+"""
+    Author: Ege Bilecen
+    Date  : 17.10.2026
+
+    Notes:
+    * All method parameters related to time are based on milliseconds.
+    * Commands are sent without waiting for the previous one's ACK. In-flight
+      commands are tracked by (command, target system, target component).
+    * ACKs carry neither the confirmation counter nor the parameters, so they
+      can't tell apart commands with the same key. Only one command per key is
+      in flight, the others are queued and sent after it completes. Commands
+      with different keys are in flight at the same time.
+    * A command is retransmitted with an increased confirmation counter if it
+      isn't acknowledged in time or it is temporarily rejected. With
+      retry_on=Command.RetryOn.ANY_REJECTION, it is retransmitted on any
+      rejection (DENIED, FAILED...), like commands were retried before. Action
+      methods (_action.py) use it.
+    * MAV_RESULT_IN_PROGRESS extends the deadline of the command instead of
+      completing it.
+"""
+import threading
+
+from eb.logger import Logger
+from eb.time   import Time
+import eb.mavlink.helper as eb_mavutil
+
+class Command:
+    def __init__(self, vehicle):
+        self.LOG_INFO = "_command.py"
+        self._vehicle = vehicle
+
+        self._condition = threading.Condition()
+        self._in_flight = {} # (command, target system, target component) - list of Pending
+        self._thread    = None
+
+    class RetryOn:
+        TEMPORARILY_REJECTED = 0
+        ANY_REJECTION        = 1
+
+    class Pending:
+        def __init__(self, command, params, target_system, target_component, retries, timeout,
+                     retry_on=0): # Command.RetryOn
+            self.command          = command
+            self.params           = params
+            self.target_system    = target_system
+            self.target_component = target_component
+            self.retries          = retries
+            self.timeout          = timeout
+            self.retry_on         = retry_on
+            self.confirmation     = -1 # of the last transmission
+            self.deadline         = 0  # ms, 0 means send now
+            self.result           = None
+            self.progress         = None
+            self.is_sent          = True
+
+            self._event = threading.Event()
+
+        def get_key(self):
+            return self.command, self.target_system, self.target_component
+
+        def is_done(self):
+            return self._event.is_set()
+
+        # Whether the result asks for a retransmission.
+        def is_retried_on(self, result):
+            if result == eb_mavutil.Enum.get_int_reference("MAV_RESULT_TEMPORARILY_REJECTED"):
+                return True
+
+            return self.retry_on == Command.RetryOn.ANY_REJECTION \
+            and    result != eb_mavutil.Enum.get_int_reference("MAV_RESULT_ACCEPTED")
+
+        """
+            Blocks until the command is completed. Returns MAV_RESULT of the
+            command or None if it couldn't be acknowledged after all retries
+            or it wasn't sent (is_sent is False).
+            timeout - 0 means wait until the command is completed.
+        """
+        def wait(self, timeout=0):
+            if timeout < 0: raise ValueError("Timeout < 0.")
+
+            if timeout == 0: self._event.wait()
+            elif not self._event.wait(timeout / 1000):
+                raise TimeoutError("wait() for command {} has timed out."
+                                   .format(str(self.command)))
+
+            return self.result
+
+    # Private Method(s)
+    @staticmethod
+    def _thread_handler(cls):
+        while 1:
+            to_send = []
+
+            with cls._condition:
+                while len(cls._in_flight) == 0:
+                    cls._condition.wait()
+
+                current_timestamp = Time.get_current_timestamp("ms")
+                next_deadline     = None
+
+                # Only the first command of every key is in flight.
+                for pending_list in list(cls._in_flight.values()):
+                    while len(pending_list) > 0:
+                        pending = pending_list[0]
+
+                        if pending.deadline <= current_timestamp:
+                            if pending.confirmation + 1 < pending.retries:
+                                pending.confirmation += 1
+                                pending.deadline = current_timestamp + pending.timeout
+                                to_send.append(pending)
+                            else:
+                                Logger.PrintLog(cls.LOG_INFO, "_thread_handler() - Command {} couldn't be acknowledged after {} attempt(s)."
+                                                .format(str(pending.command), str(pending.retries)))
+                                cls._complete(pending, None)
+                                continue
+
+                        if next_deadline is None \
+                        or pending.deadline < next_deadline:
+                            next_deadline = pending.deadline
+
+                        break
+
+                if len(to_send) == 0 \
+                and next_deadline is not None:
+                    cls._condition.wait((next_deadline - current_timestamp) / 1000)
+
+            for pending in to_send:
+                cls._transmit(pending)
+
+    # self._condition must be held by the caller. Next command of the key is
+    # sent by the engine thread.
+    def _complete(self, pending, result):
+        pending_list = self._in_flight[pending.get_key()]
+        pending_list.remove(pending)
+
+        if len(pending_list) == 0:
+            del self._in_flight[pending.get_key()]
+        else:
+            pending_list[0].deadline = 0
+
+        pending.result = result
+        pending._event.set()
+
+    def _transmit(self, pending):
+        self._vehicle.mav().command_long_send(
+            pending.target_system,
+            pending.target_component,
+            pending.command,
+            min(pending.confirmation, 255),
+            *pending.params
+        )
+
+    # Called by the vehicle for every COMMAND_ACK. Returns True if the ACK
+    # belongs to an in-flight command.
+    def _handle_ack(self, msg_packet):
+        key_list = ((msg_packet.command, msg_packet.get_srcSystem(), msg_packet.get_srcComponent()),
+                    (msg_packet.command, msg_packet.get_srcSystem(), 0))
+
+        with self._condition:
+            for key in key_list:
+                pending_list = self._in_flight.get(key)
+
+                if pending_list is None: continue
+
+                pending = pending_list[0]
+
+                # Not sent yet, the ACK is a late one of a completed command.
+                if pending.confirmation < 0: return True
+
+                if msg_packet.result == eb_mavutil.Enum.get_int_reference("MAV_RESULT_IN_PROGRESS"):
+                    pending.progress = getattr(msg_packet, "progress", None)
+                    pending.deadline = Time.get_current_timestamp("ms") + pending.timeout
+                elif pending.is_retried_on(msg_packet.result) \
+                and  pending.confirmation + 1 < pending.retries:
+                    # Let the engine thread retransmit it.
+                    pending.deadline = 0
+                else:
+                    self._complete(pending, msg_packet.result)
+
+                self._condition.notify_all()
+                return True
+
+        return False
+
+    # Public Method(s)
+    """
+        Sends COMMAND_LONG without waiting for it's ACK. Returns Command.Pending.
+
+        params - 7 parameters of the command.
+        target_component - None means vehicle's target component.
+        retries - total number of transmissions.
+        timeout - time to wait for the ACK of each transmission.
+        retry_on - Command.RetryOn, rejections that are retransmitted.
+    """
+    def send(self, command, params, target_component=None, retries=4, timeout=1500,
+             retry_on=RetryOn.TEMPORARILY_REJECTED):
+        if retries < 1:     raise ValueError("retries < 1")
+        if timeout <= 0:    raise ValueError("Timeout is <= 0.")
+        if len(params) != 7: raise ValueError("COMMAND_LONG has 7 parameters.")
+
+        if target_component is None:
+            target_component = self._vehicle._get_target_component()
+
+        pending = Command.Pending(command, params,
+                                  self._vehicle._get_target_system(), target_component,
+                                  retries, timeout, retry_on)
+
+        with self._condition:
+            if self._thread is None:
+                self._thread = threading.Thread(target=Command._thread_handler, args=(self,))
+                self._thread.daemon = True
+                self._thread.start()
+
+            pending_list = self._in_flight.setdefault(pending.get_key(), [])
+            pending_list.append(pending)
+
+            # Queued behind the in-flight command of the same key otherwise.
+            is_first = len(pending_list) == 1
+
+            if is_first:
+                pending.confirmation = 0
+                pending.deadline     = Time.get_current_timestamp("ms") + timeout
+
+            self._condition.notify_all()
+
+        if is_first:
+            self._transmit(pending)
+
+        return pending
+
+    # Returns a completed Command.Pending of a command that is refused before
+    # sending it (e.g. vehicle isn't in the required mode). It's result is None.
+    def get_not_sent(self, command, params=(0, 0, 0, 0, 0, 0, 0), target_component=None):
+        if target_component is None:
+            target_component = self._vehicle._get_target_component()
+
+        pending = Command.Pending(command, params,
+                                  self._vehicle._get_target_system(), target_component,
+                                  0, 0)
+        pending.is_sent = False
+        pending._event.set()
+
+        return pending
+
+    # Returns MAV_RESULT (or None) of every given Command.Pending.
+    @staticmethod
+    def wait_all(pending_list):
+        return [pending.wait() for pending in pending_list]
+
+    # In-flight and queued commands.
+    def get_in_flight_count(self):
+        with self._condition:
+            return sum(len(pending_list) for pending_list in self._in_flight.values())
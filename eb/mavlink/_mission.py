@@ -267,7 +267,6 @@ class Mission:
             Logger.PrintLog(LOG_INFO, "Mission at index {} is paused."
                             .format(str(cls.get_current_mission_index())))
             cls._mission_list[cls.get_current_mission_index()].set("status",      0)
-            cls._mission_list[cls.get_current_mission_index()].set("is_uploaded", 0)
 
         if cls.get_status() != 2:
             cls._status = 0
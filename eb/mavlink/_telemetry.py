@@ -9,81 +9,124 @@ class Telemetry:
                  vehicle):
         self._vehicle = vehicle
 
+    # Private Method(s)
+    # Returns the record or an empty dict if the stream is not received yet.
+    @staticmethod
+    def _record_or_empty(record):
+        if record is None: return {}
+
+        return record
+
     # Public Method(s)
     def get_boot_time(self):
         return self._vehicle._boot_time[0], Time.get_current_timestamp("ms") - self._vehicle._boot_time[1]
 
     def get_last_heartbeat(self, ret_diff=False):
+        heartbeat = self._vehicle._snapshot.heartbeat
+        last_heartbeat = heartbeat.timestamp if heartbeat is not None else 0
+
         if ret_diff:
-            return Time.get_current_timestamp("ms") - self._vehicle._last_heartbeat
+            return Time.get_current_timestamp("ms") - last_heartbeat
 
-        return self._vehicle._last_heartbeat
+        return last_heartbeat
 
     def get_state(self):
-        return self._vehicle._state
+        heartbeat = self._vehicle._snapshot.heartbeat
+
+        if heartbeat is None: return "UNKNOWN"
+
+        return heartbeat.state
 
     def get_vehicle_type(self):
-        return self._vehicle._vehicle_type
+        heartbeat = self._vehicle._snapshot.heartbeat
+
+        if heartbeat is None: return "UNKNOWN"
+
+        return heartbeat.vehicle_type
 
     def get_flight_mode(self):
-        return self._vehicle._flight_mode
+        heartbeat = self._vehicle._snapshot.heartbeat
+
+        if heartbeat is None: return "UNKNOWN"
+
+        return heartbeat.flight_mode
 
     def get_is_armed(self):
-        return self._vehicle._armed
+        heartbeat = self._vehicle._snapshot.heartbeat
 
-    def get_raw_gps(self):
-        try: self._vehicle._gps["last_update"] = Time.get_current_timestamp("ms") - self._vehicle._gps["timestamp"]
-        except KeyError: pass
+        if heartbeat is None: return False
 
-        return self._vehicle._gps
+        return heartbeat.armed
 
-    def get_attitude(self):
-        try: self._vehicle._attitude["last_update"] = Time.get_current_timestamp("ms") - self._vehicle._attitude["timestamp"]
-        except KeyError: pass
+    # All the getters below return records from eb.mavlink.record, or an empty
+    # dict if the related message is not received yet. Records also support
+    # dict style access, e.g. get_global_position()["lat"]. Use to_dict() to get
+    # a plain dict.
+    def get_raw_gps(self):
+        return self._record_or_empty(self._vehicle._snapshot.gps)
 
-        return self._vehicle._attitude
+    def get_attitude(self):
+        return self._record_or_empty(self._vehicle._snapshot.attitude)
 
     def get_local_position(self):
-        try: self._vehicle._local_position["last_update"] = Time.get_current_timestamp("ms") - self._vehicle._local_position["timestamp"]
-        except KeyError: pass
-
-        return self._vehicle._local_position
+        return self._record_or_empty(self._vehicle._snapshot.local_position)
 
     def get_global_position(self):
-        try: self._vehicle._global_position["last_update"] = Time.get_current_timestamp("ms") - self._vehicle._global_position["timestamp"]
-        except KeyError: pass
-
-        return self._vehicle._global_position
+        return self._record_or_empty(self._vehicle._snapshot.global_position)
 
+    # Getters below return (value, milliseconds since the last update).
     def get_air_speed(self):
-        return self._vehicle._air_speed[0], Time.get_current_timestamp("ms") - self._vehicle._air_speed[1]
+        vfr_hud = self._vehicle._snapshot.vfr_hud
+        return vfr_hud.air_speed, Time.get_current_timestamp("ms") - vfr_hud.timestamp
 
     def get_ground_speed(self):
-        return self._vehicle._ground_speed[0], Time.get_current_timestamp("ms") - self._vehicle._ground_speed[1]
+        vfr_hud = self._vehicle._snapshot.vfr_hud
+        return vfr_hud.ground_speed, Time.get_current_timestamp("ms") - vfr_hud.timestamp
 
     def get_altitude(self):
-        return self._vehicle._alt[0], Time.get_current_timestamp("ms") - self._vehicle._alt[1]
+        vfr_hud = self._vehicle._snapshot.vfr_hud
+        return vfr_hud.alt, Time.get_current_timestamp("ms") - vfr_hud.timestamp
 
     def get_throttle(self):
-        return self._vehicle._throttle[0], Time.get_current_timestamp("ms") - self._vehicle._throttle[1]
+        vfr_hud = self._vehicle._snapshot.vfr_hud
+        return vfr_hud.throttle, Time.get_current_timestamp("ms") - vfr_hud.timestamp
 
     def get_climb_rate(self):
-        return self._vehicle._climb_rate[0], Time.get_current_timestamp("ms") - self._vehicle._climb_rate[1]
+        vfr_hud = self._vehicle._snapshot.vfr_hud
+        return vfr_hud.climb_rate, Time.get_current_timestamp("ms") - vfr_hud.timestamp
 
     def get_heading(self):
-        return self._vehicle._heading[0], Time.get_current_timestamp("ms") - self._vehicle._heading[1]
+        vfr_hud = self._vehicle._snapshot.vfr_hud
+        return vfr_hud.heading, Time.get_current_timestamp("ms") - vfr_hud.timestamp
 
     # TODO
     def get_is_armable(self):
         raise NotImplementedError
 
     def get_battery(self):
-        self._vehicle._battery["last_update"] = Time.get_current_timestamp("ms") - self._vehicle._battery["timestamp"]
-
-        return self._vehicle._battery
+        return self._record_or_empty(self._vehicle._snapshot.battery)
 
     def get_raw_rc_channel_values(self):
-        try: self._vehicle._raw_rc_channels["last_update"] = Time.get_current_timestamp("ms") - self._vehicle._raw_rc_channels["timestamp"]
-        except KeyError: pass
+        return self._record_or_empty(self._vehicle._snapshot.rc_channels)
+
+    # Returns the latest record.Snapshot. It is immutable, so it can be read
+    # from any thread without locking.
+    def get_snapshot(self):
+        return self._vehicle._snapshot
+
+    """
+        Returns records of the given streams from the same snapshot, so they
+        are coherent with each other. Stream names are listed in
+        record.Snapshot.STREAMS. Not yet received streams are returned as None.
+
+        Example:
+            pos, attitude, speed = telemetry.get_consistent("global_position", "attitude", "vfr_hud")
+    """
+    def get_consistent(self, *streams):
+        snapshot = self._vehicle._snapshot
+
+        for stream in streams:
+            if stream not in snapshot.STREAMS:
+                raise ValueError("Unknown telemetry stream {}.".format(stream))
 
-        return self._vehicle._raw_rc_channels
+        return tuple(getattr(snapshot, stream) for stream in streams)
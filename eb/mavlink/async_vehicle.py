@@ -0,0 +1,451 @@
+"""
+    Author: Ege Bilecen
+    Date  : 17.10.2026
+
+    Notes:
+    * All method parameters related to time are based on milliseconds.
+    * asyncio variant of Vehicle. Messages are read by the event loop that
+      connect() is awaited from, no thread is created. All coroutines must be
+      awaited from that same event loop.
+    * Telemetry is parsed exactly like Vehicle does, so telemetry() returns the
+      same Telemetry class.
+    * COMMAND_ACK doesn't tell which request of a command it is for, so like
+      the command engine of Vehicle (_command.py), only one request per
+      (command, target system, target component) is in flight. Concurrent
+      calls with the same key wait for each other, different keys run
+      concurrently.
+"""
+from pymavlink import mavutil
+import asyncio
+
+from eb.logger import Logger
+
+from eb.mavlink.vehicle    import Vehicle
+from eb.mavlink._telemetry import Telemetry
+import eb.mavlink.helper as eb_mavutil
+
+class AsyncVehicle(Vehicle):
+    def __init__(self,
+                 port_name        : str  = "/dev/ttyTHS1",
+                 baudrate         : int  = 115200,
+                 rate             : int  = 2,  # hz
+                 message_rates    : dict = None,
+                 source_system    : int  = 255,
+                 source_component : int  = 0,
+                 retries          : int  = 3,
+                 autoreconnect    : bool = False,
+                 output_dir       : str  = "./") -> None:
+        self._mavlink = mavutil.mavlink_connection(port_name,
+                                                   baud             = baudrate,
+                                                   source_system    = source_system,
+                                                   source_component = source_component,
+                                                   retries          = retries,
+                                                   autoreconnect    = autoreconnect)
+        self._init_variables(rate, output_dir, message_rates)
+        self.LOG_INFO = "async_vehicle.py"
+
+        self._loop        = None
+        self._reader_fd   = None
+        self._tasks       = []
+        self._waiters     = {} # key - list of futures, see _wait_message()
+        self._subscribers = {} # stream - list of queues, see stream()
+        self._command_locks = {} # (command, target system, target component) - asyncio.Lock, see _command_long()
+        self._ready_event = None # asyncio.Event, created by connect()
+
+        # Classes
+        self._telemetry = Telemetry(self)
+
+    # Private Method(s)
+    # Called by the event loop whenever the connection is readable.
+    def _read_messages(self):
+        try:
+            while 1:
+                msg_packet = self.mavlink().recv_match(blocking=False)
+
+                if msg_packet is None: break
+
+                if self._recorder is not None:
+                    self._recorder.record(msg_packet)
+
+                self._handle_message(msg_packet)
+        except Exception as ex:
+            self._stop_reading()
+            self._set_exception(ex)
+
+    # Used when the connection doesn't expose a file descriptor.
+    async def _poll_handler(self, interval=1):
+        while self._exception is None:
+            self._read_messages()
+            await asyncio.sleep(interval / 1000)
+
+    def _stop_reading(self):
+        if self._reader_fd is not None:
+            self._loop.remove_reader(self._reader_fd)
+            self._reader_fd = None
+
+    def _update_snapshot(self, stream, build_record):
+        super()._update_snapshot(stream, build_record)
+
+        record = getattr(self._snapshot, stream)
+
+        # Subscribers only care about the latest record. Drop the old one if
+        # subscriber hasn't consumed it yet.
+        for queue in self._subscribers.get(stream, []):
+            if queue.full(): queue.get_nowait()
+            queue.put_nowait(record)
+
+    def _store_message(self, packet_type, msg_packet, timestamp):
+        if packet_type == "COMMAND_ACK":
+            key = ("COMMAND_ACK", msg_packet.command)
+        else:
+            key = packet_type
+
+        # Hand the message to the oldest waiter. Store it only if nobody waits.
+        waiters = self._waiters.get(key, [])
+
+        while len(waiters) > 0:
+            future = waiters.pop(0)
+
+            if not future.done():
+                future.set_result((msg_packet, timestamp))
+                return
+
+        if packet_type == "COMMAND_ACK":
+            self._messages["COMMAND_ACK"][msg_packet.command] = (msg_packet, timestamp)
+        else:
+            self._messages[packet_type] = (msg_packet, timestamp)
+
+    def _set_ready(self):
+        super()._set_ready()
+        self._ready_event.set()
+
+    def _set_exception(self, ex):
+        self._exception = ex
+        self._ready.set()
+
+        if self._ready_event is not None:
+            self._ready_event.set()
+
+        for waiters in self._waiters.values():
+            for future in waiters:
+                if not future.done(): future.set_exception(ex)
+
+        self._waiters = {}
+
+    async def _wait_message(self, key, container, item, timeout, timeout_text):
+        if self._exception is not None:
+            raise self._exception
+
+        if item in container:
+            return container.pop(item)
+
+        future = self._loop.create_future()
+        self._waiters.setdefault(key, []).append(future)
+
+        try:
+            return await asyncio.wait_for(future, timeout / 1000)
+        except asyncio.TimeoutError:
+            raise TimeoutError(timeout_text)
+        finally:
+            waiters = self._waiters.get(key, [])
+
+            if future in waiters: waiters.remove(future)
+
+    async def _command_long(self, func_name, command, params, retries, timeout, target_component=None):
+        if target_component is None:
+            target_component = self._get_target_component()
+
+        key  = (command, self._get_target_system(), target_component)
+        lock = self._command_locks.setdefault(key, asyncio.Lock())
+
+        async with lock:
+            # Nothing else of this key is in flight, so a stored ACK is a late
+            # one of a previous request.
+            self._messages["COMMAND_ACK"].pop(command, None)
+
+            for confirmation in range(retries):
+                self.mav().command_long_send(
+                    self._get_target_system(),
+                    target_component,
+                    command,
+                    confirmation,
+                    *params
+                )
+
+                try:
+                    res = await self.wait_cmd_ack(command, timeout)
+                except TimeoutError:
+                    continue
+
+                Logger.PrintLog(self.LOG_INFO, "{}() - Result: {}."
+                                .format(func_name, str(res)))
+
+                if res == 0: return True
+
+        return False
+
+    def _is_guided(self, func_name, action_text):
+        if self.telemetry().get_flight_mode() != "GUIDED":
+            Logger.PrintLog(self.LOG_INFO, "{}() - Cannot {}. Vehicle is not in GUIDED mode."
+                            .format(func_name, action_text))
+            return False
+
+        return True
+
+    # Every request is started at once, like Vehicle._set_message_intervals().
+    # Requests share a key, so _command_long() sends them one after another.
+    # Returns the messages whose interval couldn't be set.
+    async def _set_message_intervals(self):
+        Logger.PrintLog(self.LOG_INFO, "_set_message_intervals() - Setting message intervals.")
+
+        msg_str_list = list(self._message_request_list)
+        res_list     = await asyncio.gather(*[self.set_message_interval(self._message_request_list[msg_str]["ref_int"],
+                                                                        self._get_message_interval(msg_str) / (10 ** 3))
+                                              for msg_str in msg_str_list])
+
+        failed_list = [msg_str for msg_str, res in zip(msg_str_list, res_list) if not res]
+
+        if len(failed_list) > 0:
+            Logger.PrintLog(self.LOG_INFO, "_set_message_intervals() - Setting message interval failed for {}."
+                            .format(", ".join(failed_list)))
+
+        return failed_list
+
+    # Public Method(s)
+    async def connect(self, timeout=5000):
+        Logger.PrintLog(self.LOG_INFO, "connect() - Connecting to vehicle.")
+
+        self._loop        = asyncio.get_running_loop()
+        self._ready_event = asyncio.Event()
+        fd = getattr(self.mavlink(), "fd", None)
+
+        if fd is not None:
+            self._reader_fd = fd
+            self._loop.add_reader(fd, self._read_messages)
+        else:
+            self._tasks.append(self._loop.create_task(self._poll_handler()))
+
+        try:
+            await self.wait_msg("HEARTBEAT", timeout)
+        except TimeoutError:
+            raise TimeoutError("Couldn't detect heartbeat in {} milliseconds."
+                               .format(str(timeout)))
+
+        Logger.PrintLog(self.LOG_INFO, "connect() - Successfully connected to vehicle.")
+
+        self._tasks.append(self._loop.create_task(self._set_message_intervals()))
+
+    # Pending waits (wait_msg(), wait_cmd_ack()...) raise ConnectionError.
+    def close(self):
+        self._stop_reading()
+
+        for task in self._tasks:
+            task.cancel()
+
+        self._tasks = []
+        self.mavlink().close()
+
+        if self._exception is None:
+            self._set_exception(ConnectionError("Connection is closed."))
+
+    # Action, Mission and Control are thread based. Use the coroutines of
+    # this class instead.
+    def action(self):
+        raise NotImplementedError("AsyncVehicle has no action(). Use its coroutines instead.")
+
+    def mission(self):
+        raise NotImplementedError("AsyncVehicle has no mission().")
+
+    def control(self):
+        raise NotImplementedError("AsyncVehicle has no control().")
+
+    """
+        Yields the records of a telemetry stream as they are received. Stream
+        names are listed in record.Snapshot.STREAMS. If the consumer is slower
+        than the stream, only the latest record is kept.
+
+        Example:
+            async for pos in vehicle.stream("global_position"):
+                print(pos.lat, pos.lon)
+    """
+    async def stream(self, stream):
+        if stream not in self._snapshot.STREAMS:
+            raise ValueError("Unknown telemetry stream {}.".format(stream))
+
+        queue = asyncio.Queue(maxsize=1)
+        self._subscribers.setdefault(stream, []).append(queue)
+
+        try:
+            while 1:
+                yield await queue.get()
+        finally:
+            self._subscribers[stream].remove(queue)
+
+    async def wait_msg(self, msg, timeout=5000):
+        if timeout <= 0:
+            raise ValueError("wait_msg() - Timeout is <= 0.")
+        elif msg == "COMMAND_ACK":
+            raise NotImplementedError
+
+        msg_packet, timestamp = await self._wait_message(msg, self._messages, msg, timeout,
+                                                         "wait_msg() for message {} has timed out."
+                                                         .format(str(msg)))
+
+        msg_data = msg_packet.to_dict()
+        msg_data["eb_timestamp"] = timestamp
+
+        return msg_data
+
+    # Waits until every requested stream has produced it's first message.
+    async def wait_ready(self, timeout=5000):
+        if timeout <= 0:
+            raise ValueError("wait_ready() - Timeout is <= 0.")
+
+        try:
+            await asyncio.wait_for(self._ready_event.wait(), timeout / 1000)
+        except asyncio.TimeoutError:
+            raise TimeoutError("wait_ready() has timed out. Waiting for: {}."
+                               .format(", ".join(sorted(self._waiting_streams))))
+
+        if self._exception is not None:
+            raise self._exception
+
+    # type - https://mavlink.io/en/messages/common.html#MAV_RESULT
+    async def wait_cmd_ack(self, cmd, timeout=5000):
+        if timeout <= 0:
+            raise ValueError("wait_cmd_ack() - Timeout is <= 0.")
+
+        return (await self._wait_message(("COMMAND_ACK", cmd), self._messages["COMMAND_ACK"], cmd, timeout,
+                                         "wait_cmd_ack() for command {} has timed out."
+                                         .format(str(cmd))))[0].result
+
+    # type - https://mavlink.io/en/messages/common.html#MAV_MISSION_RESULT
+    async def wait_mission_ack(self, timeout=5000):
+        if timeout <= 0:
+            raise ValueError("wait_mission_ack() - Timeout is <= 0.")
+
+        return (await self._wait_message("MISSION_ACK", self._messages, "MISSION_ACK", timeout,
+                                         "wait_mission_ack() timed out."))[0].type
+
+    async def set_message_interval(self, msg_id, interval_ms=1000, retries=8, timeout=500):
+        res = await self._command_long("set_message_interval",
+                                       eb_mavutil.Enum.get_int_reference("MAV_CMD_SET_MESSAGE_INTERVAL"),
+                                       (msg_id, interval_ms * (10 ** 3), 0, 0, 0, 0, 0),
+                                       retries, timeout)
+
+        if res:
+            Logger.PrintLog(self.LOG_INFO, "set_message_interval() - Message interval sucessfully set for {}.".format(msg_id))
+        else:
+            Logger.PrintLog(self.LOG_INFO, "set_message_interval() - Setting message interval failed for {}.".format(msg_id))
+
+        return res
+
+    async def set_flight_mode(self, flight_mode, retries=4, timeout=1500):
+        Logger.PrintLog(self.LOG_INFO, "set_flight_mode() - Setting flight mode to {}."
+                        .format(flight_mode.upper()))
+
+        flight_mode = flight_mode.upper()
+        flight_mode_list = self._get_flight_modes()
+
+        if flight_mode not in flight_mode_list:
+            Logger.PrintLog(self.LOG_INFO, "set_flight_mode() - Flight mode {} not in flight mode list."
+                            .format(flight_mode))
+            return False
+
+        return await self._command_long("set_flight_mode",
+                                        eb_mavutil.Enum.get_int_reference("MAV_CMD_DO_SET_MODE"),
+                                        (eb_mavutil.Enum.get_int_reference("MAV_MODE_FLAG_CUSTOM_MODE_ENABLED"),
+                                         flight_mode_list[flight_mode],
+                                         0, 0, 0, 0, 0),
+                                        retries, timeout, target_component=0)
+
+    async def arm(self, retries=4, timeout=1500):
+        Logger.PrintLog(self.LOG_INFO, "arm() - Arming.")
+
+        return await self._command_long("arm",
+                                        eb_mavutil.Enum.get_int_reference("MAV_CMD_COMPONENT_ARM_DISARM"),
+                                        (1, 0, 0, 0, 0, 0, 0),
+                                        retries, timeout)
+
+    async def disarm(self, retries=4, timeout=1500):
+        Logger.PrintLog(self.LOG_INFO, "disarm() - Disarming.")
+
+        return await self._command_long("disarm",
+                                        eb_mavutil.Enum.get_int_reference("MAV_CMD_COMPONENT_ARM_DISARM"),
+                                        (0, 0, 0, 0, 0, 0, 0),
+                                        retries, timeout)
+
+    # GUIDED mode only.
+    async def takeoff(self, rel_alt, retries=12, timeout=500):
+        Logger.PrintLog(self.LOG_INFO, "takeoff() - Attempting to taking off to altitude: {} m."
+                        .format(str(rel_alt)))
+
+        if not self._is_guided("takeoff", "takeoff"): return False
+
+        return await self._command_long("takeoff",
+                                        eb_mavutil.Enum.get_int_reference("MAV_CMD_NAV_TAKEOFF"),
+                                        (0, 0, 0, 0, 0, 0, rel_alt),
+                                        retries, timeout)
+
+    # GUIDED mode only.
+    async def land(self, retries=12, timeout=500):
+        Logger.PrintLog(self.LOG_INFO, "land() - Attempting to land.")
+
+        if not self._is_guided("land", "land"): return False
+
+        return await self._command_long("land",
+                                        eb_mavutil.Enum.get_int_reference("MAV_CMD_NAV_LAND"),
+                                        (0, 0, 0, 0, 0, 0, 0),
+                                        retries, timeout)
+
+    # GUIDED mode only.
+    async def set_home_position(self, retries=12, timeout=500):
+        Logger.PrintLog(self.LOG_INFO, "set_home_position() - Attempting to set home position.")
+
+        if not self._is_guided("set_home_position", "set home position"): return False
+
+        return await self._command_long("set_home_position",
+                                        eb_mavutil.Enum.get_int_reference("MAV_CMD_DO_SET_HOME"),
+                                        (1, 0, 0, 0, 0, 0, 0),
+                                        retries, timeout)
+
+    # See Action.set_servo_pwm() for channel numbers.
+    async def set_servo_pwm(self, channel, pwm, retries=12, timeout=500):
+        Logger.PrintLog(self.LOG_INFO, "set_servo_pwm() - Setting servo's pwm at channel {} to {}."
+                        .format(str(channel), str(pwm)))
+
+        return await self._command_long("set_servo_pwm",
+                                        eb_mavutil.Enum.get_int_reference("MAV_CMD_DO_SET_SERVO"),
+                                        (channel, pwm, 0, 0, 0, 0, 0),
+                                        retries, timeout)
+
+    async def set_relay(self, channel, status, retries=12, timeout=500):
+        Logger.PrintLog(self.LOG_INFO, "set_relay() - Setting relay's status at channel {} to {}."
+                        .format(str(channel), str(status)))
+
+        if  status != 0 \
+        and status != 1: raise ValueError("Status must be either 0 or 1.")
+
+        return await self._command_long("set_relay",
+                                        eb_mavutil.Enum.get_int_reference("MAV_CMD_DO_SET_RELAY"),
+                                        (channel, status, 0, 0, 0, 0, 0),
+                                        retries, timeout)
+
+    # GUIDED mode only.
+    def go_to_global_position(self, lat, lon, rel_alt):
+        Logger.PrintLog(self.LOG_INFO, "go_to_global_position() - Attempting to going to destination global position.")
+
+        if not self._is_guided("go_to_global_position", "go to destination global position"): return False
+
+        eb_mavutil.Enum.get_method_reference(self.mav(), "MISSION_ITEM")(
+            self._get_target_system(),
+            self._get_target_component(),
+            0,
+            eb_mavutil.Enum.get_int_reference("MAV_FRAME_GLOBAL_RELATIVE_ALT"),
+            eb_mavutil.Enum.get_int_reference("MAV_CMD_NAV_WAYPOINT"),
+            2, 0,
+            0, 0, 0, 0,
+            lat, lon, rel_alt
+        )
+
+        return True
@@ -0,0 +1,18 @@
+"""
+    Intializes the drone with asyncio, changes it's flight mode and prints global
+    position of the drone every time it is received.
+"""
+import asyncio
+
+from eb.mavlink.async_vehicle import AsyncVehicle
+
+async def main():
+    drone = AsyncVehicle("/dev/ttyTHS1", 115200)
+    await drone.connect(timeout = 10000)
+
+    await drone.set_flight_mode("LOITER")
+
+    async for global_pos in drone.stream("global_position"):
+        print(global_pos.to_dict())
+
+asyncio.run(main())
@@ -0,0 +1,309 @@
+"""
+    Author: Ege Bilecen
+    Date  : 17.10.2026
+
+    Notes:
+    * All method parameters related to time are based on milliseconds.
+    * Fleet shares one mavlink connection (telemetry radio, UDP endpoint etc.)
+      between several vehicles. Received messages are demultiplexed by their
+      source system id into FleetVehicle objects, which can be used exactly like
+      a Vehicle (action(), telemetry(), mission(), control()).
+    * A vehicle is added to the fleet when the first HEARTBEAT of its autopilot
+      is received. Only messages from the autopilot component are routed.
+"""
+from concurrent.futures import ThreadPoolExecutor
+from pymavlink import mavutil
+import threading
+
+from eb.logger import Logger
+
+from eb.mavlink.vehicle    import Vehicle
+from eb.mavlink._telemetry import Telemetry
+from eb.mavlink._action    import Action
+from eb.mavlink._mission   import Mission
+from eb.mavlink._control   import Control
+from eb.mavlink._command   import Command
+import eb.mavlink.helper as eb_mavutil
+
+class FleetVehicle(Vehicle):
+    def __init__(self,
+                 fleet,
+                 system_id            : int,
+                 component_id         : int,
+                 address              : any,
+                 rate                 : int,
+                 message_rates        : dict,
+                 scripts_dir          : str,
+                 mission_control_rate : int,
+                 output_dir           : str) -> None:
+        self._fleet        = fleet
+        self._system_id    = system_id
+        self._component_id = component_id
+        self._mav_type     = None
+
+        self._init_variables(rate, output_dir, message_rates)
+        self.LOG_INFO = "fleet.py - System {}".format(system_id)
+
+        # Every vehicle has it's own encoder. Encoded messages are written to
+        # the shared connection by the fleet, see Fleet._write().
+        parent_mav = fleet.mavlink().mav
+        self._mav  = mavutil.mavlink.MAVLink(_FleetWriter(fleet, address),
+                                             srcSystem    = parent_mav.srcSystem,
+                                             srcComponent = parent_mav.srcComponent)
+
+        # Classes
+        self._command   = Command  (self)
+        self._action    = Action   (self)
+        self._telemetry = Telemetry(self)
+        self._mission   = Mission  (self, scripts_dir, mission_control_rate)
+        self._control   = Control  (self)
+
+    # Private Method(s)
+    def _get_target_system(self):
+        return self._system_id
+
+    def _get_target_component(self):
+        return self._component_id
+
+    # Shared connection only knows the type of the vehicle that sent the last
+    # heartbeat, so modes are looked up from this vehicle's own type.
+    def _get_flight_modes(self):
+        if self._mav_type is None: return {}
+
+        flight_modes = mavutil.mode_mapping_byname(self._mav_type)
+
+        if flight_modes is None: return {}
+
+        return flight_modes
+
+    def _handle_message(self, msg_packet):
+        if msg_packet.get_type() == "HEARTBEAT":
+            self._mav_type = msg_packet.type
+
+        super()._handle_message(msg_packet)
+
+    # Public Method(s)
+    def mavlink(self) -> mavutil.mavfile:
+        return self._fleet.mavlink()
+
+    def mav(self) -> any:
+        return self._mav
+
+    def get_system_id(self):
+        return self._system_id
+
+class _FleetWriter:
+    def __init__(self, fleet, address):
+        self._fleet   = fleet
+        self._address = address
+
+    def write(self, buf):
+        self._fleet._write(buf, self._address)
+
+class Fleet:
+    def __init__(self,
+                 port_name            : str  = "/dev/ttyTHS1",
+                 baudrate             : int  = 115200,
+                 rate                 : int  = 2,  # hz
+                 message_rates        : dict = None,
+                 source_system        : int  = 255,
+                 source_component     : int  = 0,
+                 retries              : int  = 3,
+                 autoreconnect        : bool = False,
+                 scripts_dir          : str  = "",
+                 mission_control_rate : int  = 4,
+                 output_dir           : str  = "./") -> None:
+        self._mavlink = mavutil.mavlink_connection(port_name,
+                                                   baud             = baudrate,
+                                                   source_system    = source_system,
+                                                   source_component = source_component,
+                                                   retries          = retries,
+                                                   autoreconnect    = autoreconnect)
+        # Variables
+        self.LOG_INFO              = "fleet.py"
+        self._rate                 = rate
+        self._message_rates        = message_rates
+        self._scripts_dir          = scripts_dir
+        self._mission_control_rate = mission_control_rate
+        self._output_dir           = output_dir
+        self._exception            = None
+        self._is_closed            = False
+        self._recorder             = None # tlog.Recorder, records the traffic of every vehicle.
+
+        self._vehicles           = {} # system id - FleetVehicle
+        self._vehicles_condition = threading.Condition()
+        self._write_lock         = threading.Lock()
+
+        # Start message handler
+        self._thread = threading.Thread(target=Fleet._thread_handler, args=(self,))
+        self._thread.daemon = False
+        self._thread.start()
+
+    # Private Method(s)
+    @staticmethod
+    def _thread_handler(cls):
+        while not cls._is_closed:
+            try:
+                msg_packet = cls.mavlink().recv_match(blocking=True, timeout=1)
+            except Exception as ex:
+                if cls._is_closed: break
+
+                cls._set_exception(ex)
+                return
+
+            if not msg_packet: continue
+
+            if cls._recorder is not None:
+                cls._recorder.record(msg_packet)
+
+            system_id = msg_packet.get_srcSystem()
+            vehicle   = cls._vehicles.get(system_id)
+
+            if vehicle is None:
+                if not Fleet._is_autopilot_heartbeat(msg_packet): continue
+
+                vehicle = cls._add_vehicle(msg_packet)
+            elif msg_packet.get_srcComponent() != vehicle._get_target_component():
+                continue
+
+            vehicle._handle_message(msg_packet)
+
+        cls._set_exception(ConnectionError("Connection is closed."))
+
+    @staticmethod
+    def _is_autopilot_heartbeat(msg_packet):
+        return msg_packet.get_type() == "HEARTBEAT" \
+        and    msg_packet.type       != eb_mavutil.Enum.get_int_reference("MAV_TYPE_GCS") \
+        and    msg_packet.autopilot  != eb_mavutil.Enum.get_int_reference("MAV_AUTOPILOT_INVALID")
+
+    # Pending waits of the fleet and every vehicle raise ex.
+    def _set_exception(self, ex):
+        self._exception = ex
+
+        with self._vehicles_condition:
+            self._vehicles_condition.notify_all()
+
+        for vehicle in list(self._vehicles.values()):
+            vehicle._set_exception(ex)
+
+    def _add_vehicle(self, msg_packet):
+        system_id = msg_packet.get_srcSystem()
+
+        # UDP server replies to the last address it received from. Remember the
+        # address of every vehicle, so commands go to the right one.
+        if getattr(self._mavlink, "udp_server", False):
+            address = self._mavlink.last_address
+        else:
+            address = None
+
+        vehicle = FleetVehicle(self, system_id, msg_packet.get_srcComponent(), address,
+                               self._rate, self._message_rates, self._scripts_dir, self._mission_control_rate, self._output_dir)
+
+        with self._vehicles_condition:
+            self._vehicles[system_id] = vehicle
+            self._vehicles_condition.notify_all()
+
+        Logger.PrintLog(self.LOG_INFO, "_add_vehicle() - Vehicle with system id {} has joined the fleet."
+                        .format(str(system_id)))
+
+        _ = threading.Thread(target=vehicle._set_message_intervals)
+        _.daemon = False
+        _.start()
+
+        return vehicle
+
+    def _write(self, buf, address):
+        with self._write_lock:
+            if address is not None:
+                self._mavlink.port.sendto(buf, address)
+            else:
+                self._mavlink.write(buf)
+
+    # Public Method(s)
+    def mavlink(self) -> mavutil.mavfile:
+        return self._mavlink
+
+    """
+        Closes the shared connection and waits for the message handler thread
+        to end. Pending waits of the vehicles raise ConnectionError.
+    """
+    def close(self):
+        Logger.PrintLog(self.LOG_INFO, "close() - Closing the connection.")
+
+        self._is_closed = True
+
+        if threading.current_thread() is not self._thread:
+            self._thread.join()
+
+        self._mavlink.close()
+
+    def set_recorder(self, recorder):
+        self._recorder = recorder
+
+    def get_vehicle(self, system_id) -> FleetVehicle:
+        return self._vehicles.get(system_id)
+
+    def get_vehicles(self) -> dict:
+        return dict(self._vehicles)
+
+    def get_system_ids(self) -> list:
+        return sorted(self._vehicles.keys())
+
+    # Blocks until at least vehicle_count vehicles have joined. Returns their system ids.
+    def wait_vehicles(self, vehicle_count, timeout=5000):
+        if timeout <= 0:
+            raise ValueError("wait_vehicles() - Timeout is <= 0.")
+
+        with self._vehicles_condition:
+            is_joined = self._vehicles_condition.wait_for(lambda: len(self._vehicles) >= vehicle_count
+                                                                  or self._exception is not None,
+                                                          timeout / 1000)
+
+        if self._exception is not None:
+            raise self._exception
+        elif not is_joined:
+            raise TimeoutError("wait_vehicles() - {} vehicle(s) couldn't be detected in {} milliseconds."
+                               .format(str(vehicle_count), str(timeout)))
+
+        return self.get_system_ids()
+
+    """
+        Calls func(vehicle) for every vehicle (or only the ones in system_ids)
+        concurrently. At most max_in_flight calls run at the same time, so at
+        most max_in_flight ACK waits are in flight.
+
+        Returns { system_id : return value of func }. If func raised an
+        exception, the exception is returned as the value.
+    """
+    def fan_out(self, func, system_ids=None, max_in_flight=4):
+        if max_in_flight < 1: raise ValueError("max_in_flight < 1")
+
+        if system_ids is None:
+            system_ids = self.get_system_ids()
+
+        vehicles = [self._vehicles[system_id] for system_id in system_ids]
+        results  = {}
+
+        if len(vehicles) < 1: return results
+
+        with ThreadPoolExecutor(max_workers=min(max_in_flight, len(vehicles))) as executor:
+            futures = {vehicle.get_system_id() : executor.submit(func, vehicle) for vehicle in vehicles}
+
+            for system_id, future in futures.items():
+                try:
+                    results[system_id] = future.result()
+                except Exception as ex:
+                    results[system_id] = ex
+
+        return results
+
+    """
+        Calls the given Action method with the same arguments on every vehicle.
+
+        Example:
+            fleet.action("set_flight_mode", "GUIDED")
+            fleet.action("takeoff", 10, system_ids=[1, 2])
+    """
+    def action(self, method_name, *args, system_ids=None, max_in_flight=4, **kwargs):
+        return self.fan_out(lambda vehicle: getattr(vehicle.action(), method_name)(*args, **kwargs),
+                            system_ids, max_in_flight)
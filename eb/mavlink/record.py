@@ -0,0 +1,317 @@
+"""
+    Author: Ege Bilecen
+    Date  : 17.10.2026
+
+    Notes:
+    * Records are built straight from pymavlink message attributes, without
+      going through msg.to_dict(). They must be treated as read-only once they
+      are handed out.
+    * Records can still be used like the dicts that Telemetry used to return,
+      e.g. record["lat"], record["speed"]["x"], "lat" in record, iterating
+      over it or it's items() or record.to_dict().
+    * seq is a per stream sequence number. It starts from 1 and is increased
+      by one for every received message of that stream.
+"""
+from eb.time import Time
+
+class Record:
+    __slots__ = ()
+    _FIELDS   = ()
+
+    def __repr__(self):
+        return "{}({})".format(type(self).__name__,
+                               ", ".join("{}={}".format(field, repr(getattr(self, field)))
+                                         for field in self._FIELDS))
+
+    # Only valid for records that have timestamp field.
+    @property
+    def last_update(self):
+        return Time.get_current_timestamp("ms") - self.timestamp
+
+    # Dict View
+    def __getitem__(self, key):
+        if  key != "last_update" \
+        and key not in self._FIELDS:
+            raise KeyError(key)
+
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key)
+
+    def __contains__(self, key):
+        if key == "last_update": return "timestamp" in self._FIELDS
+
+        return key in self._FIELDS
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def keys(self):
+        if "timestamp" in self._FIELDS:
+            return self._FIELDS + ("last_update",)
+
+        return self._FIELDS
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def __len__(self):
+        return len(self.keys())
+
+    def values(self):
+        return [self[key] for key in self.keys()]
+
+    def items(self):
+        return [(key, self[key]) for key in self.keys()]
+
+    def to_dict(self):
+        ret_dict = {}
+
+        for key in self.keys():
+            val = self[key]
+
+            if isinstance(val, Record):
+                val = val.to_dict()
+
+            ret_dict[key] = val
+
+        return ret_dict
+
+class Velocity(Record):
+    __slots__ = _FIELDS = ("x", "y", "z")
+
+    def __init__(self, x, y, z):
+        self.x = x
+        self.y = y
+        self.z = z
+
+class AngularSpeed(Record):
+    __slots__ = _FIELDS = ("roll", "pitch", "yaw")
+
+    def __init__(self, roll, pitch, yaw):
+        self.roll  = roll
+        self.pitch = pitch
+        self.yaw   = yaw
+
+# HEARTBEAT
+# String values are converted by Vehicle, see eb.mavlink.convert.
+class Heartbeat(Record):
+    __slots__ = _FIELDS = ("state", "vehicle_type", "flight_mode", "armed", "timestamp", "seq")
+
+    def __init__(self, state, vehicle_type, flight_mode, armed, timestamp, seq):
+        self.state        = state
+        self.vehicle_type = vehicle_type
+        self.flight_mode  = flight_mode
+        self.armed        = armed
+        self.timestamp    = timestamp
+        self.seq          = seq
+
+# SYS_STATUS
+class Battery(Record):
+    __slots__ = _FIELDS = ("voltage", "current", "remaining", "timestamp", "seq")
+
+    def __init__(self, voltage, current, remaining, timestamp, seq):
+        self.voltage   = voltage   # V
+        self.current   = current   # A
+        self.remaining = remaining # %
+        self.timestamp = timestamp
+        self.seq       = seq
+
+    @staticmethod
+    def from_message(msg, timestamp, seq):
+        return Battery(msg.voltage_battery / (10 ** 3),
+                       msg.current_battery / (10 ** 2),
+                       msg.battery_remaining,
+                       timestamp, seq)
+
+# GPS_RAW_INT
+class Gps(Record):
+    __slots__ = _FIELDS = ("fix_type", "lat", "lon", "alt", "sat_count", "timestamp", "seq")
+
+    def __init__(self, fix_type, lat, lon, alt, sat_count, timestamp, seq):
+        self.fix_type  = fix_type
+        self.lat       = lat # degree
+        self.lon       = lon # degree
+        self.alt       = alt # meters
+        self.sat_count = sat_count
+        self.timestamp = timestamp
+        self.seq       = seq
+
+    @staticmethod
+    def from_message(msg, timestamp, seq):
+        return Gps(msg.fix_type,
+                   msg.lat / (10 ** 7),
+                   msg.lon / (10 ** 7),
+                   msg.alt / (10 ** 3),
+                   msg.satellites_visible,
+                   timestamp, seq)
+
+# ATTITUDE
+class Attitude(Record):
+    __slots__ = _FIELDS = ("roll", "pitch", "yaw", "speed", "timestamp", "seq")
+
+    def __init__(self, roll, pitch, yaw, speed, timestamp, seq):
+        self.roll      = roll
+        self.pitch     = pitch
+        self.yaw       = yaw
+        self.speed     = speed
+        self.timestamp = timestamp
+        self.seq       = seq
+
+    @staticmethod
+    def from_message(msg, timestamp, seq):
+        return Attitude(msg.roll,
+                        msg.pitch,
+                        msg.yaw,
+                        AngularSpeed(msg.rollspeed, msg.pitchspeed, msg.yawspeed),
+                        timestamp, seq)
+
+# LOCAL_POSITION_NED
+class LocalPosition(Record):
+    __slots__ = _FIELDS = ("x", "y", "z", "speed", "timestamp", "seq")
+
+    def __init__(self, x, y, z, speed, timestamp, seq):
+        self.x         = x
+        self.y         = y
+        self.z         = z
+        self.speed     = speed
+        self.timestamp = timestamp
+        self.seq       = seq
+
+    @staticmethod
+    def from_message(msg, timestamp, seq):
+        return LocalPosition(msg.x,
+                             msg.y,
+                             msg.z,
+                             Velocity(msg.vx, msg.vy, msg.vz),
+                             timestamp, seq)
+
+# GLOBAL_POSITION_INT
+class GlobalPosition(Record):
+    __slots__ = _FIELDS = ("lat", "lon", "alt", "relative_alt", "speed", "yaw", "timestamp", "seq")
+
+    def __init__(self, lat, lon, alt, relative_alt, speed, yaw, timestamp, seq):
+        self.lat          = lat          # degree
+        self.lon          = lon          # degree
+        self.alt          = alt          # meters
+        self.relative_alt = relative_alt # meters
+        self.speed        = speed
+        self.yaw          = yaw
+        self.timestamp    = timestamp
+        self.seq          = seq
+
+    @staticmethod
+    def from_message(msg, timestamp, seq):
+        return GlobalPosition(msg.lat / (10 ** 7),
+                              msg.lon / (10 ** 7),
+                              msg.alt / (10 ** 3),
+                              msg.relative_alt / (10 ** 3),
+                              Velocity(msg.vx, msg.vy, msg.vz),
+                              msg.hdg,
+                              timestamp, seq)
+
+# RC_CHANNELS_RAW
+class RcChannels(Record):
+    __slots__ = _FIELDS = ("channel_1", "channel_2", "channel_3", "channel_4",
+                           "channel_5", "channel_6", "channel_7", "channel_8",
+                           "timestamp", "seq")
+
+    def __init__(self, channel_1, channel_2, channel_3, channel_4,
+                       channel_5, channel_6, channel_7, channel_8,
+                       timestamp, seq):
+        self.channel_1 = channel_1
+        self.channel_2 = channel_2
+        self.channel_3 = channel_3
+        self.channel_4 = channel_4
+        self.channel_5 = channel_5
+        self.channel_6 = channel_6
+        self.channel_7 = channel_7
+        self.channel_8 = channel_8
+        self.timestamp = timestamp
+        self.seq       = seq
+
+    @staticmethod
+    def from_message(msg, timestamp, seq):
+        return RcChannels(msg.chan1_raw, msg.chan2_raw, msg.chan3_raw, msg.chan4_raw,
+                          msg.chan5_raw, msg.chan6_raw, msg.chan7_raw, msg.chan8_raw,
+                          timestamp, seq)
+
+# VFR_HUD
+class VfrHud(Record):
+    __slots__ = _FIELDS = ("air_speed", "ground_speed", "heading", "throttle", "alt", "climb_rate", "timestamp", "seq")
+
+    def __init__(self, air_speed, ground_speed, heading, throttle, alt, climb_rate, timestamp, seq):
+        self.air_speed    = air_speed    # m/s
+        self.ground_speed = ground_speed # m/s
+        self.heading      = heading      # degree
+        self.throttle     = throttle     # %
+        self.alt          = alt          # meters
+        self.climb_rate   = climb_rate   # m/s
+        self.timestamp    = timestamp
+        self.seq          = seq
+
+    @staticmethod
+    def from_message(msg, timestamp, seq):
+        return VfrHud(msg.airspeed,
+                      msg.groundspeed,
+                      msg.heading,
+                      msg.throttle,
+                      msg.alt,
+                      msg.climb,
+                      timestamp, seq)
+
+class Snapshot(Record):
+    """
+        Latest record of every telemetry stream at a single point in time.
+
+        Snapshots are never modified. Receiver thread builds a new snapshot
+        for every telemetry message and swaps Vehicle's reference to it, so a
+        reader that takes the reference once sees a coherent state of all
+        streams without any locking. A stream is None until its first
+        message is received. seq is increased by one for every update.
+    """
+    STREAMS   = ("heartbeat", "battery", "gps", "attitude", "local_position",
+                 "global_position", "rc_channels", "vfr_hud")
+    __slots__ = _FIELDS = STREAMS + ("seq",)
+
+    def __init__(self,
+                 heartbeat       = None,
+                 battery         = None,
+                 gps             = None,
+                 attitude        = None,
+                 local_position  = None,
+                 global_position = None,
+                 rc_channels     = None,
+                 vfr_hud         = None,
+                 seq             = 0):
+        self.heartbeat       = heartbeat
+        self.battery         = battery
+        self.gps             = gps
+        self.attitude        = attitude
+        self.local_position  = local_position
+        self.global_position = global_position
+        self.rc_channels     = rc_channels
+        self.vfr_hud         = vfr_hud
+        self.seq             = seq
+
+    # Returns sequence number of the next record of the stream.
+    def next_seq(self, stream):
+        record = getattr(self, stream)
+
+        if record is None: return 1
+
+        return record.seq + 1
+
+    # Returns a new snapshot with the stream set to record.
+    def replace(self, stream, record):
+        if stream not in Snapshot.STREAMS:
+            raise ValueError("Unknown telemetry stream {}.".format(stream))
+
+        values = [getattr(self, field) for field in Snapshot.STREAMS]
+        values[Snapshot.STREAMS.index(stream)] = record
+
+        return Snapshot(*values, seq=self.seq + 1)
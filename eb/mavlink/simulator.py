@@ -0,0 +1,459 @@
+"""
+    Author: Ege Bilecen
+    Date  : 17.10.2026
+
+    Notes:
+    * All method parameters related to time are based on milliseconds.
+    * Lightweight simulated ArduCopter autopilot. It is meant for testing and
+      benchmarking eb.mavlink without a drone or an external SITL, it is not a
+      flight dynamics model. Vehicle moves towards it's target with constant
+      horizontal/vertical speeds, there is no acceleration or wind.
+    * Speaks MAVLink over any mavutil connection string. Default is to send to
+      a local UDP port that Vehicle listens on:
+
+        sim   = Simulator("udpout:127.0.0.1:14550")
+        sim.start()
+        drone = Vehicle("udpin:127.0.0.1:14550")
+
+    * Emits HEARTBEAT and every message Vehicle parses. Stream rates can be
+      changed with MAV_CMD_SET_MESSAGE_INTERVAL like on a real autopilot.
+    * Acknowledges the commands Action sends (mode, arm/disarm, takeoff, land,
+      home, servo, relay, speed, yaw) and follows GUIDED MISSION_ITEM and
+      SET_POSITION_TARGET_LOCAL_NED targets.
+"""
+from pymavlink import mavutil
+import threading
+import math
+import time
+
+from eb.logger import Logger
+import eb.mavlink.helper as eb_mavutil
+
+class Simulator:
+    FORCE_DISARM_MAGIC = 21196
+
+    def __init__(self,
+                 address      : str   = "udpout:127.0.0.1:14550",
+                 system_id    : int   = 1,
+                 component_id : int   = 1,
+                 home_lat     : float = 40.,   # degree
+                 home_lon     : float = 30.,   # degree
+                 home_alt     : float = 100.,  # meters, above mean sea level
+                 stream_rate  : int   = 4,     # hz, initial rate of every stream
+                 update_rate  : int   = 50,    # hz, kinematics update rate
+                 speed        : float = 5.,    # m/s, horizontal
+                 climb_speed  : float = 2.5,   # m/s
+                 land_speed   : float = 1.) -> None:
+        self._mavlink = mavutil.mavlink_connection(address,
+                                                   source_system    = system_id,
+                                                   source_component = component_id)
+        # Variables
+        self.LOG_INFO = "simulator.py"
+
+        self._update_rate = update_rate
+        self._speed       = speed
+        self._climb_speed = climb_speed
+        self._land_speed  = land_speed
+
+        self._home = {"lat" : home_lat, "lon" : home_lon, "alt" : home_alt}
+
+        self._flight_modes     = mavutil.mode_mapping_acm
+        self._flight_mode_list = {v : k for k, v in self._flight_modes.items()}
+
+        self._flight_mode = self._flight_mode_list["STABILIZE"]
+        self._armed       = False
+
+        # Local NED, relative to home. Meters and m/s.
+        self._position = [0., 0., 0.]
+        self._velocity = [0., 0., 0.]
+        self._yaw      = 0. # radian
+        self._target   = None # ("position", [x, y, z]) or ("velocity", [vx, vy, vz], end timestamp)
+
+        self._servos   = {} # channel - pwm
+        self._relays   = {} # channel - status
+        self._rc_override = [0] * 8
+
+        self._boot_timestamp = time.monotonic()
+        self._command_count  = 0
+
+        # msg id - [interval (s), next send time]
+        self._streams = {}
+
+        for msg_str in ("SYS_STATUS", "SYSTEM_TIME", "GPS_RAW_INT", "ATTITUDE", "LOCAL_POSITION_NED",
+                        "GLOBAL_POSITION_INT", "RC_CHANNELS_RAW", "VFR_HUD"):
+            self._set_stream(eb_mavutil.Enum.get_int_reference("MAVLINK_MSG_ID_" + msg_str),
+                             1 / stream_rate if stream_rate > 0 else -1)
+
+        self._set_stream(eb_mavutil.Enum.get_int_reference("MAVLINK_MSG_ID_HEARTBEAT"), 1)
+
+        self._lock    = threading.Lock()
+        self._thread  = None
+        self._running = False
+
+    # Private Method(s)
+    @staticmethod
+    def _thread_handler(cls):
+        LOG_INFO = cls.LOG_INFO + " - _thread_handler()"
+
+        Logger.PrintLog(LOG_INFO, "Simulator has started.")
+
+        interval  = 1 / cls._update_rate
+        last_time = time.monotonic()
+
+        while cls._running:
+            while 1:
+                msg_packet = cls._mavlink.recv_match(blocking=False)
+
+                if msg_packet is None: break
+
+                with cls._lock:
+                    cls._handle_message(msg_packet)
+
+            current_time = time.monotonic()
+
+            with cls._lock:
+                cls._update(current_time - last_time, current_time)
+                cls._send_streams(current_time)
+
+            last_time = current_time
+
+            # Wake up early if a command arrives.
+            cls._mavlink.select(max(0., interval - (time.monotonic() - current_time)))
+
+        Logger.PrintLog(LOG_INFO, "Simulator has stopped.")
+
+    def _set_stream(self, msg_id, interval):
+        if interval < 0:
+            self._streams.pop(msg_id, None)
+        else:
+            self._streams[msg_id] = [interval, 0.]
+
+    def _get_flight_mode_str(self):
+        return self._flight_modes.get(self._flight_mode, "UNKNOWN")
+
+    def _is_landed(self):
+        return self._position[2] >= 0
+
+    # Flat earth approximation, good enough for a few kilometers.
+    def _local_to_global(self, x, y):
+        lat = self._home["lat"] + math.degrees(x / 6378137.)
+        lon = self._home["lon"] + math.degrees(y / (6378137. * math.cos(math.radians(self._home["lat"]))))
+
+        return lat, lon
+
+    def _global_to_local(self, lat, lon):
+        x = math.radians(lat - self._home["lat"]) * 6378137.
+        y = math.radians(lon - self._home["lon"]) * 6378137. * math.cos(math.radians(self._home["lat"]))
+
+        return x, y
+
+    def _update(self, dt, current_time):
+        if dt <= 0: return
+
+        if not self._armed:
+            self._velocity = [0., 0., 0.]
+            return
+
+        if self._get_flight_mode_str() == "LAND":
+            self._velocity = [0., 0., self._land_speed if not self._is_landed() else 0.]
+        elif self._target is None:
+            self._velocity = [0., 0., 0.]
+        elif self._target[0] == "velocity":
+            if current_time >= self._target[2]:
+                self._target   = None
+                self._velocity = [0., 0., 0.]
+            else:
+                self._velocity = list(self._target[1])
+        else:
+            delta = [self._target[1][i] - self._position[i] for i in range(3)]
+            dist  = math.hypot(delta[0], delta[1])
+
+            # Don't overshoot the target in the last step.
+            horizontal_speed = min(self._speed, dist / dt)
+            vertical_speed   = min(self._climb_speed, abs(delta[2]) / dt)
+
+            if dist > 0:
+                self._velocity[0] = delta[0] / dist * horizontal_speed
+                self._velocity[1] = delta[1] / dist * horizontal_speed
+            else:
+                self._velocity[0] = self._velocity[1] = 0.
+
+            self._velocity[2] = math.copysign(vertical_speed, delta[2])
+
+        for i in range(3):
+            self._position[i] += self._velocity[i] * dt
+
+        if self._velocity[0] != 0 or self._velocity[1] != 0:
+            self._yaw = math.atan2(self._velocity[1], self._velocity[0])
+
+        if self._position[2] >= 0:
+            self._position[2] = 0.
+
+            if self._velocity[2] >= 0:
+                self._velocity = [0., 0., 0.]
+
+                # Touched down.
+                if self._get_flight_mode_str() == "LAND":
+                    self._armed  = False
+                    self._target = None
+
+    def _send_streams(self, current_time):
+        for msg_id, stream in self._streams.items():
+            if current_time < stream[1]: continue
+
+            stream[1] = current_time + stream[0]
+            self._send_message(msg_id)
+
+    def _send_message(self, msg_id):
+        mav          = self._mavlink.mav
+        time_boot_ms = int((time.monotonic() - self._boot_timestamp) * 1000) & 0xFFFFFFFF
+        lat, lon     = self._local_to_global(self._position[0], self._position[1])
+        rel_alt      = -self._position[2]
+        ground_speed = math.hypot(self._velocity[0], self._velocity[1])
+        heading      = math.degrees(self._yaw) % 360
+
+        if msg_id == mavutil.mavlink.MAVLINK_MSG_ID_HEARTBEAT:
+            base_mode = mavutil.mavlink.MAV_MODE_FLAG_CUSTOM_MODE_ENABLED
+
+            if self._armed: base_mode |= mavutil.mavlink.MAV_MODE_FLAG_SAFETY_ARMED
+
+            mav.heartbeat_send(mavutil.mavlink.MAV_TYPE_QUADROTOR,
+                               mavutil.mavlink.MAV_AUTOPILOT_ARDUPILOTMEGA,
+                               base_mode,
+                               self._flight_mode,
+                               mavutil.mavlink.MAV_STATE_ACTIVE if self._armed else mavutil.mavlink.MAV_STATE_STANDBY)
+        elif msg_id == mavutil.mavlink.MAVLINK_MSG_ID_SYS_STATUS:
+            mav.sys_status_send(0, 0, 0, 500, 12600, 1500 if self._armed else 100, 90,
+                                0, 0, 0, 0, 0, 0)
+        elif msg_id == mavutil.mavlink.MAVLINK_MSG_ID_SYSTEM_TIME:
+            mav.system_time_send(int(time.time() * (10 ** 6)), time_boot_ms)
+        elif msg_id == mavutil.mavlink.MAVLINK_MSG_ID_GPS_RAW_INT:
+            mav.gps_raw_int_send(time_boot_ms * (10 ** 3), 3,
+                                 int(lat * (10 ** 7)), int(lon * (10 ** 7)),
+                                 int((self._home["alt"] + rel_alt) * (10 ** 3)),
+                                 100, 100, int(ground_speed * 100), int(heading * 100), 12)
+        elif msg_id == mavutil.mavlink.MAVLINK_MSG_ID_ATTITUDE:
+            mav.attitude_send(time_boot_ms, 0., 0., self._yaw, 0., 0., 0.)
+        elif msg_id == mavutil.mavlink.MAVLINK_MSG_ID_LOCAL_POSITION_NED:
+            mav.local_position_ned_send(time_boot_ms, *self._position, *self._velocity)
+        elif msg_id == mavutil.mavlink.MAVLINK_MSG_ID_GLOBAL_POSITION_INT:
+            mav.global_position_int_send(time_boot_ms,
+                                         int(lat * (10 ** 7)), int(lon * (10 ** 7)),
+                                         int((self._home["alt"] + rel_alt) * (10 ** 3)),
+                                         int(rel_alt * (10 ** 3)),
+                                         *[int(v * 100) for v in self._velocity],
+                                         int(heading * 100))
+        elif msg_id == mavutil.mavlink.MAVLINK_MSG_ID_RC_CHANNELS_RAW:
+            channels = [pwm if pwm != 0 else 1500 for pwm in self._rc_override]
+            mav.rc_channels_raw_send(time_boot_ms, 0, *channels, 255)
+        elif msg_id == mavutil.mavlink.MAVLINK_MSG_ID_VFR_HUD:
+            mav.vfr_hud_send(ground_speed, ground_speed, int(heading),
+                             50 if self._armed else 0,
+                             self._home["alt"] + rel_alt, -self._velocity[2])
+        else:
+            return False
+
+        return True
+
+    def _handle_message(self, msg_packet):
+        packet_type = msg_packet.get_type()
+
+        if packet_type == "COMMAND_LONG":
+            if msg_packet.target_system != self._mavlink.mav.srcSystem: return
+
+            self._command_count += 1
+            result = self._handle_command(msg_packet.command,
+                                          [msg_packet.param1, msg_packet.param2, msg_packet.param3,
+                                           msg_packet.param4, msg_packet.param5, msg_packet.param6,
+                                           msg_packet.param7])
+
+            # Report mode/arm changes before the ACK, so the GCS already knows
+            # the new state when the command returns.
+            if  result == mavutil.mavlink.MAV_RESULT_ACCEPTED \
+            and msg_packet.command in (mavutil.mavlink.MAV_CMD_DO_SET_MODE,
+                                       mavutil.mavlink.MAV_CMD_COMPONENT_ARM_DISARM,
+                                       mavutil.mavlink.MAV_CMD_NAV_LAND):
+                self._send_message(mavutil.mavlink.MAVLINK_MSG_ID_HEARTBEAT)
+
+            self._mavlink.mav.command_ack_send(msg_packet.command, result)
+
+        # GUIDED mode "go to" requests.
+        elif packet_type in ("MISSION_ITEM", "MISSION_ITEM_INT"):
+            if msg_packet.current != 2 \
+            or self._get_flight_mode_str() != "GUIDED" \
+            or msg_packet.command != mavutil.mavlink.MAV_CMD_NAV_WAYPOINT:
+                return
+
+            x, y, z = msg_packet.x, msg_packet.y, msg_packet.z
+
+            if packet_type == "MISSION_ITEM_INT" \
+            and msg_packet.frame != mavutil.mavlink.MAV_FRAME_LOCAL_NED:
+                x, y = x / (10 ** 7), y / (10 ** 7)
+
+            if msg_packet.frame == mavutil.mavlink.MAV_FRAME_LOCAL_NED:
+                self._target = ("position", [x, y, z])
+            else:
+                north, east  = self._global_to_local(x, y)
+                self._target = ("position", [north, east, -z])
+
+        elif packet_type == "SET_POSITION_TARGET_LOCAL_NED":
+            if self._get_flight_mode_str() != "GUIDED": return
+
+            # Position is ignored, velocity is used.
+            if msg_packet.type_mask & 0b111 == 0b111:
+                self._target = ("velocity", [msg_packet.vx, msg_packet.vy, msg_packet.vz],
+                                time.monotonic() + 1)
+            else:
+                self._target = ("position", [msg_packet.x, msg_packet.y, msg_packet.z])
+
+        elif packet_type == "RC_CHANNELS_OVERRIDE":
+            self._rc_override = [msg_packet.chan1_raw, msg_packet.chan2_raw, msg_packet.chan3_raw, msg_packet.chan4_raw,
+                                 msg_packet.chan5_raw, msg_packet.chan6_raw, msg_packet.chan7_raw, msg_packet.chan8_raw]
+
+    # Returns MAV_RESULT.
+    def _handle_command(self, command, params):
+        ACCEPTED    = mavutil.mavlink.MAV_RESULT_ACCEPTED
+        DENIED      = mavutil.mavlink.MAV_RESULT_DENIED
+        FAILED      = mavutil.mavlink.MAV_RESULT_FAILED
+        UNSUPPORTED = mavutil.mavlink.MAV_RESULT_UNSUPPORTED
+
+        if command == mavutil.mavlink.MAV_CMD_SET_MESSAGE_INTERVAL:
+            if params[1] == 0: interval = 0.25
+            elif params[1] < 0: interval = -1
+            else: interval = params[1] / (10 ** 6)
+
+            self._set_stream(int(params[0]), interval)
+            return ACCEPTED
+
+        elif command == mavutil.mavlink.MAV_CMD_REQUEST_MESSAGE:
+            return ACCEPTED if self._send_message(int(params[0])) else FAILED
+
+        elif command == mavutil.mavlink.MAV_CMD_DO_SET_MODE:
+            if int(params[1]) not in self._flight_modes: return DENIED
+
+            self._flight_mode = int(params[1])
+
+            if self._get_flight_mode_str() != "GUIDED":
+                self._target = None
+
+            return ACCEPTED
+
+        elif command == mavutil.mavlink.MAV_CMD_COMPONENT_ARM_DISARM:
+            if params[0] == 1:
+                if not self._is_landed(): return DENIED
+
+                self._armed = True
+            else:
+                if  not self._is_landed() \
+                and params[1] != Simulator.FORCE_DISARM_MAGIC: return DENIED
+
+                self._armed  = False
+                self._target = None
+
+            return ACCEPTED
+
+        elif command == mavutil.mavlink.MAV_CMD_NAV_TAKEOFF:
+            if not self._armed \
+            or self._get_flight_mode_str() != "GUIDED" \
+            or not self._is_landed(): return DENIED
+
+            self._target = ("position", [self._position[0], self._position[1], -params[6]])
+            return ACCEPTED
+
+        elif command == mavutil.mavlink.MAV_CMD_NAV_LAND:
+            self._flight_mode = self._flight_mode_list["LAND"]
+            self._target      = None
+            return ACCEPTED
+
+        elif command == mavutil.mavlink.MAV_CMD_DO_SET_HOME:
+            if params[0] == 1:
+                lat, lon = self._local_to_global(self._position[0], self._position[1])
+                alt      = self._home["alt"] - self._position[2]
+            else:
+                lat, lon, alt = params[4], params[5], params[6]
+
+            # Keep the vehicle where it is, only the reference changes.
+            north, east = self._global_to_local(lat, lon)
+            self._position[0] -= north
+            self._position[1] -= east
+            self._position[2] += alt - self._home["alt"]
+
+            if self._target is not None and self._target[0] == "position":
+                self._target[1][0] -= north
+                self._target[1][1] -= east
+                self._target[1][2] += alt - self._home["alt"]
+
+            self._home = {"lat" : lat, "lon" : lon, "alt" : alt}
+            return ACCEPTED
+
+        elif command == mavutil.mavlink.MAV_CMD_DO_SET_SERVO:
+            self._servos[int(params[0])] = int(params[1])
+            return ACCEPTED
+
+        elif command == mavutil.mavlink.MAV_CMD_DO_SET_RELAY:
+            self._relays[int(params[0])] = int(params[1])
+            return ACCEPTED
+
+        elif command == mavutil.mavlink.MAV_CMD_DO_CHANGE_SPEED:
+            if params[1] <= 0: return ACCEPTED
+
+            # 0, 1 - air/ground speed | 2 - climb | 3 - descent
+            if   params[0] in (0, 1): self._speed       = params[1]
+            elif params[0] == 2:      self._climb_speed = params[1]
+            elif params[0] == 3:      self._land_speed  = params[1]
+
+            return ACCEPTED
+
+        elif command == mavutil.mavlink.MAV_CMD_CONDITION_YAW:
+            if params[3] == 1: self._yaw += math.radians(params[0] * (params[2] if params[2] != 0 else 1))
+            else:              self._yaw  = math.radians(params[0])
+
+            return ACCEPTED
+
+        return UNSUPPORTED
+
+    # Public Method(s)
+    def start(self):
+        if self._thread is not None: return
+
+        self._running = True
+
+        self._thread = threading.Thread(target=Simulator._thread_handler, args=(self,))
+        self._thread.daemon = True
+        self._thread.start()
+
+    def stop(self):
+        if self._thread is None: return
+
+        self._running = False
+        self._thread.join()
+        self._thread = None
+
+        self._mavlink.close()
+
+    def mavlink(self) -> mavutil.mavfile:
+        return self._mavlink
+
+    def get_flight_mode(self):
+        with self._lock:
+            return self._get_flight_mode_str()
+
+    def get_is_armed(self):
+        with self._lock:
+            return self._armed
+
+    # Local NED, relative to home.
+    def get_position(self):
+        with self._lock:
+            return tuple(self._position)
+
+    def get_servo_pwm(self, channel):
+        with self._lock:
+            return self._servos.get(channel)
+
+    def get_relay(self, channel):
+        with self._lock:
+            return self._relays.get(channel)
+
+    def get_command_count(self):
+        return self._command_count
@@ -0,0 +1,431 @@
+"""
+    Author: Ege Bilecen
+    Date  : 17.10.2026
+
+    Notes:
+    * All method parameters related to time are based on milliseconds.
+    * Files use the .tlog layout of MAVProxy/Mission Planner: every raw MAVLink
+      frame is prefixed by the time it was received as a big-endian uint64 in
+      microseconds. Recorded files can be opened by those tools as well.
+    * Recorder only queues frames on the receiver thread. Frames are written
+      to disk by it's own thread with buffered writes. If the writer can't
+      keep up, new frames are dropped instead of blocking the receiver.
+    * Reader indexes the file once by walking the frame headers (MAVLink v1
+      and v2), messages are only decoded when they are read.
+"""
+from pymavlink import mavutil
+from bisect    import bisect_left
+import threading
+import struct
+import queue
+import mmap
+import time
+import os
+
+from eb.logger import Logger
+from eb.time   import Time
+
+from eb.mavlink.vehicle    import Vehicle
+from eb.mavlink._telemetry import Telemetry
+from eb.mavlink._action    import Action
+from eb.mavlink._mission   import Mission
+from eb.mavlink._control   import Control
+from eb.mavlink._command   import Command
+import eb.mavlink.helper as eb_mavutil
+
+_TIMESTAMP = struct.Struct(">Q")
+
+_MAGIC_V1 = 0xFE
+_MAGIC_V2 = 0xFD
+
+_HEADER_LEN_V1 = 6
+_HEADER_LEN_V2 = 10
+_CRC_LEN       = 2
+_SIGNATURE_LEN = 13
+
+class Recorder:
+    def __init__(self,
+                 output_dir      : str = "./",
+                 file_prefix     : str = "flight",
+                 max_file_size   : int = 64 * 1024 * 1024, # bytes
+                 max_queue_size  : int = 4096,
+                 buffer_size     : int = 64 * 1024) -> None:
+        self.LOG_INFO = "tlog.py"
+
+        self._output_dir    = output_dir
+        self._file_prefix   = file_prefix
+        self._max_file_size = max_file_size
+        self._buffer_size   = buffer_size
+
+        self._queue         = queue.Queue(maxsize=max_queue_size)
+        self._thread        = None
+        self._file          = None
+        self._file_size     = 0
+        self._file_list     = []
+        self._session_name  = ""
+        self._frame_count   = 0
+        self._dropped_count = 0
+
+    # Private Method(s)
+    @staticmethod
+    def _thread_handler(cls):
+        while 1:
+            item = cls._queue.get()
+
+            if item is None: break
+
+            timestamp, buf = item
+
+            if cls._file is None \
+            or cls._file_size + len(buf) + _TIMESTAMP.size > cls._max_file_size:
+                cls._rotate()
+
+            cls._file.write(_TIMESTAMP.pack(timestamp))
+            cls._file.write(buf)
+
+            cls._file_size   += _TIMESTAMP.size + len(buf)
+            cls._frame_count += 1
+
+        if cls._file is not None:
+            cls._file.close()
+            cls._file = None
+
+    def _rotate(self):
+        if self._file is not None:
+            self._file.close()
+
+        file_path = os.path.join(self._output_dir, "{}_{}_{:03d}.tlog"
+                                 .format(self._file_prefix, self._session_name, len(self._file_list)))
+
+        self._file      = open(file_path, "wb", buffering=self._buffer_size)
+        self._file_size = 0
+        self._file_list.append(file_path)
+
+        Logger.PrintLog(self.LOG_INFO, "_rotate() - Recording to {}.".format(file_path))
+
+    # Public Method(s)
+    def start(self):
+        if self._thread is not None: return
+
+        os.makedirs(self._output_dir, exist_ok=True)
+        self._session_name = time.strftime("%Y%m%d_%H%M%S")
+
+        self._thread = threading.Thread(target=Recorder._thread_handler, args=(self,))
+        self._thread.daemon = False
+        self._thread.start()
+
+    # Flushes the queued frames and closes the file.
+    def stop(self):
+        if self._thread is None: return
+
+        self._queue.put(None)
+        self._thread.join()
+        self._thread = None
+
+    def is_recording(self):
+        return self._thread is not None
+
+    # Called by the receiver thread for every message. Never blocks.
+    def record(self, msg_packet, timestamp=None):
+        if self._thread is None: return
+
+        buf = msg_packet.get_msgbuf()
+
+        if buf is None: return
+
+        if timestamp is None:
+            timestamp = Time.get_current_timestamp("ms")
+
+        try:
+            self._queue.put_nowait((int(timestamp * (10 ** 3)), bytes(buf)))
+        except queue.Full:
+            self._dropped_count += 1
+
+    def get_file_list(self):
+        return list(self._file_list)
+
+    def get_frame_count(self):
+        return self._frame_count
+
+    def get_dropped_count(self):
+        return self._dropped_count
+
+class Reader:
+    def __init__(self, file_path : str) -> None:
+        self.LOG_INFO = "tlog.py"
+
+        self._file_path = file_path
+        self._file      = open(file_path, "rb")
+
+        if os.path.getsize(file_path) > 0:
+            self._buf = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        else:
+            self._buf = b""
+
+        # Index, one entry per frame. Ordered by file position, which is
+        # also the order frames were received in.
+        self._timestamps  = [] # us
+        self._offsets     = []
+        self._lengths     = []
+        self._msg_ids     = []
+        self._type_index  = {} # msg id - list of frame indexes
+        self._skipped     = 0  # bytes that couldn't be parsed
+
+        self._parser = mavutil.mavlink.MAVLink(None)
+        self._parser.robust_parsing = True
+
+        self._build_index()
+
+    # Private Method(s)
+    def _build_index(self):
+        buf      = self._buf
+        buf_len  = len(buf)
+        offset   = 0
+
+        while offset + _TIMESTAMP.size + _HEADER_LEN_V1 + _CRC_LEN <= buf_len:
+            frame_offset = offset + _TIMESTAMP.size
+            magic        = buf[frame_offset]
+
+            if magic == _MAGIC_V1:
+                frame_len = _HEADER_LEN_V1 + buf[frame_offset + 1] + _CRC_LEN
+                msg_id    = buf[frame_offset + 5]
+            elif magic == _MAGIC_V2 \
+            and  frame_offset + _HEADER_LEN_V2 <= buf_len:
+                frame_len = _HEADER_LEN_V2 + buf[frame_offset + 1] + _CRC_LEN
+
+                if buf[frame_offset + 2] & mavutil.mavlink.MAVLINK_IFLAG_SIGNED:
+                    frame_len += _SIGNATURE_LEN
+
+                msg_id = buf[frame_offset + 7] \
+                       | buf[frame_offset + 8] << 8 \
+                       | buf[frame_offset + 9] << 16
+            else:
+                # Corrupted or partially written frame. Resync byte by byte.
+                offset        += 1
+                self._skipped += 1
+                continue
+
+            if frame_offset + frame_len > buf_len: break
+
+            self._type_index.setdefault(msg_id, []).append(len(self._offsets))
+            self._timestamps.append(_TIMESTAMP.unpack_from(buf, offset)[0])
+            self._offsets.append(frame_offset)
+            self._lengths.append(frame_len)
+            self._msg_ids.append(msg_id)
+
+            offset = frame_offset + frame_len
+
+        if self._skipped > 0:
+            Logger.PrintLog(self.LOG_INFO, "_build_index() - {} byte(s) couldn't be parsed in {}."
+                            .format(str(self._skipped), self._file_path))
+
+    def _decode(self, index):
+        offset = self._offsets[index]
+
+        try:
+            msg_packet = self._parser.decode(bytearray(self._buf[offset:offset + self._lengths[index]]))
+        except mavutil.mavlink.MAVError:
+            return None
+
+        msg_packet._timestamp = self._timestamps[index] / (10 ** 6)
+
+        return msg_packet
+
+    def _get_msg_ids(self, msg_types):
+        msg_ids = set()
+
+        for msg_type in msg_types:
+            msg_id = getattr(mavutil.mavlink, "MAVLINK_MSG_ID_" + msg_type.upper(), None)
+
+            if msg_id is None:
+                raise ValueError("Unknown message {}.".format(msg_type))
+
+            msg_ids.add(msg_id)
+
+        return msg_ids
+
+    # Public Method(s)
+    def close(self):
+        if isinstance(self._buf, mmap.mmap):
+            self._buf.close()
+
+        self._file.close()
+
+    def get_message_count(self):
+        return len(self._offsets)
+
+    # Returns { message name : count }.
+    def get_message_types(self):
+        ret_dict = {}
+
+        for msg_id, index_list in self._type_index.items():
+            msg_class = mavutil.mavlink.mavlink_map.get(msg_id)
+            msg_name  = msg_class.msgname if msg_class is not None else str(msg_id)
+
+            ret_dict[msg_name] = len(index_list)
+
+        return ret_dict
+
+    # ms, None if the file is empty.
+    def get_start_time(self):
+        if len(self._timestamps) == 0: return None
+
+        return self._timestamps[0] / (10 ** 3)
+
+    def get_end_time(self):
+        if len(self._timestamps) == 0: return None
+
+        return self._timestamps[-1] / (10 ** 3)
+
+    # Returns index of the first frame received at or after timestamp (ms).
+    def seek(self, timestamp):
+        return bisect_left(self._timestamps, int(timestamp * (10 ** 3)))
+
+    """
+        Yields (timestamp, message) pairs in the order they were received.
+
+        start, end - absolute timestamps (ms), None means start/end of the file.
+        msg_types  - list of message names, None means every message.
+    """
+    def messages(self, start=None, end=None, msg_types=None):
+        first_index = 0                   if start is None else self.seek(start)
+        last_index  = len(self._offsets)  if end   is None else self.seek(end)
+
+        if msg_types is None:
+            index_iter = range(first_index, last_index)
+        else:
+            # Merge the per type indexes instead of walking every frame.
+            index_iter = sorted(index
+                                for msg_id in self._get_msg_ids(msg_types)
+                                for index in self._type_index.get(msg_id, [])
+                                if first_index <= index < last_index)
+
+        for index in index_iter:
+            msg_packet = self._decode(index)
+
+            if msg_packet is None: continue
+
+            yield self._timestamps[index] / (10 ** 3), msg_packet
+
+    """
+        Feeds the messages to vehicle._handle_message() with their original
+        timing, divided by speed. speed <= 0 replays as fast as possible.
+        Blocks until the replay is over or stop_event is set.
+    """
+    def replay(self, vehicle, speed=1., start=None, end=None, msg_types=None, stop_event=None):
+        Logger.PrintLog(self.LOG_INFO, "replay() - Replaying {} at {}x speed."
+                        .format(self._file_path, str(speed)))
+
+        first_timestamp = None
+        start_time      = time.monotonic()
+        count           = 0
+
+        for timestamp, msg_packet in self.messages(start, end, msg_types):
+            if  stop_event is not None \
+            and stop_event.is_set(): break
+
+            if first_timestamp is None:
+                first_timestamp = timestamp
+
+            if speed > 0:
+                delay = (timestamp - first_timestamp) / (10 ** 3) / speed - (time.monotonic() - start_time)
+
+                if delay > 0: time.sleep(delay)
+
+            vehicle._handle_message(msg_packet)
+            count += 1
+
+        Logger.PrintLog(self.LOG_INFO, "replay() - {} message(s) replayed.".format(str(count)))
+
+        return count
+
+class ReplayVehicle(Vehicle):
+    """
+        Vehicle that is driven by Reader.replay() instead of a connection. It
+        can be used exactly like a Vehicle, so Mission, Control and Telemetry
+        logic can be run against a recorded flight.
+
+        Commands are not sent anywhere. If ack_commands is True, every
+        COMMAND_LONG is acknowledged as accepted, otherwise commands time out.
+
+        Records and messages are stamped with the times they were logged at,
+        not the time they are replayed at.
+    """
+    def __init__(self,
+                 rate                 : int  = 2,  # hz
+                 message_rates        : dict = None,
+                 scripts_dir          : str  = "",
+                 mission_control_rate : int  = 4,
+                 output_dir           : str  = "./",
+                 ack_commands         : bool = True) -> None:
+        self._system_id    = 1
+        self._component_id = 1
+        self._mav_type     = None
+
+        self._init_variables(rate, output_dir, message_rates)
+        self.LOG_INFO = "tlog.py - Replay"
+
+        self._mav = mavutil.mavlink.MAVLink(_ReplayWriter(self, ack_commands))
+
+        # Classes
+        self._command   = Command  (self)
+        self._action    = Action   (self)
+        self._telemetry = Telemetry(self)
+        self._mission   = Mission  (self, scripts_dir, mission_control_rate)
+        self._control   = Control  (self)
+
+    # Private Method(s)
+    def _get_target_system(self):
+        return self._system_id
+
+    def _get_target_component(self):
+        return self._component_id
+
+    def _get_flight_modes(self):
+        if self._mav_type is None: return {}
+
+        flight_modes = mavutil.mode_mapping_byname(self._mav_type)
+
+        if flight_modes is None: return {}
+
+        return flight_modes
+
+    # Time the message was logged at, set by Reader._decode().
+    def _get_message_timestamp(self, msg_packet):
+        return int(msg_packet._timestamp * (10 ** 3))
+
+    def _handle_message(self, msg_packet):
+        if  msg_packet.get_type() == "HEARTBEAT" \
+        and msg_packet.type       != eb_mavutil.Enum.get_int_reference("MAV_TYPE_GCS"):
+            self._mav_type     = msg_packet.type
+            self._system_id    = msg_packet.get_srcSystem()
+            self._component_id = msg_packet.get_srcComponent()
+
+        super()._handle_message(msg_packet)
+
+    # Public Method(s)
+    def mavlink(self) -> mavutil.mavfile:
+        return None
+
+    def mav(self) -> any:
+        return self._mav
+
+class _ReplayWriter:
+    def __init__(self, vehicle, ack_commands):
+        self._vehicle      = vehicle
+        self._ack_commands = ack_commands
+        self._parser       = mavutil.mavlink.MAVLink(None)
+
+    def write(self, buf):
+        if not self._ack_commands: return
+
+        for msg_packet in self._parser.parse_buffer(bytes(buf)) or []:
+            if msg_packet.get_type() != "COMMAND_LONG": continue
+
+            ack = mavutil.mavlink.MAVLink_command_ack_message(msg_packet.command,
+                                                              eb_mavutil.Enum.get_int_reference("MAV_RESULT_ACCEPTED"))
+            ack._header = mavutil.mavlink.MAVLink_header(ack.id,
+                                                         srcSystem    = msg_packet.target_system,
+                                                         srcComponent = msg_packet.target_component)
+
+            self._vehicle._handle_message(ack)
@@ -9,14 +9,15 @@ from pymavlink import mavutil
 import threading
 
 from eb.time   import Time
-from eb.method import Method
 from eb.logger import Logger
 
 from eb.mavlink._telemetry import Telemetry
 from eb.mavlink._action    import Action
 from eb.mavlink._mission   import Mission
 from eb.mavlink._control   import Control
+from eb.mavlink._command   import Command
 from eb.mavlink.convert    import Convert
+from eb.mavlink.record     import Snapshot, Heartbeat, Battery, Gps, Attitude, LocalPosition, GlobalPosition, RcChannels, VfrHud
 import eb.mavlink.helper as eb_mavutil
 
 class Vehicle:
@@ -25,6 +26,7 @@ class Vehicle:
                  baudrate             : int  = 115200,
                  timeout              : int  = 5000,
                  rate                 : int  = 2,  # hz
+                 message_rates        : dict = None,
                  source_system        : int  = 255,
                  source_component     : int  = 0,
                  retries              : int  = 3,
@@ -32,15 +34,51 @@ class Vehicle:
                  scripts_dir          : str  = "",
                  mission_control_rate : int  = 4,
                  output_dir           : str  = "./") -> None:
-        start_timestamp = Time.get_current_timestamp("ms")
-
         self._mavlink = mavutil.mavlink_connection(port_name,
                                                    baud             = baudrate,
                                                    source_system    = source_system,
                                                    source_component = source_component,
                                                    retries          = retries,
                                                    autoreconnect    = autoreconnect)
-        # Variables
+        self._init_variables(rate, output_dir, message_rates)
+
+        # Classes
+        self._command   = Command  (self)
+        self._action    = Action   (self)
+        self._telemetry = Telemetry(self)
+        self._mission   = Mission  (self, scripts_dir, mission_control_rate)
+        self._control   = Control  (self)
+
+        # Start message handler
+        _ = threading.Thread(target=Vehicle._thread_handler, args=(self,))
+        _.daemon = False
+        _.start()
+
+        Logger.PrintLog(self.LOG_INFO, "__init__() - Connecting to vehicle.")
+
+        with self._message_lock:
+            condition = self._get_message_condition("HEARTBEAT")
+
+            is_received = condition.wait_for(lambda: "HEARTBEAT" in self._messages
+                                                     or self._exception is not None,
+                                             timeout / 1000)
+
+        if self._exception is not None:
+            raise self._exception
+        elif not is_received:
+            raise TimeoutError("Couldn't detect heartbeat in {} milliseconds."
+                               .format(str(timeout)))
+
+        Logger.PrintLog(self.LOG_INFO, "__init__() - Successfully connected to vehicle.")
+
+        # Request Messages
+        _ = threading.Thread(target=self._set_message_intervals)
+        _.daemon = False
+        _.start()
+
+    # Private Method(s)
+    # Shared by every vehicle implementation that processes messages with _handle_message().
+    def _init_variables(self, rate, output_dir, message_rates=None):
         self.LOG_INFO    = "vehicle.py"
         self._output_dir = output_dir
         self._rate       = rate
@@ -58,253 +96,258 @@ class Vehicle:
             "VFR_HUD"             : {"ref_int" : 74}
         }
 
-        # All the variables below will be populated, see _thread_handler().
-        self._messages = {
-            "COMMAND_ACK" : {}
-        }
-        self._boot_time      = 0 # ms
-        self._last_heartbeat = 0 # ms
+        # Every stream is requested at rate unless it is given in
+        # message_rates ({ message name : hz }). Rate <= 0 disables the stream.
+        # Messages that aren't in the list above can be requested as well.
+        for msg_str in self._message_request_list:
+            self._message_request_list[msg_str]["rate"] = rate
 
-        ### Accessable through telemetry()
-        self._state           = "UNKNOWN"
-        self._vehicle_type    = "UNKNOWN"
-        self._flight_mode     = "UNKNOWN"
-        self._armed           = False
-        self._gps             = {}
-        self._attitude        = {}
-        self._local_position  = {}
-        self._global_position = {}
-        self._raw_rc_channels = {}
-        self._battery         = {}
-        self._air_speed       = None
-        self._ground_speed    = None
-        self._heading         = None
-        self._alt             = None
-        self._throttle        = None
-        self._climb_rate      = None
-        self._exception       = None
+        if message_rates is not None:
+            for msg_str, msg_rate in message_rates.items():
+                msg_str = msg_str.upper()
 
-        # Classes
-        self._action    = Action   (self)
-        self._telemetry = Telemetry(self)
-        self._mission   = Mission  (self, scripts_dir, mission_control_rate)
-        self._control   = Control  (self)
+                if msg_str not in self._message_request_list:
+                    msg_id = getattr(mavutil.mavlink, "MAVLINK_MSG_ID_" + msg_str, None)
 
-        # Start message handler
-        _ = threading.Thread(target=Vehicle._thread_handler, args=(self,))
-        _.daemon = False
-        _.start()
+                    if msg_id is None:
+                        raise ValueError("Unknown message {}.".format(msg_str))
 
-        Logger.PrintLog(self.LOG_INFO, "__init__() - Connecting to vehicle.")
+                    self._message_request_list[msg_str] = {"ref_int" : msg_id}
 
-        while "HEARTBEAT" not in self._messages \
-        or    self._exception is not None:
-            if self._exception is not None:
-                raise self._exception
-            elif Time.get_current_timestamp("ms") - start_timestamp >= timeout:
-                raise TimeoutError("Couldn't detect heartbeat in {} milliseconds."
-                                   .format(str(timeout)))
+                self._message_request_list[msg_str]["rate"] = msg_rate
 
-        Logger.PrintLog(self.LOG_INFO, "__init__() - Successfully connected to vehicle.")
+        # Set once every requested stream has produced it's first message. See wait_ready().
+        self._ready           = threading.Event()
+        self._waiting_streams = set(msg_str for msg_str in self._message_request_list
+                                    if self._message_request_list[msg_str]["rate"] > 0)
 
-        # Request Messages
-        def _set_message_intervals(cls):
-            Logger.PrintLog(cls.LOG_INFO, "_set_message_intervals() - Setting message intervals.")
-            for msg_str in cls._message_request_list:
-                cls._set_message_interval(cls._message_request_list[msg_str]["ref_int"], 1000 / self._rate)
+        # All the variables below will be populated, see _handle_message().
+        self._messages = {
+            "COMMAND_ACK" : {}
+        }
 
-        _ = threading.Thread(target=_set_message_intervals, args=(self,))
-        _.daemon = False
-        _.start()
+        # Waiters block on a condition that is bound to the message type they
+        # are waiting for. All conditions share the same lock, which also
+        # guards self._messages. See _get_message_condition().
+        self._message_lock       = threading.Lock()
+        self._message_conditions = {}
+
+        self._boot_time = 0 # ms
+        self._exception = None
+        self._command   = None # Command, ACKs of the commands it sent are given to it.
+        self._recorder  = None # tlog.Recorder, see set_recorder().
+
+        ### Accessable through telemetry()
+        # Only receiver thread replaces the snapshot. See record.Snapshot.
+        self._snapshot = Snapshot()
 
-    # Private Method(s)
     def _get_target_system(self):
         return self.mavlink().target_system
 
     def _get_target_component(self):
         return self.mavlink().target_component
 
-    def _set_message_interval(self, msg_id, interval_ms=1000, retries=8, timeout=500):
-        def impl():
-            COMMAND = eb_mavutil.Enum.get_int_reference("MAV_CMD_SET_MESSAGE_INTERVAL")
-
-            self.mav().command_long_send(
-                self._get_target_system(),
-                self._get_target_component(),
-                COMMAND,
-                0,
-                # params
-                msg_id, interval_ms * (10 ** 3), 0, 0, 0, 0, 0
-            )
-
-            res = self.wait_cmd_ack(COMMAND, timeout)
-
-            if res == 0: 
-                Logger.PrintLog(self.LOG_INFO, "_set_message_interval() - Message interval sucessfully set for {}.".format(msg_id))
-                return True
-            else:
-                Logger.PrintLog(self.LOG_INFO, "_set_message_interval() - Setting message interval failed for {}.".format(msg_id))
-                return False
+    def _get_flight_modes(self):
+        return eb_mavutil.get_flight_modes(self.mavlink())
 
-        interval_res = Method.Repeat.until_value(impl, (), retries, ret_val=True)[0]
+    # Must only be called from the receiver thread. Readers can keep using the
+    # old snapshot while the new one is built, reference swap is atomic.
+    def _update_snapshot(self, stream, build_record):
+        snapshot = self._snapshot
+        self._snapshot = snapshot.replace(stream, build_record(snapshot.next_seq(stream)))
 
-        if not interval_res: return False
+    # self._message_lock must be held by the caller.
+    def _get_message_condition(self, key):
+        condition = self._message_conditions.get(key)
 
-        return True
+        if condition is None:
+            condition = threading.Condition(self._message_lock)
+            self._message_conditions[key] = condition
 
-    def _request_message(self, msg_id, retries=8, timeout=500):
-        def impl():
-            COMMAND = eb_mavutil.Enum.get_int_reference("MAV_CMD_REQUEST_MESSAGE")
+        return condition
 
-            self.mav().command_long_send(
-                self._get_target_system(),
-                self._get_target_component(),
-                COMMAND,
-                0,
-                # params
-                msg_id,
-                0, 0, 0, 0, 0,
-                0
-            )
+    # Blocks until container has item or timeout (ms) expires. Pops and returns the item.
+    def _wait_message(self, key, container, item, timeout, timeout_text):
+        with self._message_lock:
+            condition = self._get_message_condition(key)
 
-            res = self.wait_cmd_ack(COMMAND, timeout)
+            is_received = condition.wait_for(lambda: item in container
+                                                     or self._exception is not None,
+                                             timeout / 1000)
 
-            if res == 0: return True
-            else:        return False
+            if self._exception is not None:
+                raise self._exception
+            elif not is_received:
+                raise TimeoutError(timeout_text)
 
-        request_res = Method.Repeat.until_value(impl, (), retries, ret_val=True)[0]
+            return container.pop(item)
 
-        if not request_res: return False
+    # microseconds, -1 disables the stream.
+    def _get_message_interval(self, msg_str):
+        msg_rate = self._message_request_list[msg_str]["rate"]
 
-        return True
+        if msg_rate <= 0: return -1
+
+        return 10 ** 6 / msg_rate
+
+    def _set_message_interval(self, msg_id, interval_ms=1000, retries=8, timeout=500):
+        res = self.command().send(eb_mavutil.Enum.get_int_reference("MAV_CMD_SET_MESSAGE_INTERVAL"),
+                                  (msg_id, interval_ms * (10 ** 3), 0, 0, 0, 0, 0),
+                                  retries=retries, timeout=timeout).wait()
+
+        if res == 0:
+            Logger.PrintLog(self.LOG_INFO, "_set_message_interval() - Message interval sucessfully set for {}.".format(msg_id))
+            return True
+
+        Logger.PrintLog(self.LOG_INFO, "_set_message_interval() - Setting message interval failed for {}.".format(msg_id))
+        return False
+
+    # Hands every interval request to the command engine at once and collects
+    # the results together. Requests share a command key, so the engine sends
+    # them one after another (an ACK can't tell which stream it is for), each
+    # right after the previous ACK. Result of every request belongs to it's
+    # own stream, a lost request is retransmitted before the next one is sent.
+    def _set_message_intervals(self, retries=8, timeout=500):
+        Logger.PrintLog(self.LOG_INFO, "_set_message_intervals() - Setting message intervals.")
+
+        msg_str_list = list(self._message_request_list)
+        pending_list = [self.command().send(eb_mavutil.Enum.get_int_reference("MAV_CMD_SET_MESSAGE_INTERVAL"),
+                                            (self._message_request_list[msg_str]["ref_int"],
+                                             self._get_message_interval(msg_str),
+                                             0, 0, 0, 0, 0),
+                                            retries=retries, timeout=timeout)
+                        for msg_str in msg_str_list]
+
+        res_list = Command.wait_all(pending_list)
+
+        for msg_str, res in zip(msg_str_list, res_list):
+            if res == 0:
+                Logger.PrintLog(self.LOG_INFO, "_set_message_intervals() - Message interval sucessfully set for {}.".format(msg_str))
+            else:
+                Logger.PrintLog(self.LOG_INFO, "_set_message_intervals() - Setting message interval failed for {}.".format(msg_str))
+
+        return all(res == 0 for res in res_list)
+
+    # Must only be called from the receiver thread.
+    def _set_ready(self):
+        Logger.PrintLog(self.LOG_INFO, "_set_ready() - Every requested stream is received.")
+        self._ready.set()
+
+    def _request_message(self, msg_id, retries=8, timeout=500):
+        res = self.command().send(eb_mavutil.Enum.get_int_reference("MAV_CMD_REQUEST_MESSAGE"),
+                                  (msg_id, 0, 0, 0, 0, 0, 0),
+                                  retries=retries, timeout=timeout).wait()
+
+        return res == 0
 
-    # https://mavlink.io/en/messages/common.html
     @staticmethod
     def _thread_handler(cls):
         # LOG_INFO = cls.LOG_INFO + "_thread_handler() - "
 
         while 1:
             try:
-                msg_packet = cls.mavlink().recv_match()
+                msg_packet = cls.mavlink().recv_match(blocking=True, timeout=1)
             except Exception as ex:
-                cls._exception = ex
+                cls._set_exception(ex)
                 return
 
             if not msg_packet: continue
 
-            msg_packet = msg_packet.to_dict()
-            msg_packet["eb_timestamp"] = Time.get_current_timestamp("ms")
-
-            packet_type = msg_packet["mavpackettype"]
-
-            # HEARTBEAT
-            if packet_type == "HEARTBEAT":
-                cls._last_heartbeat = msg_packet["eb_timestamp"]
-                cls._state          = Convert.state_to_str(msg_packet["system_status"])
-                cls._vehicle_type   = Convert.vehicle_type_to_str(msg_packet["type"])
-                cls._flight_mode    = Convert.custom_mode_to_str(msg_packet["custom_mode"],
-                                                                 eb_mavutil.get_flight_modes(cls.mavlink()))
-                if msg_packet["base_mode"] & 128:
-                    cls._armed = True
-                else: cls._armed = False
-
-            # SYS_STATUS
-            elif packet_type == "SYS_STATUS":
-                cls._battery = {
-                    "voltage"   : msg_packet["voltage_battery"] / (10 ** 3), # V
-                    "current"   : msg_packet["current_battery"] / (10 ** 2), # A
-                    "remaining" : msg_packet["battery_remaining"],           # %
-                    "timestamp" : msg_packet["eb_timestamp"]
-                }
-
-            # SYSTEM_TIME
-            elif packet_type == "SYSTEM_TIME":
-                cls._boot_time = (msg_packet["time_boot_ms"], msg_packet["eb_timestamp"])
-
-            # GPS_RAW_INT
-            elif packet_type == "GPS_RAW_INT":
-                cls._gps = {
-                    "fix_type"  : msg_packet["fix_type"],
-                    "lat"       : msg_packet["lat"] / (10 ** 7), # degree
-                    "lon"       : msg_packet["lon"] / (10 ** 7), # degree
-                    "alt"       : msg_packet["alt"] / (10 ** 3), # meters
-                    "sat_count" : msg_packet["satellites_visible"],
-                    "timestamp" : msg_packet["eb_timestamp"]
-                }
-
-            # ATTITUDE
-            elif packet_type == "ATTITUDE":
-                cls._attitude = {
-                    "roll"  : msg_packet["roll"],
-                    "pitch" : msg_packet["pitch"],
-                    "yaw"   : msg_packet["yaw"],
-                    "speed" : {
-                        "roll"  : msg_packet["rollspeed"],
-                        "pitch" : msg_packet["pitchspeed"],
-                        "yaw"   : msg_packet["yawspeed"],
-                    },
-                    "timestamp" : msg_packet["eb_timestamp"]
-                }
-
-            # LOCAL_POSITION_NED
-            elif packet_type == "LOCAL_POSITION_NED":
-                cls._local_position = {
-                    "x"     : msg_packet["x"],
-                    "y"     : msg_packet["y"],
-                    "z"     : msg_packet["z"],
-                    "speed" : {
-                        "x": msg_packet["vx"],
-                        "y": msg_packet["vy"],
-                        "z": msg_packet["vz"]
-                    },
-                    "timestamp" : msg_packet["eb_timestamp"]
-                }
-
-            # GLOBAL_POSITION_INT
-            elif packet_type == "GLOBAL_POSITION_INT":
-                cls._global_position = {
-                    "lat"   : msg_packet["lat"] / (10 ** 7),                 # degree
-                    "lon"   : msg_packet["lon"] / (10 ** 7),                 # degree
-                    "alt"   : msg_packet["alt"] / (10 ** 3),                 # meters
-                    "relative_alt" : msg_packet["relative_alt"] / (10 ** 3), # meters
-                    "speed" : {
-                        "x": msg_packet["vx"],
-                        "y": msg_packet["vy"],
-                        "z": msg_packet["vz"]
-                    },
-                    "yaw" : msg_packet["hdg"],
-                    "timestamp" : msg_packet["eb_timestamp"]
-                }
-
-            # RC_CHANNELS_RAW
-            elif packet_type == "RC_CHANNELS_RAW":
-                cls._raw_rc_channels = {
-                    "channel_1" : msg_packet["chan1_raw"],
-                    "channel_2" : msg_packet["chan2_raw"],
-                    "channel_3" : msg_packet["chan3_raw"],
-                    "channel_4" : msg_packet["chan4_raw"],
-                    "channel_5" : msg_packet["chan5_raw"],
-                    "channel_6" : msg_packet["chan6_raw"],
-                    "channel_7" : msg_packet["chan7_raw"],
-                    "channel_8" : msg_packet["chan8_raw"],
-                    "timestamp" : msg_packet["eb_timestamp"]
-                }
-
-            # VFR_HUD
-            elif packet_type == "VFR_HUD":
-                cls._air_speed    = (msg_packet["airspeed"],    msg_packet["eb_timestamp"])
-                cls._ground_speed = (msg_packet["groundspeed"], msg_packet["eb_timestamp"])
-                cls._heading      = (msg_packet["heading"],     msg_packet["eb_timestamp"])
-                cls._throttle     = (msg_packet["throttle"],    msg_packet["eb_timestamp"])
-                cls._alt          = (msg_packet["alt"],         msg_packet["eb_timestamp"])
-                cls._climb_rate   = (msg_packet["climb"],       msg_packet["eb_timestamp"])
+            if cls._recorder is not None:
+                cls._recorder.record(msg_packet)
+
+            cls._handle_message(msg_packet)
 
+    # Time (ms) that the records and messages of msg_packet are stamped with.
+    def _get_message_timestamp(self, msg_packet):
+        return Time.get_current_timestamp("ms")
+
+    # https://mavlink.io/en/messages/common.html
+    def _handle_message(self, msg_packet):
+        timestamp   = self._get_message_timestamp(msg_packet)
+        packet_type = msg_packet.get_type()
+
+        if packet_type in self._waiting_streams:
+            self._waiting_streams.discard(packet_type)
+
+            if len(self._waiting_streams) == 0:
+                self._set_ready()
+
+        # HEARTBEAT
+        if packet_type == "HEARTBEAT":
+            self._update_snapshot("heartbeat", lambda seq: Heartbeat(
+                Convert.state_to_str(msg_packet.system_status),
+                Convert.vehicle_type_to_str(msg_packet.type),
+                Convert.custom_mode_to_str(msg_packet.custom_mode,
+                                           self._get_flight_modes()),
+                bool(msg_packet.base_mode & 128),
+                timestamp, seq
+            ))
+
+        # SYS_STATUS
+        elif packet_type == "SYS_STATUS":
+            self._update_snapshot("battery", lambda seq: Battery.from_message(msg_packet, timestamp, seq))
+
+        # SYSTEM_TIME
+        elif packet_type == "SYSTEM_TIME":
+            self._boot_time = (msg_packet.time_boot_ms, timestamp)
+
+        # GPS_RAW_INT
+        elif packet_type == "GPS_RAW_INT":
+            self._update_snapshot("gps", lambda seq: Gps.from_message(msg_packet, timestamp, seq))
+
+        # ATTITUDE
+        elif packet_type == "ATTITUDE":
+            self._update_snapshot("attitude", lambda seq: Attitude.from_message(msg_packet, timestamp, seq))
+
+        # LOCAL_POSITION_NED
+        elif packet_type == "LOCAL_POSITION_NED":
+            self._update_snapshot("local_position", lambda seq: LocalPosition.from_message(msg_packet, timestamp, seq))
+
+        # GLOBAL_POSITION_INT
+        elif packet_type == "GLOBAL_POSITION_INT":
+            self._update_snapshot("global_position", lambda seq: GlobalPosition.from_message(msg_packet, timestamp, seq))
+
+        # RC_CHANNELS_RAW
+        elif packet_type == "RC_CHANNELS_RAW":
+            self._update_snapshot("rc_channels", lambda seq: RcChannels.from_message(msg_packet, timestamp, seq))
+
+        # VFR_HUD
+        elif packet_type == "VFR_HUD":
+            self._update_snapshot("vfr_hud", lambda seq: VfrHud.from_message(msg_packet, timestamp, seq))
+
+        # COMMAND_ACK
+        elif packet_type == "COMMAND_ACK":
+            if  self._command is not None \
+            and self._command._handle_ack(msg_packet):
+                return
+
+        self._store_message(packet_type, msg_packet, timestamp)
+
+    # Messages are kept as (pymavlink message, timestamp) and only
+    # converted to dict when somebody waits for them. See wait_msg().
+    def _store_message(self, packet_type, msg_packet, timestamp):
+        with self._message_lock:
             # COMMAND_ACK
-            elif packet_type == "COMMAND_ACK":
-                cls._messages["COMMAND_ACK"][msg_packet["command"]] = msg_packet
+            if packet_type == "COMMAND_ACK":
+                self._messages["COMMAND_ACK"][msg_packet.command] = (msg_packet, timestamp)
+                condition = self._message_conditions.get(("COMMAND_ACK", msg_packet.command))
+            else:
+                self._messages[packet_type] = (msg_packet, timestamp)
+                condition = self._message_conditions.get(packet_type)
 
-            if packet_type != "COMMAND_ACK":
-                cls._messages[packet_type] = msg_packet
+            if condition is not None:
+                condition.notify_all()
+
+    def _set_exception(self, ex):
+        with self._message_lock:
+            self._exception = ex
+
+            # Wake every waiter up so they can raise the exception.
+            for condition in self._message_conditions.values():
+                condition.notify_all()
+
+        self._ready.set()
 
     # Public Method(s)
     def mavlink(self) -> mavutil.mavfile:
@@ -313,6 +356,9 @@ class Vehicle:
     def mav(self) -> any:
         return self._mavlink.mav
 
+    def command(self):
+        return self._command
+
     def action(self):
         return self._action
 
@@ -331,56 +377,51 @@ class Vehicle:
         elif msg == "COMMAND_ACK":
             raise NotImplementedError
 
-        start_timestamp = Time.get_current_timestamp("ms")
+        msg_packet, timestamp = self._wait_message(msg, self._messages, msg, timeout,
+                                                   "wait_msg() for message {} has timed out."
+                                                   .format(str(msg)))
 
-        while 1:
-            if msg not in self._messages:
-                if Time.get_current_timestamp("ms") - start_timestamp >= timeout:
-                    raise TimeoutError("wait_msg() for message {} has timed out."
-                                       .format(str(msg)))
-                continue
+        msg_data = msg_packet.to_dict()
+        msg_data["eb_timestamp"] = timestamp
 
-            msg_data = self._messages[msg]
+        return msg_data
 
-            del self._messages[msg]
-            return msg_data
+    def is_ready(self):
+        return self._ready.is_set() and self._exception is None
 
-    # type - https://mavlink.io/en/messages/common.html#MAV_RESULT
-    def wait_cmd_ack(self, cmd, timeout=5000):
+    # Blocks until every requested stream has produced it's first message.
+    def wait_ready(self, timeout=5000):
         if timeout <= 0:
-            raise ValueError("wait_cmd_ack() - Timeout is <= 0.")
+            raise ValueError("wait_ready() - Timeout is <= 0.")
 
-        start_timestamp = Time.get_current_timestamp("ms")
+        is_ready = self._ready.wait(timeout / 1000)
 
-        while 1:
-            if cmd not in self._messages["COMMAND_ACK"]:
-                if Time.get_current_timestamp("ms") - start_timestamp >= timeout:
-                    raise TimeoutError("wait_cmd_ack() for command {} has timed out."
-                                       .format(str(cmd)))
-                continue
+        if self._exception is not None:
+            raise self._exception
+        elif not is_ready:
+            raise TimeoutError("wait_ready() has timed out. Waiting for: {}."
+                               .format(", ".join(sorted(self._waiting_streams))))
 
-            result = self._messages["COMMAND_ACK"][cmd]["result"]
+    # type - https://mavlink.io/en/messages/common.html#MAV_RESULT
+    def wait_cmd_ack(self, cmd, timeout=5000):
+        if timeout <= 0:
+            raise ValueError("wait_cmd_ack() - Timeout is <= 0.")
 
-            del self._messages["COMMAND_ACK"][cmd]
-            return result
+        return self._wait_message(("COMMAND_ACK", cmd), self._messages["COMMAND_ACK"], cmd, timeout,
+                                  "wait_cmd_ack() for command {} has timed out."
+                                  .format(str(cmd)))[0].result
 
     # type - https://mavlink.io/en/messages/common.html#MAV_MISSION_RESULT
     def wait_mission_ack(self, timeout=5000):
         if timeout <= 0:
             raise ValueError("wait_mission_ack() - Timeout is <= 0.")
 
-        start_timestamp = Time.get_current_timestamp("ms")
-
-        while 1:
-            if "MISSION_ACK" not in self._messages:
-                if Time.get_current_timestamp("ms") - start_timestamp >= timeout:
-                    raise TimeoutError("wait_mission_ack() timed out.")
-                continue
-
-            result = self._messages["MISSION_ACK"]["type"]
+        return self._wait_message("MISSION_ACK", self._messages, "MISSION_ACK", timeout,
+                                  "wait_mission_ack() timed out.")[0].type
 
-            del self._messages["MISSION_ACK"]
-            return result
+    # Every received message is given to recorder (tlog.Recorder). None stops recording.
+    def set_recorder(self, recorder):
+        self._recorder = recorder
 
     def set_variable(self, key, val):
         self._variables[key] = val
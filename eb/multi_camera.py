@@ -0,0 +1,255 @@
+"""
+    Author: Ege Bilecen
+    Date  : 17.10.2026
+
+    Notes:
+    * Drives several Camera instances from a single thread. Every round, all
+      devices are grabbed back to back first and retrieved (decoded) after, so
+      the time between grabs is only the grab calls, not the decoding. Frames
+      are timestamped (ms, time.monotonic() based) right after their grab.
+    * Cameras keep working as usual (get_last_frame(), wait_next_frame(),
+      recording, frame buffer...) but must not be started on their own.
+    * A frame set is made of the latest frame of the first (reference) camera
+      and the frame of every other camera whose timestamp is the nearest to
+      it. If any of them is further than tolerance, the frame set is dropped.
+
+    Example:
+        cameras = MultiCamera({ "down" : Camera(0), "front" : Camera(1) }, tolerance=15)
+        cameras.start()
+
+        for frame_set in cameras.frame_sets():
+            process(frame_set.frames["down"], frame_set.frames["front"])
+"""
+from collections import deque
+from time        import sleep
+from typing      import Union
+import threading
+
+from eb.logger import Logger
+from eb.camera import Camera
+
+class MultiCamera:
+    class FrameSet:
+        def __init__(self, seq, frames, timestamps, seqs):
+            self.seq        = seq
+            self.frames     = frames     # { name : frame }
+            self.timestamps = timestamps # { name : ms }
+            self.seqs       = seqs       # { name : frame seq of the camera }
+
+            # Timestamp of the reference camera's frame.
+            self.timestamp = next(iter(timestamps.values()))
+
+        # Difference between the earliest and the latest frame (ms).
+        def get_skew(self) -> float:
+            return max(self.timestamps.values()) - min(self.timestamps.values())
+
+    def __init__(self,
+                 cameras      : dict,
+                 tolerance    : float = 20,
+                 history_size : int   = 4) -> None:
+        if len(cameras) < 1: raise ValueError("No camera is given.")
+        if history_size < 1: raise ValueError("history_size < 1")
+
+        self.LOG_INFO = "multi_camera.py - "
+
+        self._cameras   = dict(cameras) # First one is the reference camera.
+        self._tolerance = tolerance     # ms
+        self._status    = 0
+        self._thread    = None
+
+        # Last frames of every camera, (seq, timestamp, frame).
+        self._history = { name : deque(maxlen=history_size) for name in self._cameras }
+
+        self._frame_set           = None
+        self._frame_set_seq       = 0
+        self._frame_set_condition = threading.Condition()
+
+        self._unmatched_count = 0 # reference frames without a frame set
+        self._skew_total      = 0
+        self._skew_max        = 0
+
+    # Private Method(s)
+    @staticmethod
+    def _thread_handler(cls) -> None:
+        LOG_INFO = cls.LOG_INFO+"_thread_handler() - "
+
+        while cls._status:
+            if not all(camera._status and camera._backend.is_opened() for camera in cls._cameras.values()):
+                Logger.PrintLog(LOG_INFO, "A camera is not open or it is stopped. Terminating the thread.")
+                break
+
+            try:
+                # Grab every device first, decoding is slower than grabbing.
+                timestamps = {}
+
+                for name, camera in cls._cameras.items():
+                    timestamp = camera._grab()
+
+                    if timestamp is not None:
+                        timestamps[name] = timestamp
+
+                for name, timestamp in timestamps.items():
+                    result = cls._cameras[name]._retrieve(timestamp)
+
+                    if result is not None:
+                        cls._history[name].append((result[0], timestamp, result[1]))
+
+                if cls._reference_name() in timestamps:
+                    cls._match_frame_set()
+            except Exception as ex:
+                Logger.PrintException(LOG_INFO, ex)
+                sleep(0.1)
+
+        cls._status = 0
+
+        for camera in cls._cameras.values():
+            camera._close()
+
+        with cls._frame_set_condition:
+            cls._frame_set_condition.notify_all()
+
+    def _reference_name(self):
+        return next(iter(self._cameras))
+
+    def _match_frame_set(self):
+        reference_history = self._history[self._reference_name()]
+
+        if len(reference_history) == 0: return
+
+        _, reference_timestamp, _ = reference_history[-1]
+
+        matched = {}
+
+        for name, history in self._history.items():
+            if len(history) == 0: return
+
+            nearest = min(history, key=lambda item: abs(item[1] - reference_timestamp))
+
+            if abs(nearest[1] - reference_timestamp) > self._tolerance:
+                self._unmatched_count += 1
+                return
+
+            matched[name] = nearest
+
+        frame_set = MultiCamera.FrameSet(self._frame_set_seq + 1,
+                                         { name : item[2] for name, item in matched.items() },
+                                         { name : item[1] for name, item in matched.items() },
+                                         { name : item[0] for name, item in matched.items() })
+
+        skew = frame_set.get_skew()
+
+        self._skew_total += skew
+        self._skew_max    = max(self._skew_max, skew)
+
+        with self._frame_set_condition:
+            self._frame_set      = frame_set
+            self._frame_set_seq += 1
+
+            self._frame_set_condition.notify_all()
+
+    def _transform_frame_set(self, frame_set, frame_encode, mirror):
+        if not frame_encode and not mirror: return frame_set
+
+        # Camera caches the transforms by the frame's seq.
+        return MultiCamera.FrameSet(frame_set.seq,
+                                    { name : self._cameras[name]._transform_frame(frame_set.seqs[name], frame,
+                                                                                  frame_encode, mirror)
+                                      for name, frame in frame_set.frames.items() },
+                                    frame_set.timestamps,
+                                    frame_set.seqs)
+
+    # Public Method(s)
+    def start(self) -> None:
+        if self._thread is not None: return
+
+        Logger.PrintLog(self.LOG_INFO+"start()", "Starting {} camera(s).".format(len(self._cameras)))
+
+        for camera in self._cameras.values():
+            camera._open()
+
+        self._status = 1
+
+        self._thread = threading.Thread(target=self._thread_handler, args=(self,))
+        self._thread.daemon = True
+        self._thread.start()
+
+    def stop(self) -> None:
+        if self._thread is None: return
+
+        Logger.PrintLog(self.LOG_INFO+"stop()", "Stopping the cameras.")
+
+        self._status = 0
+        self._thread.join()
+        self._thread = None
+
+    def is_running(self) -> bool:
+        return self._status == 1
+
+    def get_camera(self, name : str) -> Camera:
+        return self._cameras[name]
+
+    def get_camera_names(self) -> list:
+        return list(self._cameras)
+
+    # None if no frame set is matched yet.
+    def get_last_frame_set(self,
+                           frame_encode : bool = False,
+                           mirror       : bool = True) -> Union["MultiCamera.FrameSet", None]:
+        frame_set = self._frame_set
+
+        if frame_set is None: return None
+
+        return self._transform_frame_set(frame_set, frame_encode, mirror)
+
+    """
+        Blocks until a frame set newer than after_seq is matched.
+        timeout - ms, None means wait until the cameras stop.
+    """
+    def wait_next_frame_set(self,
+                            after_seq    : int  = None,
+                            timeout      : int  = None,
+                            frame_encode : bool = False,
+                            mirror       : bool = True) -> "MultiCamera.FrameSet":
+        if after_seq is None:
+            after_seq = self._frame_set_seq
+
+        with self._frame_set_condition:
+            is_matched = self._frame_set_condition.wait_for(lambda: self._frame_set_seq > after_seq
+                                                                    or not self._status,
+                                                            None if timeout is None else timeout / 1000)
+
+            if self._frame_set_seq <= after_seq:
+                if not is_matched or self._status:
+                    raise TimeoutError("wait_next_frame_set() has timed out.")
+
+                raise Exception("Cameras are not started.")
+
+            frame_set = self._frame_set
+
+        return self._transform_frame_set(frame_set, frame_encode, mirror)
+
+    # Yields every new frame set once, until the cameras stop.
+    def frame_sets(self,
+                   frame_encode : bool = False,
+                   mirror       : bool = True):
+        seq = self._frame_set_seq
+
+        while self._status:
+            try:
+                frame_set = self.wait_next_frame_set(seq, None, frame_encode, mirror)
+            except Exception:
+                if not self._status: break
+                raise
+
+            seq = frame_set.seq
+
+            yield frame_set
+
+    # { "frame_sets" : count, "unmatched" : count, "skew_mean" : ms, "skew_max" : ms }
+    def get_statistics(self) -> dict:
+        return {
+            "frame_sets" : self._frame_set_seq,
+            "unmatched"  : self._unmatched_count,
+            "skew_mean"  : self._skew_total / self._frame_set_seq if self._frame_set_seq > 0 else 0,
+            "skew_max"   : self._skew_max
+        }
@@ -0,0 +1,221 @@
+"""
+    Author: Ege Bilecen
+    Date  : 17.10.2026
+
+    Notes:
+    * Encodes and writes frames on it's own thread. write() only puts the frame
+      into a bounded queue, so capture rate doesn't depend on the encoder or
+      disk speed. When the queue is full, drop_policy decides what happens.
+    * Frames are paced by their capture timestamps (ms). Video files have a
+      constant frame rate, so a frame is repeated if capture is slower than fps
+      and skipped if it is faster. Video duration matches the real duration.
+    * If segment_duration is given, a new file is started every
+      segment_duration seconds: <file_name>_000.avi, <file_name>_001.avi, ...
+"""
+from time   import monotonic
+from typing import Tuple
+from numpy  import ndarray
+import threading
+import queue
+import cv2
+import os
+
+from eb.logger import Logger
+from eb.image_processing.image import Image
+
+class VideoRecorder:
+    class DropPolicy:
+        DROP_OLDEST = 0 # Drop the oldest queued frame to make room.
+        DROP_NEWEST = 1 # Drop the frame that is being written.
+        BLOCK       = 2 # Block the caller until there is room.
+
+    def __init__(self,
+                 output_dir       : str             = "./video_output/",
+                 file_name        : str             = "video",
+                 fps              : float           = 30,
+                 resolution       : Tuple[int, int] = None, # None means size of the first frame
+                 codec            : str             = "XVID",
+                 extension        : str             = ".avi",
+                 queue_size       : int             = 64,
+                 drop_policy      : int             = DropPolicy.DROP_OLDEST,
+                 segment_duration : float           = 0) -> None:
+        if fps <= 0:        raise ValueError("fps <= 0")
+        if queue_size < 1:  raise ValueError("queue_size < 1")
+
+        self.LOG_INFO = "video_recorder.py - "
+
+        self._output_dir       = output_dir
+        self._file_name        = file_name
+        self._fps              = fps
+        self._resolution       = resolution
+        self._codec            = codec
+        self._extension        = extension
+        self._drop_policy      = drop_policy
+        self._segment_duration = segment_duration
+
+        self._queue       = queue.Queue(maxsize=queue_size)
+        self._thread      = None
+        self._writer      = None
+        self._is_stopping = False
+
+        self._segment_index       = 0
+        self._segment_start       = None # ms, timestamp of the first frame of the segment
+        self._segment_frame_count = 0
+        self._file_list           = []
+
+        self._written_count  = 0 # frames written into files, repeated ones included
+        self._repeated_count = 0
+        self._skipped_count  = 0 # skipped for pacing
+        self._dropped_count  = 0 # dropped because queue was full
+
+    # Private Method(s)
+    @staticmethod
+    def _thread_handler(cls) -> None:
+        LOG_INFO = cls.LOG_INFO+"_thread_handler() - "
+
+        while 1:
+            item = cls._queue.get()
+
+            if item is None: break
+
+            frame, timestamp = item
+
+            try:
+                cls._write_frame(frame, timestamp)
+            except Exception as ex:
+                Logger.PrintException(LOG_INFO, ex)
+
+        if cls._writer is not None:
+            cls._writer.release()
+            cls._writer = None
+
+    def _open_segment(self, frame, timestamp):
+        if self._writer is not None:
+            self._writer.release()
+
+        if self._resolution is None:
+            if frame.ndim == 1:
+                frame = Image.Decode.FromEncodedImage(frame)
+
+            self._resolution = (frame.shape[1], frame.shape[0])
+
+        if self._segment_duration > 0:
+            file_name = "{}_{:03d}{}".format(self._file_name, self._segment_index, self._extension)
+        else:
+            file_name = self._file_name + self._extension
+
+        file_path = os.path.join(self._output_dir, file_name)
+
+        self._writer = cv2.VideoWriter(file_path, cv2.VideoWriter_fourcc(*self._codec), self._fps, self._resolution)
+        self._file_list.append(file_path)
+
+        self._segment_index      += 1
+        self._segment_start       = timestamp
+        self._segment_frame_count = 0
+
+        Logger.PrintLog(self.LOG_INFO+"_open_segment()", "Recording to {}.".format(file_path))
+
+    def _write_frame(self, frame, timestamp):
+        if self._writer is None \
+        or (self._segment_duration > 0
+            and timestamp - self._segment_start >= self._segment_duration * 1000):
+            self._open_segment(frame, timestamp)
+
+        # Number of frames the segment should have once this frame is written.
+        frame_count = int((timestamp - self._segment_start) * self._fps / 1000) + 1
+        repeat      = frame_count - self._segment_frame_count
+
+        if repeat <= 0:
+            self._skipped_count += 1
+            return
+
+        # Encoded frame, see eb.capture_backend.
+        if frame.ndim == 1:
+            frame = Image.Decode.FromEncodedImage(frame)
+
+        if (frame.shape[1], frame.shape[0]) != tuple(self._resolution):
+            frame = cv2.resize(frame, tuple(self._resolution))
+
+        for _ in range(repeat):
+            self._writer.write(frame)
+
+        self._segment_frame_count += repeat
+        self._written_count       += repeat
+        self._repeated_count      += repeat - 1
+
+    # Public Method(s)
+    def start(self) -> None:
+        if self._thread is not None: return
+
+        if not os.path.isdir(self._output_dir):
+            os.makedirs(self._output_dir)
+
+        self._thread = threading.Thread(target=self._thread_handler, args=(self,))
+        self._thread.daemon = True
+        self._thread.start()
+
+    # Writes the queued frames and closes the file.
+    def stop(self) -> None:
+        if self._thread is None: return
+
+        # write() must not drop the stop item out of the queue.
+        self._is_stopping = True
+        self._queue.put(None)
+        self._thread.join()
+        self._thread      = None
+        self._is_stopping = False
+
+    def is_recording(self) -> bool:
+        return self._thread is not None
+
+    """
+        Queues the frame. Returns False if a frame had to be dropped.
+        timestamp - ms, capture time of the frame. None means now.
+    """
+    def write(self,
+              frame     : ndarray,
+              timestamp : float = None) -> bool:
+        if self._thread is None or self._is_stopping: return False
+
+        if timestamp is None:
+            timestamp = monotonic() * 1000
+
+        if self._drop_policy == VideoRecorder.DropPolicy.BLOCK:
+            self._queue.put((frame, timestamp))
+            return True
+
+        try:
+            self._queue.put_nowait((frame, timestamp))
+            return True
+        except queue.Full:
+            pass
+
+        self._dropped_count += 1
+
+        if self._drop_policy == VideoRecorder.DropPolicy.DROP_OLDEST:
+            try:
+                self._queue.get_nowait()
+            except queue.Empty:
+                pass
+
+            try:
+                self._queue.put_nowait((frame, timestamp))
+            except queue.Full:
+                pass
+
+        return False
+
+    def get_file_list(self) -> list:
+        return list(self._file_list)
+
+    def get_queue_size(self) -> int:
+        return self._queue.qsize()
+
+    # { "written" : count, "repeated" : count, "skipped" : count, "dropped" : count }
+    def get_statistics(self) -> dict:
+        return {
+            "written"  : self._written_count,
+            "repeated" : self._repeated_count,
+            "skipped"  : self._skipped_count,
+            "dropped"  : self._dropped_count
+        }
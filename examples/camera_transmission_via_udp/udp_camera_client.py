@@ -32,12 +32,6 @@ camera = Camera(fps = FPS)
 camera.start()
 sleep(2)
 
-while 1:
-    try:
-        frame = camera.get_last_frame(True)
-    except ValueError: continue
-
+for frame in camera.frames(frame_encode = True):
     packet = prepare_camera_frame_packet(frame)
     client.send_chunked(packet)
-    
-    sleep(1 / FPS)